@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import os
+import sys
+import time
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_DIRS_DEFAULT = [
+	os.path.join('cache', 'news_head'),
+	os.path.join('snapshots', 'news_full'),
+]
+
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+
+	Returns:
+		argparse.Namespace: Parsed arguments.
+	"""
+	parser = argparse.ArgumentParser(
+		description='Benchmark news_head parser backends (documents per second)',
+	)
+	parser.add_argument(
+		'-i', '--input-dir', dest='input_dirs', required=False, type=str,
+		action='append', default=None,
+		help='Directory of .html files (repeatable; default: cache/news_head and snapshots/news_full)',
+	)
+	parser.add_argument(
+		'-r', '--repeat', dest='repeat', required=False, type=int,
+		default=3,
+		help='Passes over the corpus per backend (default: 3)',
+	)
+	parser.add_argument(
+		'-n', '--max', dest='max_files', required=False, type=int,
+		default=None,
+		help='Optional max files',
+	)
+	return parser.parse_args()
+
+
+#============================================
+def load_corpus(input_dirs: list, max_files=None) -> list:
+	"""
+	Read every .html file under the input directories.
+
+	Args:
+		input_dirs (list): Directories to scan (relative to the repo root).
+		max_files (int): Optional cap on files.
+
+	Returns:
+		list: Document texts.
+	"""
+	paths = []
+	for d in input_dirs:
+		d = d if os.path.isabs(d) else os.path.join(REPO_ROOT, d)
+		if not os.path.isdir(d):
+			continue
+		for name in sorted(os.listdir(d)):
+			if name.endswith('.html'):
+				paths.append(os.path.join(d, name))
+	if max_files is not None:
+		paths = paths[:max_files]
+
+	docs = []
+	for path in paths:
+		with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+			docs.append(f.read())
+	return docs
+
+
+#============================================
+def time_calls(func, docs: list, repeat: int) -> float:
+	"""
+	Time func over every document, repeat times.
+
+	Returns:
+		float: Best (lowest) seconds for one pass over the corpus.
+	"""
+	best = None
+	for _ in range(max(1, int(repeat))):
+		start = time.perf_counter()
+		for text in docs:
+			func(text)
+		elapsed = time.perf_counter() - start
+		if best is None or elapsed < best:
+			best = elapsed
+	return float(best or 0.0)
+
+
+#============================================
+def main():
+	"""
+	Run the benchmark and print one line per backend.
+	"""
+	args = parse_args()
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_head
+	import python_tools.news_enrich
+
+	docs = load_corpus(args.input_dirs or CORPUS_DIRS_DEFAULT, args.max_files)
+	if not docs:
+		print('No .html documents found; run news_enrich or save snapshots first.')
+		return
+
+	total_mb = sum(len(t) for t in docs) / (1024 * 1024)
+	print(f'Corpus: {len(docs)} documents, {total_mb:.1f} MB')
+	print(f"{'backend':<12}{'parse docs/s':>14}{'parse+meta docs/s':>20}{'MB/s':>10}")
+
+	for backend in python_tools.news_head.available_backends():
+
+		def parse(text, backend=backend):
+			return python_tools.news_head.parse_head_document(text, backend=backend)
+
+		def parse_and_extract(text, backend=backend):
+			return python_tools.news_enrich.extract_metadata(parse(text, backend))
+
+		parse_s = time_calls(parse, docs, args.repeat)
+		full_s = time_calls(parse_and_extract, docs, args.repeat)
+		docs_per_s = len(docs) / parse_s if parse_s > 0 else 0.0
+		full_per_s = len(docs) / full_s if full_s > 0 else 0.0
+		mb_per_s = total_mb / parse_s if parse_s > 0 else 0.0
+		print(f'{backend:<12}{docs_per_s:>14.0f}{full_per_s:>20.0f}{mb_per_s:>10.1f}')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import resource
+import tempfile
+import threading
+import collections
+import http.server
+import multiprocessing
+import concurrent.futures
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROWS_DEFAULT = '1000,10000,100000'
+
+# Share of URLs per page kind; the rest are normal article pages.
+MIX_DEFAULT = {
+	'redirect': 0.05,
+	'block': 0.03,
+	'404': 0.02,
+	'429': 0.02,
+	'slow': 0.02,
+}
+BLOCK_PAGE = (
+	'<html><head><META NAME="robots" CONTENT="noindex,nofollow"></head>'
+	'<body><iframe id="main-iframe">Request unsuccessful. Incapsula incident ID: 0-12345</iframe>'
+	'</body></html>'
+)
+FILLER_PARAGRAPH = '<p>Members brought layouts, trains, and a lot of patience to the show. By Staff</p>\n'
+
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+
+	Returns:
+		argparse.Namespace: Parsed arguments.
+	"""
+	parser = argparse.ArgumentParser(
+		description='Load-test news_enrich against a local stand-in news server',
+	)
+	parser.add_argument(
+		'-r', '--rows', dest='rows', required=False, type=str,
+		default=ROWS_DEFAULT,
+		help=f'Comma-separated CSV sizes to run (default: {ROWS_DEFAULT})',
+	)
+	parser.add_argument(
+		'-j', '--jobs', dest='jobs', required=False, type=int,
+		default=8,
+		help='news_enrich fetch workers (default: 8)',
+	)
+	parser.add_argument(
+		'--hosts', dest='hosts', required=False, type=int,
+		default=16,
+		help='Server ports to spread URLs over; each port is its own host to the fetch engine (default: 16)',
+	)
+	parser.add_argument(
+		'--host-interval', dest='host_interval', required=False, type=float,
+		default=0.0,
+		help='Per-host spacing passed to enrich_news in seconds (default: 0, production uses 1.0)',
+	)
+	parser.add_argument(
+		'--page-kb', dest='page_kb', required=False, type=int,
+		default=60,
+		help='Article page size in KB (default: 60)',
+	)
+	parser.add_argument(
+		'--latency-ms', dest='latency_ms', required=False, type=float,
+		default=20.0,
+		help='Server delay before every response (default: 20)',
+	)
+	parser.add_argument(
+		'--slow-ms', dest='slow_ms', required=False, type=float,
+		default=1500.0,
+		help='Extra delay for slow pages (default: 1500)',
+	)
+	parser.add_argument(
+		'--retry-after', dest='retry_after', required=False, type=int,
+		default=2,
+		help='Retry-After seconds sent with 429 responses (default: 2)',
+	)
+	parser.add_argument(
+		'--redirect-hops', dest='redirect_hops', required=False, type=int,
+		default=3,
+		help='Redirect chain length for redirecting URLs (default: 3)',
+	)
+	parser.add_argument(
+		'--mix', dest='mix', required=False, type=str,
+		default='',
+		help='Override page kind shares, e.g. redirect=0.1,block=0,429=0.05 (kinds: ' + ', '.join(MIX_DEFAULT) + ')',
+	)
+	parser.add_argument(
+		'--warm', dest='warm', required=False,
+		action='store_true',
+		help='Also time a second pass with -f all (conditional requests, 304s)',
+	)
+	parser.add_argument(
+		'-k', '--keep', dest='keep', required=False,
+		action='store_true',
+		help='Keep the temporary work directory and print its path',
+	)
+	return parser.parse_args()
+
+
+#============================================
+def parse_mix(text: str) -> dict:
+	"""
+	Merge a --mix override into MIX_DEFAULT.
+
+	Raises:
+		ValueError: If a kind is unknown or the shares add up to more than 1.
+	"""
+	mix = dict(MIX_DEFAULT)
+	for part in [p for p in str(text or '').split(',') if p.strip()]:
+		kind, _, share = part.partition('=')
+		kind = kind.strip()
+		if kind not in mix:
+			raise ValueError(f'Unknown page kind in --mix: {kind}')
+		mix[kind] = float(share)
+	if sum(mix.values()) > 1.0:
+		raise ValueError('--mix shares add up to more than 1')
+	return mix
+
+
+#============================================
+def page_kind(index: int, mix: dict) -> str:
+	"""
+	Pick the page kind for an article id (deterministic for a given mix).
+	"""
+	roll = random.Random(index).random()
+	for kind in sorted(mix):
+		if roll < mix[kind]:
+			return kind
+		roll -= mix[kind]
+	return 'ok'
+
+
+#============================================
+def json_ld_block(index: int) -> str:
+	"""
+	Build one of four JSON-LD shapes seen on news sites (or none).
+	"""
+	article = {
+		'@type': 'NewsArticle',
+		'headline': f'Train show draws a crowd, part {index}',
+		'datePublished': f'2024-{(index % 12) + 1:02d}-{(index % 28) + 1:02d}T09:00:00Z',
+		'description': 'Local club brings its modular layout to the library. ' * 3,
+		'publisher': {'@type': 'Organization', 'name': f'Gazette {index % 40}'},
+	}
+	variant = index % 4
+	if variant == 0:
+		article['author'] = {'@type': 'Person', 'name': 'Pat Reporter'}
+		data = article
+	elif variant == 1:
+		article['author'] = [{'@type': 'Person', 'name': 'Pat Reporter'}, {'@type': 'Person', 'name': 'Sam Editor'}]
+		data = {'@context': 'https://schema.org', '@graph': [{'@type': 'WebPage', 'name': 'Page'}, article]}
+	elif variant == 2:
+		article['author'] = 'Pat Reporter'
+		data = [{'@type': 'BreadcrumbList', 'itemListElement': []}, article]
+	else:
+		return ''
+	return f'<script type="application/ld+json">{json.dumps(data)}</script>'
+
+
+#============================================
+def article_page(index: int, page_bytes: int) -> bytes:
+	"""
+	Build a synthetic article page of about page_bytes bytes.
+	"""
+	head = (
+		'<!doctype html>\n<html><head><meta charset="utf-8">'
+		f'<title>Train show draws a crowd, part {index} | Gazette</title>'
+		f'<meta property="og:title" content="Train show draws a crowd, part {index}">'
+		f'<meta property="og:site_name" content="Gazette {index % 40}">'
+		'<meta property="og:description" content="Local club brings its modular layout to the library.">'
+		f'<meta property="article:published_time" content="2024-{(index % 12) + 1:02d}-{(index % 28) + 1:02d}T09:00:00Z">'
+		f'<link rel="canonical" href="/a/{index}">'
+		f'{json_ld_block(index)}'
+		'<link rel="stylesheet" href="/site.css"></head>\n<body>\n'
+	)
+	repeat = max(1, (page_bytes - len(head)) // len(FILLER_PARAGRAPH))
+	return (head + FILLER_PARAGRAPH * repeat + '</body></html>\n').encode('utf-8')
+
+
+#============================================
+class NewsServerState:
+	"""
+	Settings and counters shared by the stand-in server threads.
+	"""
+
+	def __init__(self, args, mix: dict):
+		self.page_bytes = max(1, args.page_kb) * 1024
+		self.latency = max(0.0, args.latency_ms) / 1000.0
+		self.slow = max(0.0, args.slow_ms) / 1000.0
+		self.retry_after = max(0, args.retry_after)
+		self.mix = mix
+		self.lock = threading.Lock()
+		self.requests = 0
+		self.bytes_sent = 0
+
+	def count(self, sent: int) -> None:
+		with self.lock:
+			self.requests += 1
+			self.bytes_sent += sent
+
+
+#============================================
+class NewsHandler(http.server.BaseHTTPRequestHandler):
+	"""
+	Serve /a/<id> articles (kind chosen by page_kind) and /r/<hops>/<id> redirects.
+	"""
+
+	state = None
+	protocol_version = 'HTTP/1.1'
+
+	def log_message(self, format, *args):
+		return
+
+	def send_body(self, status: int, body: bytes, headers: dict = None) -> None:
+		self.send_response(status)
+		for name, value in (headers or {}).items():
+			self.send_header(name, value)
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		try:
+			self.wfile.write(body)
+		except (BrokenPipeError, ConnectionResetError):
+			# Head-only reads close the connection early.
+			self.close_connection = True
+		self.state.count(len(body))
+
+	def do_GET(self):
+		state = self.state
+		time.sleep(state.latency)
+		parts = [p for p in self.path.split('?')[0].split('/') if p]
+		try:
+			index = int(parts[-1])
+		except (IndexError, ValueError):
+			self.send_body(404, b'not found')
+			return
+
+		if parts[0] == 'r':
+			hops = int(parts[1]) if len(parts) == 3 and parts[1].isdigit() else 0
+			location = f'/r/{hops - 1}/{index}' if hops > 1 else f'/a/{index}'
+			self.send_body(301 if hops % 2 else 302, b'', {'Location': location})
+			return
+
+		kind = page_kind(index, state.mix)
+		if kind == '404':
+			self.send_body(404, b'<html><head><title>Not Found</title></head></html>', {'Content-Type': 'text/html'})
+			return
+		if kind == '429':
+			self.send_body(429, b'slow down', {'Retry-After': str(state.retry_after), 'Content-Type': 'text/plain'})
+			return
+		if kind == 'block':
+			self.send_body(403 if index % 2 else 200, BLOCK_PAGE.encode('ascii'), {'Content-Type': 'text/html'})
+			return
+		if kind == 'slow':
+			time.sleep(state.slow)
+
+		etag = f'"a{index}"'
+		if self.headers.get('If-None-Match') == etag:
+			self.send_body(304, b'', {'ETag': etag})
+			return
+		headers = {'Content-Type': 'text/html; charset=utf-8', 'ETag': etag}
+		self.send_body(200, article_page(index, state.page_bytes), headers)
+
+
+#============================================
+class NewsServer(http.server.ThreadingHTTPServer):
+	"""
+	Threaded server that ignores clients hanging up mid-response.
+	"""
+
+	daemon_threads = True
+
+	def handle_error(self, request, client_address):
+		if isinstance(sys.exc_info()[1], ConnectionError):
+			return
+		super().handle_error(request, client_address)
+
+
+#============================================
+def start_servers(count: int, state: NewsServerState) -> list:
+	"""
+	Start one threaded server per port on localhost.
+
+	Returns:
+		list: Bound port numbers.
+	"""
+	handler = type('BoundNewsHandler', (NewsHandler,), {'state': state})
+	ports = []
+	for _ in range(max(1, count)):
+		server = NewsServer(('127.0.0.1', 0), handler)
+		threading.Thread(target=server.serve_forever, daemon=True).start()
+		ports.append(server.server_address[1])
+	return ports
+
+
+#============================================
+def write_input_csv(path: str, rows: int, ports: list, mix: dict, redirect_hops: int) -> None:
+	"""
+	Write an input CSV of generated article URLs spread over the server ports.
+	"""
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	with open(path, 'w', encoding='utf-8') as f:
+		f.write('url\n')
+		for index in range(rows):
+			port = ports[index % len(ports)]
+			if page_kind(index, mix) == 'redirect':
+				f.write(f'http://127.0.0.1:{port}/r/{redirect_hops}/{index}\n')
+			else:
+				f.write(f'http://127.0.0.1:{port}/a/{index}\n')
+
+
+#============================================
+def percentile(values: list, fraction: float) -> float:
+	"""
+	Nearest-rank percentile of a list (0.0 for an empty list).
+	"""
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+#============================================
+def peak_rss_mb() -> float:
+	"""
+	Peak resident set size of this process in MB.
+	"""
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Linux reports KiB, macOS bytes.
+	return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+#============================================
+def run_enrich(work_dir: str, jobs: int, host_interval: float, refresh: str) -> dict:
+	"""
+	Run enrich_news once over work_dir/data/in.csv (in a child process).
+
+	Returns:
+		dict: elapsed, urls, latencies, bytes_read, notes, peak_rss_mb.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_enrich
+
+	latencies = []
+	totals = {'bytes_read': 0}
+	notes = collections.Counter()
+	lock = threading.Lock()
+	fetch_url = python_tools.news_enrich.fetch_url
+
+	def timed_fetch_url(*args, **kwargs):
+		start = time.perf_counter()
+		result = fetch_url(*args, **kwargs)
+		elapsed = time.perf_counter() - start
+		with lock:
+			latencies.append(elapsed)
+			totals['bytes_read'] += int(result[3] or 0)
+			notes[result[6] or str(result[0])] += 1
+		return result
+
+	# Per-URL timing around the fetch worker's call; the run itself is unchanged.
+	python_tools.news_enrich.fetch_url = timed_fetch_url
+	data_dir = os.path.join(work_dir, 'data')
+	start = time.perf_counter()
+	python_tools.news_enrich.enrich_news(
+		input_csv=os.path.join(data_dir, 'in.csv'),
+		output_yaml=os.path.join(data_dir, 'in_the_news.yml'),
+		review_csv=os.path.join(data_dir, 'needs_review.csv'),
+		snapshot_csv=os.path.join(data_dir, 'needs_snapshot.csv'),
+		head_cache_dir=os.path.join(work_dir, 'cache', 'news_head'),
+		sleep_max=0.0,
+		timeout=20.0,
+		jobs=jobs,
+		refresh=refresh,
+		host_min_interval=host_interval,
+	)
+	return {
+		'elapsed': time.perf_counter() - start,
+		'urls': len(latencies),
+		'latencies': latencies,
+		'bytes_read': totals['bytes_read'],
+		'notes': dict(notes),
+		'peak_rss_mb': peak_rss_mb(),
+	}
+
+
+#============================================
+def print_result(label: str, rows: int, result: dict, state: NewsServerState, sent_before: int) -> None:
+	"""
+	Print one result row.
+	"""
+	elapsed = result['elapsed']
+	rate = result['urls'] / elapsed if elapsed > 0 else 0.0
+	p50 = percentile(result['latencies'], 0.50) * 1000
+	p95 = percentile(result['latencies'], 0.95) * 1000
+	read_mb = result['bytes_read'] / (1024 * 1024)
+	sent_mb = (state.bytes_sent - sent_before) / (1024 * 1024)
+	print(
+		f'{label:<6}{rows:>8}{elapsed:>10.1f}{rate:>10.1f}{p50:>9.0f}{p95:>9.0f}'
+		f'{result["peak_rss_mb"]:>10.1f}{read_mb:>10.1f}{sent_mb:>10.1f}'
+	)
+	summary = ', '.join(f'{k}={v}' for k, v in sorted(result['notes'].items()))
+	print(f'      outcomes: {summary}')
+
+
+#============================================
+def main():
+	"""
+	Start the stand-in server and run enrich_news at each CSV size.
+	"""
+	args = parse_args()
+	mix = parse_mix(args.mix)
+	sizes = [int(x) for x in args.rows.split(',') if x.strip()]
+	state = NewsServerState(args, mix)
+	ports = start_servers(args.hosts, state)
+	work_root = tempfile.mkdtemp(prefix='news_enrich_bench_')
+
+	print(f'Server: {len(ports)} hosts, {args.page_kb} KB pages, {args.latency_ms:.0f} ms latency, mix {mix}')
+	print(f'Work dir: {work_root}')
+	print(f"{'pass':<6}{'rows':>8}{'seconds':>10}{'urls/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'RSS MB':>10}{'read MB':>10}{'sent MB':>10}")
+
+	# A fresh process per run, so peak RSS belongs to that run alone.
+	context = multiprocessing.get_context('spawn')
+	try:
+		for rows in sizes:
+			work_dir = os.path.join(work_root, str(rows))
+			write_input_csv(os.path.join(work_dir, 'data', 'in.csv'), rows, ports, mix, args.redirect_hops)
+			passes = [('cold', 'stale'), ('warm', 'all')] if args.warm else [('cold', 'stale')]
+			for label, refresh in passes:
+				sent_before = state.bytes_sent
+				with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+					result = pool.submit(run_enrich, work_dir, args.jobs, args.host_interval, refresh).result()
+				print_result(label, rows, result, state, sent_before)
+	finally:
+		if args.keep:
+			print(f'Kept: {work_root}')
+		else:
+			shutil.rmtree(work_root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+	main()
@@ -15,6 +15,7 @@ def on_pre_build(config, **kwargs):
 	if repo_root not in sys.path:
 		sys.path.insert(0, repo_root)
 
+	import python_tools.shows_data
 	import python_tools.past_shows
 	import python_tools.upcoming_shows
 	import python_tools.homepage_next_show
@@ -24,6 +25,8 @@ def on_pre_build(config, **kwargs):
 	input_yaml = os.path.join(repo_root, 'data', 'shows.yml')
 	today = datetime.date.today()
 	current_year = today.year
+	# Parsed once (and memoized across serve rebuilds) for all three generators.
+	dataset = python_tools.shows_data.load_shows_dataset(input_yaml, today)
 
 	python_tools.past_shows.generate_past_shows_pages(
 		input_yaml=input_yaml,
@@ -31,6 +34,7 @@ def on_pre_build(config, **kwargs):
 		current_year=current_year,
 		dry_run=False,
 		today=today,
+		dataset=dataset,
 	)
 
 	python_tools.upcoming_shows.generate_upcoming_shows_page(
@@ -38,6 +42,7 @@ def on_pre_build(config, **kwargs):
 		docs_dir=config.docs_dir,
 		dry_run=False,
 		today=today,
+		dataset=dataset,
 	)
 
 	python_tools.homepage_next_show.update_homepage_next_show(
@@ -45,6 +50,7 @@ def on_pre_build(config, **kwargs):
 		docs_dir=config.docs_dir,
 		dry_run=False,
 		today=today,
+		dataset=dataset,
 	)
 
 	# In the News (optional enrichment to avoid network calls in local dev)
@@ -56,6 +56,7 @@ def main():
 	if repo_root not in sys.path:
 		sys.path.insert(0, repo_root)
 
+	import python_tools.shows_data
 	import python_tools.past_shows
 	import python_tools.upcoming_shows
 	import python_tools.homepage_next_show
@@ -64,6 +65,8 @@ def main():
 	current_year = args.current_year
 	if current_year is None:
 		current_year = today.year
+	# Parse and validate data/shows.yml once for all three generators.
+	dataset = python_tools.shows_data.load_shows_dataset(args.input_file, today)
 
 	python_tools.past_shows.generate_past_shows_pages(
 		input_yaml=args.input_file,
@@ -71,6 +74,7 @@ def main():
 		current_year=current_year,
 		dry_run=args.dry_run,
 		today=today,
+		dataset=dataset,
 	)
 
 	python_tools.upcoming_shows.generate_upcoming_shows_page(
@@ -78,6 +82,7 @@ def main():
 		docs_dir=args.docs_dir,
 		dry_run=args.dry_run,
 		today=today,
+		dataset=dataset,
 	)
 
 	python_tools.homepage_next_show.update_homepage_next_show(
@@ -85,6 +90,7 @@ def main():
 		docs_dir=args.docs_dir,
 		dry_run=args.dry_run,
 		today=today,
+		dataset=dataset,
 	)
 
 
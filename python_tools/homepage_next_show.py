@@ -197,7 +197,7 @@ def write_text_file(path: str, content: str, dry_run: bool):
 
 
 #============================================
-def update_homepage_next_show(input_yaml: str, docs_dir: str, dry_run: bool, today=None):
+def update_homepage_next_show(input_yaml: str, docs_dir: str, dry_run: bool, today=None, dataset=None):
 	"""
 	Update mkdocs/docs/index.md next show block from data/shows.yml.
 
@@ -206,14 +206,15 @@ def update_homepage_next_show(input_yaml: str, docs_dir: str, dry_run: bool, tod
 		docs_dir (str): MkDocs docs directory.
 		dry_run (bool): If True, do not write files.
 		today: Optional override for today's date (datetime.date).
+		dataset: Optional ShowsDataset already loaded for this build (input_yaml
+			and today are then ignored).
 	"""
-	if today is None:
-		today = datetime.date.today()
+	if dataset is None:
+		dataset = python_tools.shows_data.load_shows_dataset(input_yaml, today)
+	venues = dataset.venues
 
-	raw = python_tools.shows_data.read_yaml_file(input_yaml)
-	venues, events = python_tools.shows_data.normalize_schema2(raw)
-
-	next_event, status = pick_next_event(events, today)
+	# Past events can never be picked, so only current and upcoming are scanned.
+	next_event, status = pick_next_event(dataset.current + dataset.upcoming, dataset.today)
 	venue = {}
 	if next_event:
 		venue = venues.get(next_event['venue'], {})
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import io
+import os
+import gzip
+import json
+import types
+import base64
+import hashlib
+import threading
+import http.client
+
+# PIP3 modules
+import requests
+import requests.adapters
+import requests.structures
+import requests.utils
+
+# HTTP transport modes: live talks to the network, record talks to the network
+# and saves every response hop to a cassette directory, replay serves
+# responses from that directory and never opens a connection.
+TRANSPORT_MODES = ('live', 'record', 'replay')
+CASSETTE_DIR_DEFAULT = os.path.join('cache', 'http_cassettes')
+CASSETTE_SUFFIX = '.json.gz'
+CASSETTE_SCHEMA_VERSION = 1
+KEY_CHARS = 24
+RECORD_CHUNK_BYTES = 64 * 1024
+
+# Conditional request headers are part of the cassette key, so a recorded 304
+# is only replayed for the same validators (see CassetteAdapter.load).
+KEY_HEADERS = ('If-None-Match', 'If-Modified-Since')
+
+
+#============================================
+class CassetteMiss(requests.exceptions.ConnectionError):
+	"""
+	Raised in replay mode when no response was recorded for a request.
+	"""
+
+
+#============================================
+class CassetteBody(io.BytesIO):
+	"""
+	In-memory response body that still lets requests read Set-Cookie headers.
+	"""
+
+	def __init__(self, body: bytes, header_pairs: list):
+		super().__init__(body)
+		message = http.client.HTTPMessage()
+		for name, value in header_pairs:
+			message[name] = value
+		# requests.cookies.extract_cookies_to_jar() reads _original_response.msg.
+		self._original_response = types.SimpleNamespace(msg=message)
+
+
+#============================================
+def cassette_key(method: str, url: str, headers=None) -> str:
+	"""
+	Get the cassette key for a request (method, URL, conditional headers).
+
+	Args:
+		method (str): HTTP method.
+		url (str): Full request URL.
+		headers: Request headers (only KEY_HEADERS are used).
+
+	Returns:
+		str: Hex key.
+	"""
+	headers = headers or {}
+	parts = [str(method or 'GET').upper(), str(url or '')]
+	for name in KEY_HEADERS:
+		parts.append(str(headers.get(name, '') or ''))
+	return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()[:KEY_CHARS]
+
+
+#============================================
+def build_response(request, record: dict, adapter) -> requests.Response:
+	"""
+	Build a requests.Response from a cassette record.
+
+	Args:
+		request: The PreparedRequest being answered.
+		record (dict): Cassette record (see CassetteAdapter.record_response).
+		adapter: Adapter that owns the response.
+
+	Returns:
+		requests.Response: Response with the recorded status, headers and body.
+	"""
+	header_pairs = [(str(n), str(v)) for n, v in record.get('headers', [])]
+	headers = requests.structures.CaseInsensitiveDict()
+	for name, value in header_pairs:
+		# Join repeated headers the way urllib3 does.
+		headers[name] = f'{headers[name]}, {value}' if name in headers else value
+
+	resp = requests.Response()
+	resp.status_code = int(record.get('status', 0) or 0)
+	resp.reason = str(record.get('reason', '') or '')
+	resp.headers = headers
+	resp.encoding = requests.utils.get_encoding_from_headers(headers)
+	resp.raw = CassetteBody(base64.b64decode(record.get('body', '') or ''), header_pairs)
+	resp.url = request.url
+	resp.request = request
+	resp.connection = adapter
+	return resp
+
+
+#============================================
+class CassetteAdapter(requests.adapters.HTTPAdapter):
+	"""
+	Transport adapter that records responses to, or replays them from, a cassette directory.
+
+	Requests hands the adapter one hop at a time, so redirect chains are stored
+	as one record per hop and replayed through the session's normal redirect
+	handling (resp.history is rebuilt the same way). Bodies are stored already
+	content-decoded; errors (timeouts, connection failures) are recorded too and
+	re-raised on replay.
+	"""
+
+	def __init__(self, cassette_dir: str, mode: str, max_body_bytes: int = 0, live_adapter=None):
+		"""
+		Args:
+			cassette_dir (str): Directory of <key>.json.gz records.
+			mode (str): 'record' or 'replay'.
+			max_body_bytes (int): Record at most this many body bytes (0 = all).
+			live_adapter: Adapter that sends recorded requests (default: this one).
+		"""
+		if mode not in ('record', 'replay'):
+			raise ValueError(f'Unsupported cassette mode: {mode}')
+		super().__init__()
+		self.cassette_dir = cassette_dir
+		self.mode = mode
+		self.max_body_bytes = max(0, int(max_body_bytes or 0))
+		self.live_adapter = live_adapter
+		self._lock = threading.Lock()
+
+	#============================================
+	def path_for(self, key: str) -> str:
+		"""
+		Get the record path for a cassette key.
+		"""
+		return os.path.join(self.cassette_dir, key + CASSETTE_SUFFIX)
+
+	#============================================
+	def load(self, request) -> dict:
+		"""
+		Load the record for a request, or {} if none was recorded.
+
+		A conditional request falls back to the unconditional record, since a
+		200 is a valid answer to If-None-Match / If-Modified-Since.
+		"""
+		keys = [cassette_key(request.method, request.url, request.headers)]
+		keys.append(cassette_key(request.method, request.url))
+		for key in keys:
+			try:
+				with gzip.open(self.path_for(key), 'rt', encoding='utf-8') as f:
+					record = json.load(f)
+			except FileNotFoundError:
+				continue
+			if isinstance(record, dict) and record.get('schema') == CASSETTE_SCHEMA_VERSION:
+				return record
+		return {}
+
+	#============================================
+	def save(self, request, record: dict) -> None:
+		"""
+		Write the record for a request.
+		"""
+		record = dict(record, schema=CASSETTE_SCHEMA_VERSION)
+		record['request'] = {
+			'method': str(request.method or 'GET').upper(),
+			'url': str(request.url or ''),
+		}
+		for name in KEY_HEADERS:
+			if request.headers.get(name):
+				record['request'][name] = str(request.headers.get(name))
+		text = json.dumps(record, indent=1, sort_keys=True) + '\n'
+		path = self.path_for(cassette_key(request.method, request.url, request.headers))
+		data = gzip.compress(text.encode('utf-8'), mtime=0)
+		# Worker threads may record the same redirect target at once; a temp
+		# file plus rename means a replay never reads half a record.
+		with self._lock:
+			os.makedirs(self.cassette_dir, exist_ok=True)
+			tmp_path = f'{path}.tmp{os.getpid()}'
+			with open(tmp_path, 'wb') as f:
+				f.write(data)
+			os.replace(tmp_path, path)
+
+	#============================================
+	def record_response(self, request, **kwargs) -> requests.Response:
+		"""
+		Send a request over the network and save the response hop.
+		"""
+		kwargs['stream'] = True
+		send = self.live_adapter.send if self.live_adapter is not None else super().send
+		try:
+			live = send(request, **kwargs)
+			body = bytearray()
+			truncated = False
+			try:
+				for chunk in live.iter_content(chunk_size=RECORD_CHUNK_BYTES):
+					body.extend(chunk)
+					if self.max_body_bytes and len(body) >= self.max_body_bytes:
+						truncated = True
+						del body[self.max_body_bytes:]
+						break
+			finally:
+				live.close()
+		except requests.exceptions.RequestException as exc:
+			self.save(request, {'error': type(exc).__name__, 'message': str(exc)})
+			raise
+
+		record = {
+			'status': int(live.status_code or 0),
+			'reason': str(live.reason or ''),
+			'headers': [[str(n), str(v)] for n, v in live.raw.headers.items()],
+			'body': base64.b64encode(bytes(body)).decode('ascii'),
+			'body_bytes': len(body),
+			'truncated': truncated,
+		}
+		self.save(request, record)
+		return build_response(request, record, self)
+
+	#============================================
+	def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+		"""
+		Answer one request hop from the network (record) or the cassette (replay).
+		"""
+		if self.mode == 'record':
+			return self.record_response(
+				request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies,
+			)
+		record = self.load(request)
+		if not record:
+			raise CassetteMiss(f'No recorded response for {request.method} {request.url}', request=request)
+		if record.get('error'):
+			exc_class = getattr(requests.exceptions, str(record.get('error')), None)
+			if not (isinstance(exc_class, type) and issubclass(exc_class, requests.exceptions.RequestException)):
+				exc_class = requests.exceptions.ConnectionError
+			raise exc_class(str(record.get('message', '') or ''), request=request)
+		return build_response(request, record, self)
+
+
+#============================================
+def install_transport(session: requests.Session, mode: str, cassette_dir: str = CASSETTE_DIR_DEFAULT, max_body_bytes: int = 0) -> None:
+	"""
+	Point a session at the live network, a recording, or a replay.
+
+	Args:
+		session (requests.Session): Session to configure (mounted for http and https).
+		mode (str): One of TRANSPORT_MODES.
+		cassette_dir (str): Cassette directory for record/replay.
+		max_body_bytes (int): Record at most this many body bytes per response (0 = all).
+
+	Raises:
+		ValueError: If mode is unknown.
+	"""
+	if mode not in TRANSPORT_MODES:
+		raise ValueError(f'Unsupported transport: {mode} (expected one of {", ".join(TRANSPORT_MODES)})')
+	# The session's own adapter keeps doing the network work while recording,
+	# and is put back for live mode.
+	current = session.get_adapter('https://')
+	live_adapter = current.live_adapter if isinstance(current, CassetteAdapter) else current
+	if mode == 'live':
+		if isinstance(current, CassetteAdapter):
+			for prefix in ('https://', 'http://'):
+				session.mount(prefix, live_adapter)
+		return
+	adapter = CassetteAdapter(cassette_dir, mode, max_body_bytes=max_body_bytes, live_adapter=live_adapter)
+	for prefix in ('https://', 'http://'):
+		session.mount(prefix, adapter)
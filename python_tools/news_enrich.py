@@ -11,12 +11,22 @@ import time
 import random
 import datetime
 import argparse
+import email.utils
+import threading
+import collections
 import urllib.parse
-import hashlib
+import concurrent.futures
 
 # PIP3 modules
 import requests
-import yaml
+
+# local repo modules
+import python_tools.http_cassette
+import python_tools.news_head
+import python_tools.news_head_cache
+import python_tools.news_metrics
+import python_tools.news_store
+import python_tools.yaml_io
 
 SESSION = requests.Session()
 SESSION.headers.update({
@@ -32,9 +42,73 @@ SESSION.headers.update({
 	'Connection': 'keep-alive',
 	'Upgrade-Insecure-Requests': '1',
 })
+# Times new connections for --metrics-jsonl; otherwise a plain HTTPAdapter.
+SESSION_ADAPTER = python_tools.news_metrics.TimedHTTPAdapter()
+SESSION.mount('https://', SESSION_ADAPTER)
+SESSION.mount('http://', SESSION_ADAPTER)
 
 HEAD_CACHE_DIR_DEFAULT = os.path.join('cache', 'news_head')
 
+# Version of extract_head_fields output cached in <key>.meta.json next to each
+# head cache entry. Bump it whenever extraction changes; older sidecars are
+# then ignored and rewritten.
+EXTRACTOR_VERSION = 1
+
+# Fetch engine: a bounded worker pool across hosts, one request at a time per host.
+FETCH_JOBS_DEFAULT = 8
+HOST_MAX_CONCURRENCY = 1
+HOST_MIN_INTERVAL = 1.0
+FETCH_LOOKAHEAD_FACTOR = 16
+
+# Head-only streaming: stop reading once </head> has arrived. Always read at least
+# BODY_TOO_SMALL_BYTES so tiny block pages are still read (and measured) in full.
+BODY_TOO_SMALL_BYTES = 5120
+HEAD_FETCH_CHUNK_BYTES = 16384
+HEAD_FETCH_MAX_BYTES = 1024 * 1024
+
+# Freshness policy: URLs already merged into a story are rechecked rarely, pending
+# URLs more often, and URLs not yet in the YAML are always fetched. The per-URL
+# last_checked / next_check_after bookkeeping lives in the head cache index
+# (HeadCacheIndex.checks), not in the published YAML.
+RESOLVED_TTL_DAYS = 30.0
+PENDING_TTL_DAYS = 1.0
+REFRESH_CHOICES = ('stale', 'all', 'new')
+
+# Negative cache: hard failures back off exponentially (1, 2, 4, ... days, capped)
+# and are given up after NEGATIVE_MAX_ATTEMPTS. The classes are shared with
+# news_render (python_tools.news_store.HARD_FAILURE_CLASSES).
+NEGATIVE_BACKOFF_MAX_DAYS = 30.0
+NEGATIVE_MAX_ATTEMPTS = 6
+
+# Public suffixes with two labels, so host_key() keeps one more label under
+# them (a short list for the regions publishers come from, not the full PSL).
+MULTI_PART_SUFFIXES = frozenset((
+	'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'ltd.uk', 'plc.uk', 'net.uk',
+	'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au',
+	'co.nz', 'org.nz', 'co.za', 'co.in', 'co.jp', 'ne.jp', 'or.jp', 'co.kr',
+	'com.br', 'com.mx', 'com.ar', 'com.cn', 'com.hk', 'com.tw', 'com.sg',
+))
+
+# Per-host circuit breaker (HostBreaker): after BREAKER_THRESHOLD consecutive
+# 429/503/timeout results, or a Retry-After longer than BREAKER_MAX_PAUSE
+# seconds, the host's remaining URLs are deferred to a later run. Shorter
+# Retry-After values just pause the host.
+BREAKER_THRESHOLD = 3
+BREAKER_MAX_PAUSE = 60.0
+DEFERRED_PREFIX = 'deferred:'
+
+# Known-blocker domain policy (DomainPolicy): hosts marked always_blocked are
+# not fetched; their URLs are served from the head cache, or queued for a
+# snapshot when there is none. A host is learned as blocked after
+# DOMAIN_POLICY_LEARN_STREAK block pages in a row (across runs), and learned
+# entries lapse after DOMAIN_POLICY_LEARNED_DAYS so the host is probed again.
+# Hand-written config is tracked in data/; learned state stays in cache/.
+DOMAIN_POLICY_PATH_DEFAULT = os.path.join('data', 'news_domain_policy.yml')
+DOMAIN_POLICY_STATE_PATH_DEFAULT = os.path.join('cache', 'news_domain_policy.json')
+DOMAIN_POLICY_LEARN_STREAK = 3
+DOMAIN_POLICY_LEARNED_DAYS = 30.0
+DOMAIN_POLICY_NOTE = 'domain_policy'
+
 
 #============================================
 def parse_args():
@@ -73,10 +147,89 @@ def parse_args():
 		default=HEAD_CACHE_DIR_DEFAULT,
 		help='Local head cache directory (default: cache/news_head)',
 	)
+	parser.add_argument(
+		'--transport', dest='transport', required=False, type=str,
+		choices=python_tools.http_cassette.TRANSPORT_MODES, default='live',
+		help='HTTP transport: live, record (live plus save responses), or replay (saved responses only, no network) (default: live)',
+	)
+	parser.add_argument(
+		'--cassette-dir', dest='cassette_dir', required=False, type=str,
+		default=python_tools.http_cassette.CASSETTE_DIR_DEFAULT,
+		help='Recorded responses for --transport record/replay (default: cache/http_cassettes)',
+	)
+	parser.add_argument(
+		'--metrics-jsonl', dest='metrics_jsonl', required=False, type=str,
+		default='',
+		help='Write per-URL stage timings, bytes and dispositions plus a run summary to this JSONL file',
+	)
+	parser.add_argument(
+		'--breaker-threshold', dest='breaker_threshold', required=False, type=int,
+		default=BREAKER_THRESHOLD,
+		help=f'Defer the rest of a host after this many 429/503/timeout results in a row; 0 disables (default: {BREAKER_THRESHOLD})',
+	)
+	parser.add_argument(
+		'--domain-policy', dest='domain_policy_path', required=False, type=str,
+		default=DOMAIN_POLICY_PATH_DEFAULT,
+		help=f'Known-blocker domain policy YAML, relative to the repo root (default: {DOMAIN_POLICY_PATH_DEFAULT})',
+	)
+	parser.add_argument(
+		'--domain-policy-state', dest='domain_policy_state_path', required=False, type=str,
+		default=DOMAIN_POLICY_STATE_PATH_DEFAULT,
+		help=f'Learned domain policy state (JSON), relative to the repo root (default: {DOMAIN_POLICY_STATE_PATH_DEFAULT})',
+	)
+	parser.add_argument(
+		'--ignore-domain-policy', dest='ignore_domain_policy', action='store_true',
+		help='Fetch always_blocked hosts anyway (outcomes still update the policy)',
+	)
 	parser.add_argument(
 		'-s', '--sleep-max', dest='sleep_max', required=False, type=float,
 		default=1.0,
-		help='Max random sleep (seconds) before each request (default: 1.0)',
+		help='Max random extra delay (seconds) between requests to the same host (default: 1.0)',
+	)
+	parser.add_argument(
+		'-j', '--jobs', dest='jobs', required=False, type=int,
+		default=FETCH_JOBS_DEFAULT,
+		help=f'Parallel fetch workers across hosts (default: {FETCH_JOBS_DEFAULT})',
+	)
+	parser.add_argument(
+		'-f', '--refresh', dest='refresh', required=False, type=str,
+		choices=REFRESH_CHOICES, default='stale',
+		help='Which URLs to fetch: stale (new or past next_check_after), all, or new only (default: stale)',
+	)
+	parser.add_argument(
+		'--resolved-ttl', dest='resolved_ttl_days', required=False, type=float,
+		default=RESOLVED_TTL_DAYS,
+		help=f'Days before a URL already in a story is checked again (default: {RESOLVED_TTL_DAYS})',
+	)
+	parser.add_argument(
+		'--pending-ttl', dest='pending_ttl_days', required=False, type=float,
+		default=PENDING_TTL_DAYS,
+		help=f'Days before a pending URL is checked again (default: {PENDING_TTL_DAYS})',
+	)
+	parser.add_argument(
+		'--max-attempts', dest='max_attempts', required=False, type=int,
+		default=NEGATIVE_MAX_ATTEMPTS,
+		help=f'Give up on a hard-failed URL after this many attempts (default: {NEGATIVE_MAX_ATTEMPTS})',
+	)
+	parser.add_argument(
+		'--html-parser', dest='html_parser', required=False, type=str,
+		choices=python_tools.news_head.PARSER_BACKENDS, default='auto',
+		help='HTML parser backend; auto uses selectolax or lxml when installed, else stdlib (default: auto)',
+	)
+	parser.add_argument(
+		'--cache-gc', dest='cache_gc', required=False,
+		action='store_true',
+		help='After writing the YAML, delete head cache entries it no longer references',
+	)
+	parser.add_argument(
+		'--cache-max-mb', dest='cache_max_mb', required=False, type=float,
+		default=0.0,
+		help='With --cache-gc: evict least-recently-used heads above this many MB (default: no cap)',
+	)
+	parser.add_argument(
+		'--cache-max-entries', dest='cache_max_entries', required=False, type=int,
+		default=0,
+		help='With --cache-gc: evict least-recently-used heads above this count (default: no cap)',
 	)
 	parser.add_argument(
 		'-t', '--timeout', dest='timeout', required=False, type=float,
@@ -388,12 +541,12 @@ def parse_canonical_url(html_text: str, base_url: str) -> str:
 	html_text = str(html_text or '')
 	base_url = str(base_url or '').strip()
 
-	parsed = parse_head_data(html_text)
-	href = normalize_url(parsed.get('canonical_url', '') or '')
+	doc = python_tools.news_head.parse_head_document(html_text)
+	href = normalize_url(doc.canonical_url)
 	if href:
 		return urllib.parse.urljoin(base_url, href)
 
-	og_url = normalize_url((parsed.get('meta_property', {}) or {}).get('og:url', '') or '')
+	og_url = normalize_url(doc.meta_property.get('og:url', '') or '')
 	if og_url:
 		return urllib.parse.urljoin(base_url, og_url)
 
@@ -401,425 +554,215 @@ def parse_canonical_url(html_text: str, base_url: str) -> str:
 
 
 #============================================
-class _HeadParser(html.parser.HTMLParser):
-	"""
-	Simple HTML head parser for meta/link/title.
-	"""
-
-	def __init__(self):
-		super().__init__()
-		self.meta_name = {}
-		self.meta_property = {}
-		self.canonical_url = ''
-		self._in_title = False
-		self._title_parts = []
-
-	def handle_starttag(self, tag, attrs):
-		tag = str(tag or '').lower()
-		attrs_dict = {}
-		for k, v in (attrs or []):
-			if not k:
-				continue
-			attrs_dict[str(k).lower()] = str(v or '')
-
-		if tag == 'meta':
-			content = normalize_text(attrs_dict.get('content', '') or '')
-			if not content:
-				return
-			name = normalize_text(attrs_dict.get('name', '') or '').lower()
-			prop = normalize_text(attrs_dict.get('property', '') or '').lower()
-			if name:
-				self.meta_name[name] = content
-			if prop:
-				self.meta_property[prop] = content
-			return
-
-		if tag == 'link':
-			rel = normalize_text(attrs_dict.get('rel', '') or '').lower()
-			href = normalize_text(attrs_dict.get('href', '') or '')
-			if rel == 'canonical' and href:
-				self.canonical_url = href
-			return
-
-		if tag == 'title':
-			self._in_title = True
-			return
-
-	def handle_endtag(self, tag):
-		tag = str(tag or '').lower()
-		if tag == 'title':
-			self._in_title = False
-
-	def handle_data(self, data):
-		if not self._in_title:
-			return
-		data = normalize_text(data)
-		if data:
-			self._title_parts.append(data)
-
-	def get_title(self) -> str:
-		out = ' '.join(self._title_parts)
-		out = normalize_text(out)
-		return out
-
-
-#============================================
-def parse_head_data(html_text: str) -> dict:
+def read_csv_rows(csv_path: str) -> list:
 	"""
-	Parse head metadata using stdlib HTMLParser.
+	Read input CSV rows.
 
 	Args:
-		html_text (str): HTML text.
+		csv_path (str): CSV file path.
 
 	Returns:
-		dict: {'meta_name':{}, 'meta_property':{}, 'canonical_url':'', 'title':''}
+		list: List of dict rows.
 	"""
-	parser = _HeadParser()
-	parser.feed(str(html_text or ''))
-	out = {
-		'meta_name': parser.meta_name,
-		'meta_property': parser.meta_property,
-		'canonical_url': normalize_text(parser.canonical_url),
-		'title': parser.get_title(),
-	}
-	return out
+	with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+		reader = csv.DictReader(f)
+		rows = []
+		for row in reader:
+			if not isinstance(row, dict):
+				continue
+			rows.append(row)
+	return rows
 
 
 #============================================
-def sha1_12(text: str) -> str:
+def iso_utc_now() -> str:
 	"""
-	Get a short SHA1 prefix for stable cache filenames.
-
-	Args:
-		text (str): Input text.
+	Get a stable UTC timestamp for YAML/CSV fields.
 
 	Returns:
-		str: First 12 hex chars of SHA1.
+		str: ISO 8601 UTC timestamp like 2025-12-14T15:59:55Z
 	"""
-	text = str(text or '')
-	h = hashlib.sha1(text.encode('utf-8', errors='ignore')).hexdigest()
-	return h[:12]
+	now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+	return now.isoformat().replace('+00:00', 'Z')
 
 
 #============================================
-def head_cache_path_for_url(url: str, cache_dir: str = HEAD_CACHE_DIR_DEFAULT) -> str:
+def iso_utc_after(days: float) -> str:
 	"""
-	Get deterministic head cache path for a URL.
+	Get a UTC timestamp a number of days from now, in the iso_utc_now() format.
 
 	Args:
-		url (str): URL.
-		cache_dir (str): Cache directory.
+		days (float): Offset in days.
 
 	Returns:
-		str: Cache file path.
-	"""
-	url = normalize_url(url)
-	cache_dir = str(cache_dir or '').strip() or HEAD_CACHE_DIR_DEFAULT
-	name = sha1_12(url) + '.head.html'
-	return os.path.join(cache_dir, name)
-
-
-#============================================
-def extract_best_url_from_html_head(html_text: str, base_url: str) -> str:
+		str: ISO 8601 UTC timestamp.
 	"""
-	Extract a "best URL" from an HTML document head.
-
-	Priority:
-	1) <link rel="canonical">
-	2) meta property="og:url"
-	3) meta name="twitter:url"
-	4) JSON-LD mainEntityOfPage.@id or url
-	"""
-	html_text = str(html_text or '')
-	base_url = normalize_url(base_url)
-
-	parsed = parse_head_data(html_text)
-	meta_name = parsed.get('meta_name', {}) or {}
-	meta_property = parsed.get('meta_property', {}) or {}
-
-	canonical = normalize_url(parsed.get('canonical_url', '') or '')
-	if canonical:
-		canonical = urllib.parse.urljoin(base_url, canonical)
-
-	og_url = normalize_url(meta_property.get('og:url', '') or '')
-	if og_url:
-		og_url = urllib.parse.urljoin(base_url, og_url)
-
-	twitter_url = normalize_url(meta_name.get('twitter:url', '') or '')
-	if twitter_url:
-		twitter_url = urllib.parse.urljoin(base_url, twitter_url)
-
-	jsonld_url = ''
-	for jsonld_value in extract_json_ld_objects(html_text):
-		candidates = []
-		if isinstance(jsonld_value, dict):
-			candidates.append(jsonld_value)
-		elif isinstance(jsonld_value, list):
-			for it in jsonld_value:
-				if isinstance(it, dict):
-					candidates.append(it)
-
-		for obj in candidates:
-			me = obj.get('mainEntityOfPage')
-			if isinstance(me, dict) and isinstance(me.get('@id'), str):
-				jsonld_url = normalize_url(me.get('@id') or '')
-				break
-			if isinstance(obj.get('url'), str):
-				jsonld_url = normalize_url(obj.get('url') or '')
-				break
-		if jsonld_url:
-			break
-	if jsonld_url:
-		jsonld_url = urllib.parse.urljoin(base_url, jsonld_url)
-
-	for u in [canonical, og_url, twitter_url, jsonld_url]:
-		u = normalize_url(u)
-		if not u:
-			continue
-		if u.startswith('//'):
-			u = 'https:' + u
-		if u.startswith('http'):
-			return u
-
-	return ''
+	now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+	later = now + datetime.timedelta(days=float(days))
+	return later.isoformat().replace('+00:00', 'Z')
 
 
 #============================================
-def _json_sanitize_no_images(value):
+def parse_iso_utc(text: str):
 	"""
-	Remove image-like fields from JSON-LD objects (recursive).
+	Parse an ISO 8601 timestamp written by iso_utc_now().
 
 	Args:
-		value: JSON-compatible value.
+		text (str): Timestamp text.
 
 	Returns:
-		Sanitized value.
-	"""
-	if isinstance(value, list):
-		return [_json_sanitize_no_images(v) for v in value]
-
-	if isinstance(value, dict):
-		drop = set(['image', 'thumbnail', 'thumbnailurl', 'thumbnailUrl', 'logo'])
-		out = {}
-		for k, v in value.items():
-			ks = str(k or '')
-			k_lower = ks.lower()
-			if k_lower in drop:
-				continue
-			out[k] = _json_sanitize_no_images(v)
-		return out
-
+		datetime.datetime | None: Aware UTC datetime, or None if missing/invalid.
+	"""
+	t = str(text or '').strip()
+	if not t:
+		return None
+	if t.endswith('Z'):
+		t = t[:-1] + '+00:00'
+	try:
+		value = datetime.datetime.fromisoformat(t)
+	except ValueError:
+		return None
+	if value.tzinfo is None:
+		value = value.replace(tzinfo=datetime.timezone.utc)
 	return value
 
 
 #============================================
-def _is_image_meta(attrs: dict) -> bool:
-	"""
-	Detect meta tags that reference images (to exclude from cache).
+def check_is_due(check: dict, now: datetime.datetime) -> bool:
 	"""
-	name = normalize_text(attrs.get('name', '') or '').lower()
-	prop = normalize_text(attrs.get('property', '') or '').lower()
-	key = prop or name
+	Check whether a URL's freshness record is past its next_check_after.
 
-	if key.startswith('og:image'):
-		return True
-	if key.startswith('twitter:image'):
-		return True
-	if key in ('image', 'thumbnail', 'thumbnailurl'):
-		return True
-
-	return False
+	URLs without a usable next_check_after (never checked) are treated as due.
 
+	Args:
+		check (dict): Record from HeadCacheIndex.check_for().
+		now (datetime.datetime): Current UTC time.
 
-#============================================
-def _is_image_link(attrs: dict) -> bool:
-	"""
-	Detect link tags that reference icons/images (to exclude from cache).
+	Returns:
+		bool: True if the URL should be fetched again.
 	"""
-	rel = normalize_text(attrs.get('rel', '') or '').lower()
-	as_attr = normalize_text(attrs.get('as', '') or '').lower()
-
-	if as_attr == 'image':
-		return True
-
-	if 'icon' in rel:
-		return True
-	if 'apple-touch-icon' in rel:
-		return True
-	if 'mask-icon' in rel:
+	next_check = parse_iso_utc((check or {}).get('next_check_after', '') or '')
+	if next_check is None:
 		return True
-
-	return False
+	return next_check <= now
 
 
 #============================================
-class _HeadCacheCollector(html.parser.HTMLParser):
+def negative_cache_fields(previous: dict, failure_class: str, max_attempts: int) -> dict:
 	"""
-	Collect title/meta/link and JSON-LD scripts for a compact head cache.
-	"""
-
-	def __init__(self):
-		super().__init__()
-		self._in_title = False
-		self._title_parts = []
-		self._in_jsonld = False
-		self._jsonld_parts = []
-
-		self.meta_tags = []
-		self.link_tags = []
-		self.jsonld_scripts = []
-
-	def handle_starttag(self, tag, attrs):
-		tag = str(tag or '').lower()
-		attrs_dict = {}
-		for k, v in (attrs or []):
-			if not k:
-				continue
-			attrs_dict[str(k).lower()] = str(v or '')
-
-		if tag == 'title':
-			self._in_title = True
-			return
-
-		if tag == 'meta':
-			if not _is_image_meta(attrs_dict):
-				self.meta_tags.append(attrs_dict)
-			return
-
-		if tag == 'link':
-			if not _is_image_link(attrs_dict):
-				self.link_tags.append(attrs_dict)
-			return
-
-		if tag == 'script':
-			type_attr = normalize_text(attrs_dict.get('type', '') or '').lower()
-			if type_attr == 'application/ld+json':
-				self._in_jsonld = True
-				self._jsonld_parts = []
-
-	def handle_endtag(self, tag):
-		tag = str(tag or '').lower()
-		if tag == 'title':
-			self._in_title = False
-			return
-
-		if tag == 'script' and self._in_jsonld:
-			raw = ''.join(self._jsonld_parts)
-			raw = raw.strip()
-			self._in_jsonld = False
-			self._jsonld_parts = []
-			if raw:
-				self.jsonld_scripts.append(raw)
-
-	def handle_data(self, data):
-		if self._in_title:
-			data = normalize_text(data)
-			if data:
-				self._title_parts.append(data)
-			return
-
-		if self._in_jsonld:
-			self._jsonld_parts.append(str(data or ''))
-
-	def title_text(self) -> str:
-		return normalize_text(' '.join(self._title_parts))
-
-
-#============================================
-def build_head_cache_html(full_html: str) -> str:
-	"""
-	Build a minimal HTML document containing only the head metadata we care about.
-
-	Includes:
-	- <title>
-	- all <meta ...> (excluding image-related)
-	- all <link ...> (excluding icons/images)
-	- all <script type="application/ld+json"> (sanitized to remove image fields)
-	"""
-	parser = _HeadCacheCollector()
-	parser.feed(str(full_html or ''))
-
-	lines = []
-	lines.append('<!doctype html>')
-	lines.append('<html>')
-	lines.append('<head>')
-
-	title = parser.title_text()
-	if title:
-		lines.append('<title>' + html.escape(title) + '</title>')
-
-	def emit_tag(tag: str, attrs: dict):
-		parts = [tag]
-		for k in sorted(attrs.keys()):
-			v = str(attrs.get(k, '') or '')
-			if v == '':
-				continue
-			parts.append(f'{k}=\"{html.escape(v, quote=True)}\"')
-		return '<' + ' '.join(parts) + '>'
+	Compute the negative-cache fields for a pending record after a failed fetch.
 
-	for attrs in parser.meta_tags:
-		lines.append(emit_tag('meta', attrs))
+	Hard failures (news_store.HARD_FAILURE_CLASSES) count attempts across runs; other
+	failures get no fields (see recheck_delay_days for the backoff). A deferred
+	result (DEFERRED_PREFIX, host breaker open) was never fetched, so the
+	previous hard-failure fields are carried over unchanged.
 
-	for attrs in parser.link_tags:
-		lines.append(emit_tag('link', attrs))
+	Args:
+		previous (dict): Previous pending record for the URL (or empty).
+		failure_class (str): Fetch failure class (fetch_url notes or status code).
+		max_attempts (int): Attempts before giving up for good.
 
-	for raw in parser.jsonld_scripts:
-		# Prefer safe JSON-LD (no image fields). If invalid JSON, omit from cache.
+	Returns:
+		dict: failure_class/attempts/gave_up for hard failures, else {}.
+	"""
+	hard_classes = python_tools.news_store.HARD_FAILURE_CLASSES
+	if str(failure_class or '').startswith(DEFERRED_PREFIX):
+		if not (isinstance(previous, dict) and previous.get('failure_class', None) in hard_classes):
+			return {}
+		return {k: previous[k] for k in ('failure_class', 'attempts', 'gave_up') if k in previous}
+	if failure_class not in hard_classes:
+		return {}
+
+	attempts = 0
+	if isinstance(previous, dict) and previous.get('failure_class', None) in hard_classes:
 		try:
-			obj = json.loads(raw)
-		except Exception:
-			continue
-		obj = _json_sanitize_no_images(obj)
-		raw_out = json.dumps(obj, ensure_ascii=False, indent=2)
-		lines.append('<script type=\"application/ld+json\">')
-		lines.append(raw_out)
-		lines.append('</script>')
+			attempts = int(previous.get('attempts', 0) or 0)
+		except (TypeError, ValueError):
+			attempts = 0
+	attempts += 1
 
-	lines.append('</head>')
-	lines.append('</html>')
-	return '\n'.join(lines) + '\n'
+	out = {
+		'failure_class': failure_class,
+		'attempts': attempts,
+	}
+	if attempts >= int(max_attempts):
+		out['gave_up'] = True
+	return out
 
 
 #============================================
-def read_text_file(path: str) -> str:
-	"""
-	Read a UTF-8 text file (best-effort).
+def recheck_delay_days(failure: dict, pending_ttl_days: float) -> float:
 	"""
-	with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-		return f.read()
+	Days until a failed URL is due again.
 
-
-#============================================
-def read_csv_rows(csv_path: str) -> list:
-	"""
-	Read input CSV rows.
+	Hard failures back off exponentially from pending_ttl_days (1, 2, 4, ...
+	times), capped at NEGATIVE_BACKOFF_MAX_DAYS; other failures use the plain
+	pending TTL.
 
 	Args:
-		csv_path (str): CSV file path.
+		failure (dict): negative_cache_fields() result.
+		pending_ttl_days (float): Base recheck delay in days.
 
 	Returns:
-		list: List of dict rows.
+		float: Delay in days.
 	"""
-	with open(csv_path, 'r', encoding='utf-8', newline='') as f:
-		reader = csv.DictReader(f)
-		rows = []
-		for row in reader:
-			if not isinstance(row, dict):
-				continue
-			rows.append(row)
-	return rows
+	attempts = int(failure.get('attempts', 0) or 0)
+	if attempts < 1:
+		return float(pending_ttl_days)
+	return min(float(pending_ttl_days) * (2 ** (attempts - 1)), NEGATIVE_BACKOFF_MAX_DAYS)
 
 
 #============================================
-def iso_utc_now() -> str:
+def select_urls_to_fetch(urls: list, store, refresh: str, head_index) -> list:
 	"""
-	Get a stable UTC timestamp for YAML/CSV fields.
+	Apply the freshness policy to the CSV URL list.
+
+	- new: URLs that are neither in a story nor pending.
+	- stale: new URLs, plus resolved/pending URLs past next_check_after. A pending
+	  URL whose head cache was written after its last check (snapshot workflow)
+	  is also due; one that was given up on is not otherwise.
+	- all: every URL.
+
+	Args:
+		urls (list): Normalized CSV URLs, in CSV order.
+		store (NewsStore): Story and pending records, indexed by normalized URL.
+		refresh (str): One of REFRESH_CHOICES.
+		head_index (HeadCacheIndex): Head cache index (freshness records and
+			snapshot-added heads).
 
 	Returns:
-		str: ISO 8601 UTC timestamp like 2025-12-14T15:59:55Z
+		list: URLs to fetch, in CSV order.
 	"""
-	now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
-	return now.isoformat().replace('+00:00', 'Z')
+	if refresh == 'all':
+		return list(urls)
+
+	now = datetime.datetime.now(datetime.timezone.utc)
+	out = []
+	for url in urls:
+		p = store.pending_by_url.get(url)
+		s = store.story_for_url(url)
+		# Only stories with a title, date and primary_url count as resolved.
+		if s is not None and not (s.get('title', None) and s.get('published_date', None) and s.get('primary_url', None)):
+			s = None
+		if p is None and s is None:
+			out.append(url)
+			continue
+		if refresh == 'new':
+			continue
+		check = head_index.check_for(url)
+		if p is not None:
+			if (not p.get('gave_up', False)) and check_is_due(check, now):
+				out.append(url)
+				continue
+			# Head cache indexed after the last check (e.g. by news_snapshot_extract).
+			last_checked = parse_iso_utc(check.get('last_checked', '') or p.get('last_checked', '') or '')
+			fetched_at = parse_iso_utc(head_index.lookup([url]).get('fetched_at', '') or '')
+			if last_checked is not None and fetched_at is not None and fetched_at > last_checked:
+				out.append(url)
+			continue
+		if check_is_due(check, now):
+			out.append(url)
+	return out
 
 
 #============================================
@@ -882,8 +825,7 @@ def read_yaml_or_default(yaml_path: str) -> list:
 	if not os.path.exists(yaml_path):
 		return []
 
-	with open(yaml_path, 'r', encoding='utf-8') as f:
-		data = yaml.safe_load(f)
+	data = python_tools.yaml_io.load_file(yaml_path)
 
 	if data is None:
 		return []
@@ -991,6 +933,9 @@ def order_pending_fields(pending: dict) -> dict:
 		'cache_path',
 		'last_checked',
 		'reason',
+		'failure_class',
+		'attempts',
+		'gave_up',
 	]
 	out = {}
 	for k in keys:
@@ -1013,14 +958,13 @@ def read_news_store(yaml_path: str) -> dict:
 		stories: [ ... ]
 		pending: [ ... ]
 
+	Sharded layout (see python_tools/news_store.py):
+	- <yaml_path without .yml>/YYYY.yml, undated.yml and pending.yml, merged
+
 	Backward-compatible:
 	- schema 1 dict with items (old pipeline)
 	"""
-	if not os.path.exists(yaml_path):
-		return {'schema': 1, 'stories': [], 'pending': []}
-
-	with open(yaml_path, 'r', encoding='utf-8') as f:
-		data = yaml.safe_load(f)
+	data = python_tools.news_store.read_news_yaml(yaml_path)
 
 	if data is None:
 		return {'schema': 1, 'stories': [], 'pending': []}
@@ -1071,12 +1015,11 @@ def read_news_store(yaml_path: str) -> dict:
 
 		# Deterministic id assignment: per date, in (date,title,source) order.
 		provisional = sorted(provisional, key=lambda s: (s.get('published_date', ''), s.get('title', ''), s.get('source', '')))
-		used_ids = set()
+		id_store = python_tools.news_store.NewsStore()
 		stories = []
 		for s in provisional:
-			sid = allocate_story_id(s.get('published_date', ''), used_ids)
 			out = dict(s)
-			out['id'] = sid
+			id_store.assign_id(out)
 			stories.append(out)
 
 		return {'schema': 1, 'stories': stories, 'pending': []}
@@ -1088,39 +1031,6 @@ def read_news_store(yaml_path: str) -> dict:
 	raise ValueError('Unexpected YAML format for in_the_news.yml')
 
 
-#============================================
-def _suffix_sequence():
-	"""
-	Yield suffixes: a..z, aa..az, ba..bz, ...
-	"""
-	letters = 'abcdefghijklmnopqrstuvwxyz'
-	for a in letters:
-		yield a
-	for a in letters:
-		for b in letters:
-			yield a + b
-
-
-#============================================
-def allocate_story_id(published_date: str, used_ids: set) -> str:
-	"""
-	Allocate the next available YYYYMMDD suffix id.
-	"""
-	date_key = str(published_date or '').replace('-', '')
-	if not re.match(r'^\d{8}$', date_key):
-		date_key = '00000000'
-
-	for suffix in _suffix_sequence():
-		cand = date_key + suffix
-		if cand in used_ids:
-			continue
-		used_ids.add(cand)
-		return cand
-
-	# Extremely unlikely to run out in practice.
-	raise RuntimeError('Unable to allocate story id (too many for one date)')
-
-
 #============================================
 def normalize_fingerprint_text(text: str) -> str:
 	"""
@@ -1219,7 +1129,7 @@ def write_text_file_if_changed(path: str, content: str) -> bool:
 #============================================
 def yaml_dump(data) -> str:
 	"""
-	Dump YAML with stable formatting.
+	Dump YAML with stable formatting (python_tools/yaml_io.py, libyaml when available).
 
 	Args:
 		data (dict): YAML dict.
@@ -1227,43 +1137,7 @@ def yaml_dump(data) -> str:
 	Returns:
 		str: YAML text.
 	"""
-	out = yaml.safe_dump(
-		data,
-		sort_keys=False,
-		default_flow_style=False,
-		width=100,
-		allow_unicode=True,
-	)
-	return out
-
-
-#============================================
-def extract_json_ld_objects(html_text: str) -> list:
-	"""
-	Extract JSON-LD objects from script tags.
-
-	Args:
-		html_text (str): HTML text.
-
-	Returns:
-		list: List of parsed JSON values (dicts/lists).
-	"""
-	html_text = str(html_text or '')
-	pattern = r'<script[^>]+type=[\"\']application/ld\+json[\"\'][^>]*>(.*?)</script>'
-	matches = re.findall(pattern, html_text, flags=re.IGNORECASE | re.DOTALL)
-
-	out = []
-	for raw in matches:
-		raw = raw.strip()
-		if not raw:
-			continue
-		try:
-			parsed = json.loads(raw)
-		except Exception:
-			continue
-		out.append(parsed)
-
-	return out
+	return python_tools.yaml_io.dump(data)
 
 
 #============================================
@@ -1302,120 +1176,12 @@ def jsonld_pick_article(jsonld_value):
 
 
 #============================================
-def extract_meta_content(html_text: str, attr_name: str, attr_value: str) -> str:
+def extract_metadata(doc: python_tools.news_head.HeadDocument) -> dict:
 	"""
-	Extract a meta tag content attribute by name/property.
+	Extract metadata from a parsed head using JSON-LD, then meta tags, then HTML fallbacks.
 
 	Args:
-		html_text (str): HTML text.
-		attr_name (str): 'name' or 'property'.
-		attr_value (str): Attribute value.
-
-	Returns:
-		str: Meta content or ''.
-	"""
-	html_text = str(html_text or '')
-	attr_name = str(attr_name or '').strip().lower()
-	attr_value = str(attr_value or '').strip()
-
-	# This is intentionally simple and regex-based (no full HTML parsing).
-	pattern = (
-		r'<meta[^>]+'
-		+ attr_name
-		+ r'=[\"\']'
-		+ re.escape(attr_value)
-		+ r'[\"\'][^>]*content=[\"\'](.*?)[\"\'][^>]*>'
-	)
-	match = re.search(pattern, html_text, flags=re.IGNORECASE | re.DOTALL)
-	if not match:
-		pattern2 = (
-			r'<meta[^>]+content=[\"\'](.*?)[\"\'][^>]*'
-			+ attr_name
-			+ r'=[\"\']'
-			+ re.escape(attr_value)
-			+ r'[\"\'][^>]*>'
-		)
-		match = re.search(pattern2, html_text, flags=re.IGNORECASE | re.DOTALL)
-
-	if not match:
-		return ''
-
-	return normalize_text(match.group(1))
-
-
-#============================================
-def extract_html_title(html_text: str) -> str:
-	"""
-	Extract HTML <title>.
-
-	Args:
-		html_text (str): HTML text.
-
-	Returns:
-		str: Title or ''.
-	"""
-	match = re.search(r'<title[^>]*>(.*?)</title>', str(html_text or ''), flags=re.IGNORECASE | re.DOTALL)
-	if not match:
-		return ''
-	return normalize_text(match.group(1))
-
-
-#============================================
-def strip_tags(text: str) -> str:
-	"""
-	Remove HTML tags (best-effort).
-
-	Args:
-		text (str): HTML snippet.
-
-	Returns:
-		str: Plain-ish text.
-	"""
-	text = str(text or '')
-	text = re.sub(r'<script.*?</script>', ' ', text, flags=re.IGNORECASE | re.DOTALL)
-	text = re.sub(r'<style.*?</style>', ' ', text, flags=re.IGNORECASE | re.DOTALL)
-	text = re.sub(r'<[^>]+>', ' ', text)
-	text = normalize_text(text)
-	return text
-
-
-#============================================
-def extract_byline_fallback(html_text: str) -> str:
-	"""
-	Very simple byline fallback: find "By <Name>" near top of doc.
-
-	Args:
-		html_text (str): HTML text.
-
-	Returns:
-		str: Author name or ''.
-	"""
-	snippet = str(html_text or '')[:8000]
-	plain = strip_tags(snippet)
-
-	match = re.search(
-		r'\bBy\s+([A-Z][A-Za-z\.\'\-]+(?:\s+[A-Z][A-Za-z\.\'\-]+){0,4})\b',
-		plain,
-		flags=re.IGNORECASE,
-	)
-	if not match:
-		return ''
-
-	name = normalize_text(match.group(1))
-	if not name:
-		return ''
-	if len(name) > 60:
-		return ''
-	return name
-
-
-#============================================
-def extract_metadata(html_text: str) -> dict:
-	"""
-	Extract metadata from HTML using JSON-LD, then meta tags, then HTML fallbacks.
-
-	Args:
-		html_text (str): HTML text.
+		doc (HeadDocument): Parsed document (see news_head.parse_head_document).
 
 	Returns:
 		dict: Metadata fields (title, author, published_time, modified_time, source, teaser).
@@ -1430,8 +1196,7 @@ def extract_metadata(html_text: str) -> dict:
 	}
 
 	# 1) JSON-LD (preferred)
-	jsonld_values = extract_json_ld_objects(html_text)
-	for jsonld_value in jsonld_values:
+	for jsonld_value in doc.jsonld:
 		obj = jsonld_pick_article(jsonld_value)
 		if not obj:
 			continue
@@ -1462,9 +1227,8 @@ def extract_metadata(html_text: str) -> dict:
 		# Found an article object; stop.
 		break
 
-	parsed = parse_head_data(html_text)
-	meta_name = parsed.get('meta_name', {}) or {}
-	meta_property = parsed.get('meta_property', {}) or {}
+	meta_name = doc.meta_name
+	meta_property = doc.meta_property
 
 	# 2) Meta tags (Open Graph / article)
 	if not meta['author']:
@@ -1488,13 +1252,43 @@ def extract_metadata(html_text: str) -> dict:
 
 	# 3) HTML fallback
 	if not meta['title']:
-		meta['title'] = normalize_text(parsed.get('title', '') or '') or extract_html_title(html_text)
+		meta['title'] = normalize_text(doc.title)
 	if not meta['author']:
-		meta['author'] = extract_byline_fallback(html_text)
+		meta['author'] = doc.get_byline()
 
 	return meta
 
 
+#============================================
+def extract_head_fields(doc: python_tools.news_head.HeadDocument) -> dict:
+	"""
+	Extract the story fields enrich_news uses from a parsed head.
+
+	The result depends only on the head content, so it is cached per head
+	cache entry (see EXTRACTOR_VERSION). URL-based fallbacks (source from the
+	domain, date from the path) are applied by the caller.
+
+	Args:
+		doc (HeadDocument): Parsed head cache document.
+
+	Returns:
+		dict: title, author, published_date, teaser, source, best_url_candidates.
+	"""
+	meta = extract_metadata(doc)
+	published_time = normalize_text(meta.get('published_time', '') or '')
+	teaser = normalize_text(meta.get('teaser', '') or '')
+	fields = {
+		'title': normalize_text(meta.get('title', '') or ''),
+		'author': normalize_text(meta.get('author', '') or ''),
+		'published_date': date_from_time_text(published_time),
+		'teaser': teaser_truncate(teaser) if teaser else '',
+		'source': normalize_text(meta.get('source', '') or ''),
+		# Unresolved, since the best URL depends on the base URL of each fetch.
+		'best_url_candidates': python_tools.news_head.best_url_candidates(doc),
+	}
+	return fields
+
+
 #============================================
 def domain_to_source(domain: str) -> str:
 	"""
@@ -1691,8 +1485,7 @@ def title_preview(html_text: str) -> str:
 	Returns:
 		str: Title preview (first 200 chars) or ''.
 	"""
-	title = extract_html_title(html_text)
-	title = normalize_text(title)
+	title = python_tools.news_head.parse_head_document(html_text).title
 	if not title:
 		return ''
 	return title[:200]
@@ -1710,14 +1503,14 @@ def html_preview_if_no_title(html_text: str) -> str:
 		str: Preview (first 200 chars) or ''.
 	"""
 	snippet = str(html_text or '')[:4000]
-	plain = strip_tags(snippet)
+	plain = python_tools.news_head.strip_tags(snippet)
 	plain = safe_ascii(plain)
 	plain = normalize_text(plain)
 	return plain[:200]
 
 
 #============================================
-def fetch(url: str, timeout: float, referer: str = '') -> requests.Response:
+def fetch(url: str, timeout: float, referer: str = '', stream: bool = False, validators: dict = None) -> requests.Response:
 	"""
 	Fetch a URL using the global browser-like session.
 
@@ -1725,6 +1518,8 @@ def fetch(url: str, timeout: float, referer: str = '') -> requests.Response:
 		url (str): URL.
 		timeout (float): Timeout seconds.
 		referer (str): Optional referer.
+		stream (bool): If True, defer reading the body (caller must close).
+		validators (dict): Optional {etag, last_modified} for a conditional request.
 
 	Returns:
 		requests.Response: Response.
@@ -1732,34 +1527,133 @@ def fetch(url: str, timeout: float, referer: str = '') -> requests.Response:
 	headers = {}
 	if referer:
 		headers['Referer'] = referer
-	return SESSION.get(url, timeout=timeout, allow_redirects=True, headers=headers)
+	validators = validators or {}
+	if validators.get('etag'):
+		headers['If-None-Match'] = str(validators.get('etag'))
+	if validators.get('last_modified'):
+		headers['If-Modified-Since'] = str(validators.get('last_modified'))
+	return SESSION.get(url, timeout=timeout, allow_redirects=True, headers=headers, stream=stream)
+
+
+#============================================
+def read_head_stream(resp: requests.Response) -> tuple:
+	"""
+	Read a streamed response until the head has arrived, then stop.
+
+	Reading stops once </head> has been seen and at least BODY_TOO_SMALL_BYTES
+	are buffered, or at HEAD_FETCH_MAX_BYTES. Any JSON-LD inside the head is
+	therefore complete.
+
+	Args:
+		resp (requests.Response): Response opened with stream=True.
+
+	Returns:
+		tuple: (data:bytes, complete:bool) where complete means the whole body was read.
+	"""
+	buf = bytearray()
+	complete = True
+	for chunk in resp.iter_content(chunk_size=HEAD_FETCH_CHUNK_BYTES):
+		if not chunk:
+			continue
+		buf.extend(chunk)
+		if len(buf) >= BODY_TOO_SMALL_BYTES and python_tools.news_head.find_head_end(buf) >= 0:
+			complete = False
+			break
+		if len(buf) >= HEAD_FETCH_MAX_BYTES:
+			complete = False
+			break
+	return (bytes(buf), complete)
+
+
+#============================================
+def decode_body(data: bytes, encoding: str) -> str:
+	"""
+	Decode response bytes using the response encoding (utf-8 fallback).
+
+	Args:
+		data (bytes): Body bytes.
+		encoding (str): Encoding name from the response (may be empty).
+
+	Returns:
+		str: Decoded text.
+	"""
+	encoding = str(encoding or '').strip() or 'utf-8'
+	try:
+		text = data.decode(encoding, errors='replace')
+	except LookupError:
+		text = data.decode('utf-8', errors='replace')
+	return text
+
+
+#============================================
+def classify_request_error(exc: Exception) -> str:
+	"""
+	Classify a requests exception into a fetch failure class.
+
+	Args:
+		exc (Exception): Exception raised by fetch().
+
+	Returns:
+		str: ssl_error, dns, connection_error, or request_error.
+	"""
+	if isinstance(exc, requests.exceptions.SSLError):
+		return 'ssl_error'
+	if isinstance(exc, requests.exceptions.ConnectionError):
+		text = str(exc).lower()
+		dns_markers = ['nameresolutionerror', 'name or service not known', 'nodename nor servname', 'getaddrinfo failed', 'temporary failure in name resolution', 'no address associated']
+		for marker in dns_markers:
+			if marker in text:
+				return 'dns'
+		return 'connection_error'
+	return 'request_error'
 
 
 #============================================
-def fetch_url(url: str, timeout: float, sleep_max: float, referer: str = '') -> tuple:
+def fetch_url(
+	url: str,
+	timeout: float,
+	sleep_max: float,
+	referer: str = '',
+	head_only: bool = False,
+	validators: dict = None,
+	timing: dict = None,
+) -> tuple:
 	"""
 	Fetch a URL with polite random sleep and redirects enabled.
 
+	With head_only=True the body is streamed and the connection is closed as
+	soon as the head has arrived (see read_head_stream). body_bytes is then the
+	number of decoded bytes read: the full body size when the page is smaller
+	than BODY_TOO_SMALL_BYTES, and at least BODY_TOO_SMALL_BYTES otherwise, so
+	the body_too_small block heuristic keeps working.
+
+	With validators, the request is conditional; a 304 comes back with
+	notes='not_modified' and no body.
+
 	Args:
 		url (str): URL.
 		timeout (float): Timeout seconds.
 		sleep_max (float): Max sleep seconds.
 		referer (str): Optional referer.
+		head_only (bool): Stream the body and stop reading after </head>.
+		validators (dict): Optional {etag, last_modified} from a previous fetch.
+		timing (dict): Optional dict that receives download seconds and wire_bytes
+			(body bytes before content decoding).
 
 	Returns:
-		tuple: (status_code:int, final_url:str, content_type:str, body_bytes:int, redirect_chain:list, html_text:str, notes:str)
+		tuple: (status_code:int, final_url:str, content_type:str, body_bytes:int, redirect_chain:list, html_text:str, notes:str, headers:dict)
 	"""
 	if sleep_max and sleep_max > 0:
 		time.sleep(random.random() * sleep_max)
 
 	try:
-		resp = fetch(url=url, timeout=timeout, referer=referer)
+		resp = fetch(url=url, timeout=timeout, referer=referer, stream=head_only, validators=validators)
 	except requests.exceptions.TooManyRedirects:
-		return (0, url, '', 0, [], '', 'redirect_loop')
+		return (0, url, '', 0, [], '', 'redirect_loop', {})
 	except requests.exceptions.Timeout:
-		return (0, url, '', 0, [], '', 'timeout')
-	except requests.exceptions.RequestException:
-		return (0, url, '', 0, [], '', 'request_error')
+		return (0, url, '', 0, [], '', 'timeout', {})
+	except requests.exceptions.RequestException as exc:
+		return (0, url, '', 0, [], '', classify_request_error(exc), {})
 
 	status_code = int(resp.status_code or 0)
 	final_url = str(resp.url or url)
@@ -1771,8 +1665,17 @@ def fetch_url(url: str, timeout: float, sleep_max: float, referer: str = '') ->
 	except Exception:
 		redirect_chain = []
 
+	# Keep only the response headers later stages use.
+	headers = {}
+	for name in ('etag', 'last-modified', 'retry-after'):
+		value = str(resp.headers.get(name, '') or '').strip()
+		if value:
+			headers[name] = value
+
 	notes = ''
-	if status_code == 404:
+	if status_code == 304:
+		notes = 'not_modified'
+	elif status_code == 404:
 		notes = '404'
 	elif status_code == 410:
 		notes = '410'
@@ -1785,14 +1688,433 @@ def fetch_url(url: str, timeout: float, sleep_max: float, referer: str = '') ->
 
 	text = ''
 	body_bytes = 0
-	if status_code == 200:
+	timing = timing if timing is not None else {}
+	download_start = time.perf_counter()
+	if status_code == 200 and head_only:
+		# Body read errors count as fetch failures, as they do for non-streamed reads.
+		try:
+			data, _ = read_head_stream(resp)
+		except requests.exceptions.RequestException:
+			resp.close()
+			timing['download'] = time.perf_counter() - download_start
+			return (0, url, '', 0, [], '', 'request_error', {})
+		body_bytes = len(data)
+		text = decode_body(data, resp.encoding)
+	elif status_code == 200:
 		try:
 			body_bytes = int(len(resp.content or b''))
 		except Exception:
 			body_bytes = 0
 		text = resp.text or ''
+	timing['download'] = time.perf_counter() - download_start
+	try:
+		timing['wire_bytes'] = int(resp.raw.tell())
+	except Exception:
+		timing['wire_bytes'] = body_bytes
 
-	return (status_code, final_url, content_type, body_bytes, redirect_chain, text, notes)
+	# Streamed responses hold the connection until closed.
+	resp.close()
+
+	return (status_code, final_url, content_type, body_bytes, redirect_chain, text, notes, headers)
+
+
+#============================================
+def host_key(url: str) -> str:
+	"""
+	Get the politeness key for a URL (registrable domain plus port).
+
+	The key is the last two hostname labels, or three under a multi-part
+	public suffix (MULTI_PART_SUFFIXES), so bbc.co.uk and thetimes.co.uk stay
+	apart. IP addresses are used whole.
+
+	Args:
+		url (str): URL.
+
+	Returns:
+		str: Host key (e.g., "https://www.dailyherald.com/x" -> "dailyherald.com").
+	"""
+	parsed = urllib.parse.urlparse(str(url or ''))
+	hostname = str(parsed.hostname or '').lower()
+	labels = [p for p in hostname.split('.') if p]
+	if ':' in hostname or (labels and all(p.isdigit() for p in labels)):
+		key = hostname
+	elif '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES:
+		key = '.'.join(labels[-3:])
+	else:
+		key = '.'.join(labels[-2:])
+	if parsed.port:
+		key += ':' + str(parsed.port)
+	return key
+
+
+#============================================
+class HostThrottle:
+	"""
+	Thread-safe per-host request spacing.
+
+	Each host gets a reserved start time; requests to the same host are spaced
+	by min_interval plus a random jitter of up to sleep_max seconds. Requests to
+	different hosts never wait on each other.
+	"""
+
+	def __init__(self, min_interval: float, sleep_max: float):
+		self.min_interval = max(0.0, float(min_interval or 0.0))
+		self.sleep_max = max(0.0, float(sleep_max or 0.0))
+		self._lock = threading.Lock()
+		self._next_start = {}
+
+	def wait(self, url: str) -> float:
+		"""
+		Block until this host may be contacted again.
+
+		Args:
+			url (str): URL about to be requested.
+
+		Returns:
+			float: Seconds slept.
+		"""
+		key = host_key(url)
+		with self._lock:
+			now = time.monotonic()
+			start = max(now, self._next_start.get(key, now))
+			# Reserve the next slot before sleeping so concurrent callers queue up.
+			self._next_start[key] = start + self.min_interval + random.random() * self.sleep_max
+		delay = start - now
+		if delay > 0:
+			time.sleep(delay)
+		return delay
+
+	def defer(self, url: str, seconds: float) -> None:
+		"""
+		Push this host's next request start at least seconds into the future.
+
+		Args:
+			url (str): URL on the host to pause.
+			seconds (float): Pause length.
+		"""
+		key = host_key(url)
+		with self._lock:
+			resume = time.monotonic() + max(0.0, float(seconds or 0.0))
+			self._next_start[key] = max(self._next_start.get(key, resume), resume)
+
+
+#============================================
+def retry_after_seconds(value: str):
+	"""
+	Parse a Retry-After header (delay seconds or an HTTP date).
+
+	Args:
+		value (str): Header value.
+
+	Returns:
+		float | None: Seconds from now (never negative), or None if missing/invalid.
+	"""
+	text = str(value or '').strip()
+	if not text:
+		return None
+	if text.isdigit():
+		return float(text)
+	try:
+		when = email.utils.parsedate_to_datetime(text)
+	except (TypeError, ValueError):
+		return None
+	if when.tzinfo is None:
+		when = when.replace(tzinfo=datetime.timezone.utc)
+	return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+#============================================
+class HostBreaker:
+	"""
+	Thread-safe per-host circuit breaker for throttling and unhealthy hosts.
+
+	429, 503 and timeout results count as strikes; any other result resets the
+	host's count. A Retry-After up to max_pause pauses the host (through the
+	HostThrottle); a longer one, or threshold strikes in a row, opens the
+	breaker and the host's remaining URLs are skipped for this run with a
+	'deferred:<cause>' note instead of being fetched.
+	"""
+
+	def __init__(self, threshold: int = BREAKER_THRESHOLD, max_pause: float = BREAKER_MAX_PAUSE):
+		self.threshold = max(1, int(threshold or 1))
+		self.max_pause = max(0.0, float(max_pause or 0.0))
+		self._lock = threading.Lock()
+		self._strikes = collections.Counter()
+		self.opened = {}
+
+	def deferred_result(self, url: str):
+		"""
+		Get the stand-in fetch result for a URL on an open host.
+
+		Args:
+			url (str): URL about to be fetched.
+
+		Returns:
+			tuple | None: fetch_url()-shaped result, or None if the host is healthy.
+		"""
+		key = host_key(url)
+		with self._lock:
+			state = self.opened.get(key)
+			if state is None:
+				return None
+			state['deferred'] += 1
+			headers = {'retry-after': str(int(state['retry_after']))} if state['retry_after'] else {}
+			return (0, url, '', 0, [], '', DEFERRED_PREFIX + state['cause'], headers)
+
+	def record(self, url: str, result: tuple, throttle: HostThrottle) -> None:
+		"""
+		Update the host's health from a fetch result.
+
+		Args:
+			url (str): URL that was fetched.
+			result (tuple): fetch_url() result.
+			throttle (HostThrottle): Throttle to pause the host on a short Retry-After.
+		"""
+		status_code, notes, headers = int(result[0] or 0), str(result[6] or ''), result[7] or {}
+		if status_code == 429:
+			cause = 'rate_limited'
+		elif status_code == 503:
+			cause = 'server_unavailable'
+		elif notes == 'timeout':
+			cause = 'timeout'
+		else:
+			cause = ''
+
+		key = host_key(url)
+		retry_after = retry_after_seconds(headers.get('retry-after', '')) if cause else None
+		with self._lock:
+			if not cause:
+				self._strikes.pop(key, None)
+				return
+			self._strikes[key] += 1
+			too_long = retry_after is not None and retry_after > self.max_pause
+			if (too_long or self._strikes[key] >= self.threshold) and key not in self.opened:
+				self.opened[key] = {'cause': cause, 'retry_after': retry_after or 0.0, 'deferred': 0}
+				return
+		if retry_after:
+			throttle.defer(url, retry_after)
+
+
+#============================================
+class DomainPolicy:
+	"""
+	Per-host fetch policy, configured in YAML and learned from block pages.
+
+	The config file (schema 1, hand-edited, tracked in git) is only read:
+		domains:
+		  dailyherald.com: {policy: always_blocked, source: config, note: ...}
+	Learned state lives in a JSON file under cache/ (keyed by host_key()):
+		{"schema": 1, "domains": {"example.com": {"blocked_streak": 1}, ...}}
+	A learned entry (policy always_blocked, source learned) is dropped again
+	as soon as the host serves a real page.
+	"""
+
+	def __init__(self, path: str, state_path: str):
+		self.path = path
+		self.state_path = state_path
+		self.config = {}
+		self.learned = {}
+		if os.path.exists(path):
+			data = python_tools.yaml_io.load_file(path) or {}
+			if not isinstance(data, dict) or data.get('schema', 1) != 1:
+				raise ValueError(f'Unsupported domain policy file: {path}')
+			for key, entry in (data.get('domains', {}) or {}).items():
+				if isinstance(entry, dict):
+					self.config[str(key).lower()] = dict(entry)
+		if os.path.exists(state_path):
+			with open(state_path, 'r', encoding='utf-8') as f:
+				state = json.load(f)
+			if not isinstance(state, dict) or state.get('schema', 1) != 1:
+				raise ValueError(f'Unsupported domain policy state file: {state_path}')
+			for key, entry in (state.get('domains', {}) or {}).items():
+				if isinstance(entry, dict):
+					self.learned[str(key).lower()] = dict(entry)
+
+	def is_blocked(self, url: str) -> bool:
+		"""
+		Check whether a URL's host is currently marked always_blocked.
+		"""
+		key = host_key(url)
+		if self.config.get(key, {}).get('policy', '') == 'always_blocked':
+			return True
+		entry = self.learned.get(key, {})
+		if entry.get('policy', '') != 'always_blocked':
+			return False
+		learned_at = parse_iso_utc(entry.get('learned_at', '') or '')
+		if learned_at is None:
+			return False
+		age = datetime.datetime.now(datetime.timezone.utc) - learned_at
+		return age < datetime.timedelta(days=DOMAIN_POLICY_LEARNED_DAYS)
+
+	def observe(self, url: str, blocked: bool) -> bool:
+		"""
+		Record one fetch outcome for the URL's host (learned state only).
+
+		Args:
+			url (str): Fetched URL.
+			blocked (bool): True for a block page, False for a real page.
+
+		Returns:
+			bool: True if the host was just learned as always_blocked.
+		"""
+		key = host_key(url)
+		if not blocked:
+			self.learned.pop(key, None)
+			return False
+		entry = self.learned.setdefault(key, {})
+		entry['blocked_streak'] = int(entry.get('blocked_streak', 0) or 0) + 1
+		if entry['blocked_streak'] < DOMAIN_POLICY_LEARN_STREAK or self.is_blocked(url):
+			return False
+		self.learned[key] = {
+			'policy': 'always_blocked',
+			'source': 'learned',
+			'learned_at': iso_utc_now(),
+			'blocked_streak': entry['blocked_streak'],
+		}
+		return True
+
+	def save(self) -> bool:
+		"""
+		Write the learned state file if it changed (the config is never written).
+
+		Returns:
+			bool: True if the file was written.
+		"""
+		if not self.learned and not os.path.exists(self.state_path):
+			return False
+		state = {
+			'schema': 1,
+			'domains': {key: self.learned[key] for key in sorted(self.learned)},
+		}
+		return write_text_file_if_changed(self.state_path, json.dumps(state, indent=1, sort_keys=True) + '\n')
+
+
+#============================================
+def _fetch_worker(url: str, timeout: float, throttle: HostThrottle, validators: dict, timing: dict = None, breaker: HostBreaker = None) -> tuple:
+	"""
+	Fetch one URL after waiting for its host slot (runs in a worker thread).
+
+	Args:
+		url (str): URL.
+		timeout (float): Timeout seconds.
+		throttle (HostThrottle): Shared per-host throttle.
+		validators (dict): Optional conditional-request validators.
+		timing (dict): Optional dict that receives queue_wait, sleep, connect,
+			ttfb, download (seconds) and wire_bytes.
+		breaker (HostBreaker): Optional breaker; open hosts are not contacted.
+
+	Returns:
+		tuple: Same tuple as fetch_url().
+	"""
+	timing = timing if timing is not None else {}
+	started = time.perf_counter()
+	timing['queue_wait'] = started - timing.pop('queued_at', started)
+	# Check before and after the host wait: the breaker may open meanwhile.
+	deferred = breaker.deferred_result(url) if breaker is not None else None
+	if deferred is None:
+		timing['sleep'] = throttle.wait(url)
+		deferred = breaker.deferred_result(url) if breaker is not None else None
+	if deferred is not None:
+		return deferred
+	python_tools.news_metrics.reset_connect_time()
+	fetch_start = time.perf_counter()
+	result = fetch_url(url=url, timeout=timeout, sleep_max=0, referer='', head_only=True, validators=validators, timing=timing)
+	elapsed = time.perf_counter() - fetch_start
+	# Time to the response headers, across every redirect hop, minus connects.
+	timing['connect'] = python_tools.news_metrics.connect_time()
+	timing['ttfb'] = max(0.0, elapsed - timing['connect'] - timing.get('download', 0.0))
+	if breaker is not None:
+		breaker.record(url, result, throttle)
+	return result
+
+
+#============================================
+def iter_fetch_results(
+	urls: list,
+	timeout: float,
+	sleep_max: float,
+	jobs: int = FETCH_JOBS_DEFAULT,
+	host_max_concurrency: int = HOST_MAX_CONCURRENCY,
+	host_min_interval: float = HOST_MIN_INTERVAL,
+	validators_by_url: dict = None,
+	timings: dict = None,
+	breaker: HostBreaker = None,
+):
+	"""
+	Fetch URLs concurrently across hosts and yield results in input order.
+
+	Scheduling happens here (not in the workers): a URL is only submitted when
+	its host has a free slot, so workers never sit blocked behind a busy host
+	while other hosts are idle. Lookahead is bounded to keep memory flat.
+
+	Args:
+		urls (list): URLs in processing order.
+		timeout (float): Request timeout seconds.
+		sleep_max (float): Max random jitter between requests to one host.
+		jobs (int): Worker threads.
+		host_max_concurrency (int): Max in-flight requests per host.
+		host_min_interval (float): Min seconds between request starts per host.
+		validators_by_url (dict): Optional {url: validators} for conditional requests.
+		timings (dict): Optional dict filled with {url: stage timings} (see _fetch_worker);
+			queue_wait counts from when the URL enters the lookahead window.
+		breaker (HostBreaker): Optional per-host circuit breaker.
+
+	Yields:
+		tuple: (url, fetch_url result tuple), in the same order as urls.
+	"""
+	urls = list(urls or [])
+	jobs = max(1, int(jobs or 1))
+	host_max_concurrency = max(1, int(host_max_concurrency or 1))
+	lookahead = jobs * FETCH_LOOKAHEAD_FACTOR
+	throttle = HostThrottle(host_min_interval, sleep_max)
+	validators_by_url = validators_by_url or {}
+
+	waiting = collections.deque()
+	next_index = 0
+	next_yield = 0
+	results = {}
+	in_flight = {}
+	in_flight_by_host = collections.Counter()
+
+	with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as executor:
+		while next_yield < len(urls):
+			# Extend the lookahead window in input order.
+			while next_index < len(urls) and next_index < next_yield + lookahead:
+				waiting.append(next_index)
+				if timings is not None:
+					timings[urls[next_index]] = {'queued_at': time.perf_counter()}
+				next_index += 1
+
+			# Submit every waiting URL whose host has a free slot.
+			held = collections.deque()
+			while waiting and len(in_flight) < jobs:
+				idx = waiting.popleft()
+				key = host_key(urls[idx])
+				if in_flight_by_host[key] >= host_max_concurrency:
+					held.append(idx)
+					continue
+				validators = validators_by_url.get(urls[idx])
+				timing = timings.get(urls[idx]) if timings is not None else None
+				future = executor.submit(_fetch_worker, urls[idx], timeout, throttle, validators, timing, breaker)
+				in_flight[future] = (idx, key)
+				in_flight_by_host[key] += 1
+			held.extend(waiting)
+			waiting = held
+
+			if in_flight:
+				done, _ = concurrent.futures.wait(
+					list(in_flight.keys()),
+					return_when=concurrent.futures.FIRST_COMPLETED,
+				)
+				for future in done:
+					idx, key = in_flight.pop(future)
+					in_flight_by_host[key] -= 1
+					results[idx] = future.result()
+
+			# Release finished results in input order.
+			while next_yield in results:
+				yield (urls[next_yield], results.pop(next_yield))
+				next_yield += 1
 
 
 #============================================
@@ -2136,7 +2458,7 @@ def _enrich_news_legacy(
 
 		# Only parse metadata when the response looks like real HTML content.
 		if status_code == 200 and (not non_html) and (not body_too_small) and (not block_markers):
-			meta = extract_metadata(html_text)
+			meta = extract_metadata(python_tools.news_head.parse_head_document(html_text))
 
 		title = title_override if title_override else meta.get('title', '')
 		title = normalize_text(title)
@@ -2184,7 +2506,7 @@ def _enrich_news_legacy(
 			if status_code2 == 200 and is_html_content_type(content_type2) and int(body_bytes2 or 0) >= 5120:
 				block_markers2 = detect_block_markers(html_text2)
 				if not block_markers2:
-					meta2 = extract_metadata(html_text2)
+					meta2 = extract_metadata(python_tools.news_head.parse_head_document(html_text2))
 					title2 = normalize_text(meta2.get('title', '') or '')
 					if title2 and not looks_like_html(title2):
 						if verbose:
@@ -2467,6 +2789,26 @@ def _enrich_news_legacy(
 		print(f'Wrote review CSV: {wrote_review}')
 
 
+#============================================
+def add_url_metrics(metrics, metric: dict, disposition: list) -> None:
+	"""
+	Finish a per-URL metrics record and hand it to the sink.
+
+	total is the URL's own work time: connect + ttfb + download + parse +
+	extract (queue_wait and sleep are scheduling, not the publisher).
+
+	Args:
+		metrics: python_tools.news_metrics.FetchMetrics, or None when disabled.
+		metric (dict): Record built up while processing the URL.
+		disposition (list): Where the URL ended up: story, pending, review, snapshot, skipped.
+	"""
+	if metrics is None:
+		return
+	metric['disposition'] = list(disposition)
+	metric['total'] = sum(float(metric.get(k, 0.0) or 0.0) for k in ('connect', 'ttfb', 'download', 'parse', 'extract'))
+	metrics.add(metric)
+
+
 #============================================
 def enrich_news(
 	input_csv: str,
@@ -2478,6 +2820,23 @@ def enrich_news(
 	verbose: bool = False,
 	snapshot_csv: str = 'data/in_the_news_needs_snapshot.csv',
 	head_cache_dir: str = HEAD_CACHE_DIR_DEFAULT,
+	jobs: int = FETCH_JOBS_DEFAULT,
+	refresh: str = 'stale',
+	resolved_ttl_days: float = RESOLVED_TTL_DAYS,
+	pending_ttl_days: float = PENDING_TTL_DAYS,
+	max_attempts: int = NEGATIVE_MAX_ATTEMPTS,
+	html_parser: str = 'auto',
+	cache_gc: bool = False,
+	cache_max_mb: float = 0.0,
+	cache_max_entries: int = 0,
+	transport: str = 'live',
+	cassette_dir: str = python_tools.http_cassette.CASSETTE_DIR_DEFAULT,
+	host_min_interval: float = HOST_MIN_INTERVAL,
+	metrics_jsonl: str = '',
+	breaker_threshold: int = BREAKER_THRESHOLD,
+	domain_policy_path: str = DOMAIN_POLICY_PATH_DEFAULT,
+	ignore_domain_policy: bool = False,
+	domain_policy_state_path: str = DOMAIN_POLICY_STATE_PATH_DEFAULT,
 ):
 	"""
 	Enrich the In the News dataset.
@@ -2485,14 +2844,42 @@ def enrich_news(
 	- Input CSV stays clean (URLs only).
 	- Canonical YAML stores one record per story, with multiple URLs.
 	- Uses a local head cache for metadata extraction when blocked.
-	"""
-	store = read_news_store(output_yaml)
-	stories = store.get('stories', []) if isinstance(store.get('stories', None), list) else []
-	pending = store.get('pending', []) if isinstance(store.get('pending', None), list) else []
-
-	stories_by_fingerprint = {}
-	used_ids = set()
-	for s in [x for x in stories if isinstance(x, dict)]:
+	- Fetches run concurrently across hosts (see iter_fetch_results), but
+	  results are merged serially in CSV order so outputs match a serial run.
+	- Only new or stale URLs are fetched by default (see select_urls_to_fetch);
+	  skipped URLs keep their YAML records and review/snapshot rows.
+	- Hard failures (404/410, timeouts, DNS/connection/SSL errors) back off
+	  exponentially and are given up after max_attempts (negative_cache_fields).
+	- With cache_gc, head cache entries the written YAML no longer references
+	  are deleted and LRU caps applied (HeadCacheIndex.gc).
+	- transport='record' saves every response to cassette_dir, and 'replay'
+	  answers from it without touching the network (python_tools/http_cassette.py).
+	- With metrics_jsonl, one JSON record per URL (stage timings, bytes, cache
+	  use, disposition) and a closing run summary are written there.
+	- A host that keeps answering 429/503 or timing out trips a circuit breaker
+	  (HostBreaker, breaker_threshold strikes; 0 disables it): its remaining URLs
+	  are not fetched and stay pending as 'deferred:<cause>'. Retry-After pushes
+	  the URL's next check out when it is longer than the pending TTL.
+	- Per-URL last_checked / next_check_after live in the head cache index
+	  (HeadCacheIndex.checks), so a refresh that changes no metadata leaves
+	  the YAML untouched.
+	- output_yaml may be sharded per year (python_tools/news_store.py); then
+	  only shards whose stories or pending records changed are rewritten.
+	- Hosts the domain policy marks always_blocked (DomainPolicy) are not
+	  fetched: cached URLs come from the head cache, the rest go straight to
+	  the snapshot queue. Block pages seen on real fetches update the learned
+	  policy state (domain_policy_state_path, under cache/), never the config.
+	"""
+	# One indexed store for stories and pending records (python_tools/news_store.py).
+	data = read_news_store(output_yaml)
+	# Sharded output only re-serializes shards whose content changes.
+	sharded = python_tools.news_store.is_sharded(output_yaml)
+	loaded_digests = python_tools.news_store.shard_digests(data) if sharded else {}
+	store = python_tools.news_store.NewsStore()
+	# Freshness dates written into the YAML by older versions move to the head
+	# cache index below: (urls, last_checked, next_check_after).
+	legacy_checks = []
+	for s in [x for x in data.get('stories', []) if isinstance(x, dict)]:
 		# Compute fingerprint for existing stories (if missing).
 		published_date = str(s.get('published_date', '') or '').strip()
 		title = str(s.get('title', '') or '').strip()
@@ -2502,71 +2889,44 @@ def enrich_news(
 			fp = make_story_fingerprint(published_date, source, title)
 			s['fingerprint'] = fp
 
+		# URLs are indexed (and merged) in normalized form.
+		urls_list = s.get('urls', [])
+		s['urls'] = [normalize_url(u) for u in urls_list] if isinstance(urls_list, list) else []
+
 		# Ensure primary_url exists for existing stories when possible.
 		if not normalize_url(s.get('primary_url', '') or ''):
-			urls_list = s.get('urls', [])
-			if isinstance(urls_list, list):
-				for u in urls_list:
-					u = normalize_url(u)
-					if u:
-						s['primary_url'] = u
-						break
-
-		if not isinstance(s, dict):
-			continue
-		sid = str(s.get('id', '') or '').strip()
-		if sid:
-			used_ids.add(sid)
-
-		# De-duplicate any existing YAML duplicates by fingerprint.
-		fp = str(s.get('fingerprint', '') or '').strip()
-		if not fp:
-			continue
-		existing = stories_by_fingerprint.get(fp)
-		if existing is None:
-			stories_by_fingerprint[fp] = s
-			continue
-
-		# Merge URLs; only fill missing fields to avoid churn.
-		ex_urls = existing.get('urls', [])
-		if not isinstance(ex_urls, list):
-			ex_urls = []
-		s_urls = s.get('urls', [])
-		if not isinstance(s_urls, list):
-			s_urls = []
-		for u in s_urls:
-			u = normalize_url(u)
-			if not u:
-				continue
-			if u not in ex_urls:
-				ex_urls.append(u)
-		existing['urls'] = ex_urls
-
-		for k in ['source', 'published_date', 'title', 'author', 'teaser', 'primary_url']:
-			if (not existing.get(k, None)) and s.get(k, None):
-				existing[k] = s.get(k, None)
+			for u in s['urls']:
+				if u:
+					s['primary_url'] = u
+					break
+		if 'next_check_after' in s:
+			legacy_checks.append((s['urls'], s.pop('last_checked', ''), s.pop('next_check_after', '')))
 
-		# Prefer keeping an existing id; never overwrite a non-empty id.
-		if (not existing.get('id', None)) and s.get('id', None):
-			existing['id'] = s.get('id', None)
+		# De-duplicates any existing YAML duplicates by fingerprint (URLs merged,
+		# only missing fields filled to avoid churn).
+		store.add_story(s)
 
-	pending_by_url = {}
-	for p in pending:
+	pending_by_url = store.pending_by_url
+	for p in data.get('pending', []):
 		if not isinstance(p, dict):
 			continue
 		u = normalize_url(p.get('url', '') or '')
 		if u:
 			pending_by_url[u] = p
+			if 'next_check_after' in p:
+				legacy_checks.append(([u], p.get('last_checked', ''), p.pop('next_check_after', '')))
 
 	rows = read_csv_rows(input_csv)
 	urls = []
+	seen_urls = set()
 	for row in rows:
 		if not isinstance(row, dict):
 			continue
 		url = normalize_url(row.get('url', '') or '')
 		if not url:
 			continue
-		if url not in urls:
+		if url not in seen_urls:
+			seen_urls.add(url)
 			urls.append(url)
 
 	if max_items is not None:
@@ -2577,17 +2937,116 @@ def enrich_news(
 
 	repo_root = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(output_yaml)), os.pardir))
 
+	if refresh not in REFRESH_CHOICES:
+		raise ValueError(f'Unknown refresh mode: {refresh}')
+	html_parser = python_tools.news_head.resolve_backend(html_parser)
+	head_cache_abs = head_cache_dir if os.path.isabs(head_cache_dir) else os.path.join(repo_root, head_cache_dir)
+	# Every URL the CSV and YAML know, to recognize legacy (URL-hash) head files.
+	known_urls = sorted(seen_urls) + sorted(python_tools.news_head_cache.referenced_urls(data))
+	head_index = python_tools.news_head_cache.HeadCacheIndex(head_cache_abs, known_urls)
+	for check_urls, last_checked, next_check_after in legacy_checks:
+		for u in check_urls:
+			if next_check_after and u not in head_index.checks:
+				head_index.record_check(u, str(next_check_after), str(last_checked or ''))
+	cassette_abs = cassette_dir if os.path.isabs(cassette_dir) else os.path.join(repo_root, cassette_dir)
+	# Reads stop at the head, so a recording never needs more than the head cap.
+	python_tools.http_cassette.install_transport(SESSION, transport, cassette_abs, max_body_bytes=HEAD_FETCH_MAX_BYTES)
+	fetch_urls = select_urls_to_fetch(urls, store, refresh, head_index)
+	fetch_set = set(fetch_urls)
+	policy_abs = domain_policy_path if os.path.isabs(domain_policy_path) else os.path.join(repo_root, domain_policy_path)
+	state_abs = domain_policy_state_path if os.path.isabs(domain_policy_state_path) else os.path.join(repo_root, domain_policy_state_path)
+	domain_policy = DomainPolicy(policy_abs, state_abs)
+	policy_urls = set()
+	if not ignore_domain_policy:
+		policy_urls = {url for url in fetch_urls if domain_policy.is_blocked(url)}
+
+	# Skipped URLs carry their previous review/snapshot rows forward unchanged.
+	previous_review_by_url = {}
+	previous_snapshot_by_url = {}
+	if len(fetch_urls) < len(urls):
+		for path, by_url in [(review_csv, previous_review_by_url), (snapshot_csv, previous_snapshot_by_url)]:
+			if not os.path.exists(path):
+				continue
+			for row in read_csv_rows(path):
+				u = normalize_url(row.get('url', '') or '')
+				if u:
+					by_url.setdefault(u, []).append(row)
+
+	# Conditional revalidation: reuse stored ETag/Last-Modified for URLs with a cached head.
+	validators_by_url = {}
+	for url in fetch_urls:
+		if url in policy_urls:
+			continue
+		validators = head_index.validators_for(url)
+		if validators:
+			validators_by_url[url] = validators
+
 	total = len(urls)
+	if verbose:
+		print(f'Refresh: {refresh} ({len(fetch_urls)} of {total} URLs to fetch)')
+		if policy_urls:
+			print(f'Domain policy: {len(policy_urls)} URLs on always_blocked hosts (no fetch)')
+		print(f'HTML parser: {html_parser}')
+	metrics = python_tools.news_metrics.FetchMetrics(metrics_jsonl) if metrics_jsonl else None
+	fetch_timings = {} if metrics is not None else None
+
+	# A replay has no server to be polite to, so per-host spacing is skipped.
+	replay = transport == 'replay'
+	breaker = HostBreaker(breaker_threshold) if breaker_threshold and breaker_threshold > 0 else None
+	fetch_results = iter_fetch_results(
+		[url for url in fetch_urls if url not in policy_urls],
+		timeout=timeout,
+		sleep_max=0.0 if replay else sleep_max,
+		jobs=jobs,
+		host_min_interval=0.0 if replay else host_min_interval,
+		validators_by_url=validators_by_url,
+		timings=fetch_timings,
+		breaker=breaker,
+	)
 	for idx, url in enumerate(urls, start=1):
+		if url not in fetch_set:
+			review_rows.extend(previous_review_by_url.get(url, []))
+			snapshot_rows.extend(previous_snapshot_by_url.get(url, []))
+			if verbose:
+				print(f'[{idx}/{total}] {url}')
+				print('  fresh: skipped')
+			add_url_metrics(metrics, {'url': url, 'fetched': False}, ['skipped'])
+			continue
+
+		# Results arrive in fetch_urls order, which follows the CSV order.
+		policy_skip = url in policy_urls
+		if policy_skip:
+			fetch_result = (0, url, '', 0, [], '', DOMAIN_POLICY_NOTE, {})
+		else:
+			_, fetch_result = next(fetch_results)
 		if verbose:
 			print(f'[{idx}/{total}] {url}')
 
-		status_code, final_url, content_type, body_bytes, redirect_chain, html_text, fetch_note = fetch_url(
-			url=url,
-			timeout=timeout,
-			sleep_max=sleep_max,
-			referer='',
-		)
+		status_code, final_url, content_type, body_bytes, redirect_chain, html_text, fetch_note, response_headers = fetch_result
+		metric = fetch_timings.pop(url, {}) if fetch_timings is not None else {}
+		metric.update({
+			'url': url,
+			'fetched': not policy_skip,
+			'status_code': int(status_code or 0),
+			'fetch_note': fetch_note,
+			'redirects': len(redirect_chain),
+			'decoded_bytes': int(body_bytes or 0),
+			'parse': 0.0,
+			'extract': 0.0,
+		})
+
+		# 304 Not Modified: the cached head is current, so treat it like a fresh 200.
+		validators = validators_by_url.get(url, {})
+		# (The entry can only be gone if an earlier URL in this run replaced its content.)
+		not_modified = bool(status_code == 304 and validators and validators['key'] in head_index.entries)
+		cached_fields = {}
+		if not_modified:
+			status_code = 200
+			content_type = 'text/html'
+			fetch_note = ''
+			# With the extracted fields cached, the head file is not needed at all.
+			cached_fields = head_index.read_fields(validators, EXTRACTOR_VERSION)
+			html_text = '' if cached_fields else head_index.read_head(validators)
 
 		if verbose:
 			print(f'  status_code: {status_code}')
@@ -2598,19 +3057,23 @@ def enrich_news(
 				print(f'  redirect_chain: {len(redirect_chain)}')
 			if fetch_note:
 				print(f'  fetch_note: {fetch_note}')
+			if not_modified:
+				print('  revalidated: 304 (using cached head)')
 
 		is_html = bool(status_code == 200 and is_html_content_type(content_type))
 		snippet = str(html_text or '')[:2048]
 		markers = detect_block_markers(snippet) if is_html else []
 		body_too_small = False
 		try:
-			body_too_small = is_html and (int(body_bytes or 0) > 0) and (int(body_bytes or 0) < 5120)
+			body_too_small = is_html and (int(body_bytes or 0) > 0) and (int(body_bytes or 0) < BODY_TOO_SMALL_BYTES)
 		except Exception:
 			body_too_small = False
 
-		blocked = bool(is_html and (body_too_small or markers))
+		blocked = policy_skip or bool(is_html and (body_too_small or markers))
 		blocked_reason = ''
-		if blocked:
+		if policy_skip:
+			blocked_reason = DOMAIN_POLICY_NOTE
+		elif blocked:
 			reasons = []
 			for token in markers:
 				reasons.append(str(token))
@@ -2618,66 +3081,83 @@ def enrich_news(
 				reasons.append('body_too_small')
 			blocked_reason = ';'.join([r for r in reasons if r])
 
+		# Real fetches teach the policy; synthetic (policy, breaker) results do not.
+		if not (policy_skip or fetch_note.startswith(DEFERRED_PREFIX)):
+			if blocked or fetch_note == 'blocked':
+				if domain_policy.observe(url, True) and verbose:
+					print(f'  domain_policy: learned always_blocked for {host_key(url)}')
+			elif is_html:
+				domain_policy.observe(url, False)
+
 		base_url = str(final_url or url)
 		best_url_for_cache = ''
-		if is_html:
-			best_url_for_cache = extract_best_url_from_html_head(html_text, base_url)
+		# Parse the fetched page once; the cache key, head cache and metadata all read from it.
+		page_doc = None
+		if cached_fields:
+			best_url_for_cache = python_tools.news_head.resolve_best_url(cached_fields.get('best_url_candidates', []), base_url)
+		elif is_html:
+			stage_start = time.perf_counter()
+			page_doc = python_tools.news_head.parse_head_document(html_text, backend=html_parser)
+			metric['parse'] += time.perf_counter() - stage_start
+			stage_start = time.perf_counter()
+			best_url_for_cache = python_tools.news_head.extract_best_url(page_doc, base_url)
+			metric['extract'] += time.perf_counter() - stage_start
 		if not best_url_for_cache:
 			best_url_for_cache = url
 
-		cache_candidates = []
-		for u in [best_url_for_cache, base_url, url]:
-			u = normalize_url(u)
-			if not u:
-				continue
-			cache_candidates.append(head_cache_path_for_url(u, head_cache_dir))
-			if u.startswith('http://'):
-				cache_candidates.append(head_cache_path_for_url('https://' + u[len('http://'):], head_cache_dir))
-
-		cache_abs_candidates = []
-		seen_paths = set()
-		for p in cache_candidates:
-			if not p:
-				continue
-			abs_p = p if os.path.isabs(p) else os.path.join(repo_root, p)
-			if abs_p in seen_paths:
-				continue
-			seen_paths.add(abs_p)
-			cache_abs_candidates.append((p, abs_p))
-
-		cache_path = cache_abs_candidates[0][0] if cache_abs_candidates else head_cache_path_for_url(url, head_cache_dir)
-		cache_abs = cache_abs_candidates[0][1] if cache_abs_candidates else (cache_path if os.path.isabs(cache_path) else os.path.join(repo_root, cache_path))
-
-		if verbose:
-			print(f'  cache: {cache_path}')
-			if best_url_for_cache and normalize_url(best_url_for_cache) != normalize_url(url):
-				print(f'  cache_key_url: {best_url_for_cache}')
+		# Every URL this page answers to is an alias of one head cache entry.
+		cache_urls = [best_url_for_cache, base_url, url]
+		if verbose and best_url_for_cache and normalize_url(best_url_for_cache) != normalize_url(url):
+			print(f'  cache_key_url: {best_url_for_cache}')
 
 		head_html = ''
-		if is_html and (not blocked):
-			head_html = build_head_cache_html(html_text)
-			# Write/update cache only if the extracted head changes.
-			write_text_file_if_changed(cache_abs, head_html)
+		head_doc = None
+		cache_entry = {}
+		fields = {}
+		if not_modified:
+			head_html = html_text
+			head_doc = page_doc
+			fields = cached_fields
+			# A 304 may omit the validators; keep the stored ones then.
+			fresh_validators = python_tools.news_head_cache.validators_from_headers(response_headers)
+			if not (fresh_validators['etag'] or fresh_validators['last_modified']):
+				fresh_validators = validators
+			cache_entry = head_index.touch(validators, cache_urls, fresh_validators)
+		elif is_html and (not blocked):
+			head_html = python_tools.news_head.build_head_cache_html(page_doc)
+			# Validators let the next run send a conditional request.
+			cache_entry = head_index.put(
+				head_html, cache_urls,
+				python_tools.news_head_cache.validators_from_headers(response_headers),
+			)
+			fields = head_index.read_fields(cache_entry, EXTRACTOR_VERSION)
 
 		# Fall back to head cache for blocked/non-HTML fetches.
-		if not head_html:
-			for _, abs_p in cache_abs_candidates:
-				if os.path.exists(abs_p):
-					head_html = read_text_file(abs_p)
-					cache_abs = abs_p
-					break
+		metric['cache_hit'] = not_modified
+		if not cache_entry:
+			cache_entry = head_index.lookup(cache_urls)
+			fields = head_index.read_fields(cache_entry, EXTRACTOR_VERSION)
+			if cache_entry and not fields:
+				head_html = head_index.read_head(cache_entry)
+				if not head_html:
+					cache_entry = {}
+			metric['cache_hit'] = bool(cache_entry)
+
+		cache_path = os.path.join(head_cache_dir, cache_entry['file']) if cache_entry else ''
+		if verbose and cache_path:
+			print(f'  cache: {cache_path}')
 
 		# If blocked and no cache exists, queue for snapshot and keep as pending only.
-		if blocked and (not os.path.exists(cache_abs)):
+		if blocked and (not cache_entry):
 			source_guess = domain_to_source(urllib.parse.urlparse(final_url or url).netloc) or urllib.parse.urlparse(final_url or url).netloc
 			last_checked = iso_utc_now()
 			pending_by_url[url] = {
 				'url': url,
 				'source': source_guess,
-				'cache_path': cache_path,
 				'last_checked': last_checked,
 				'reason': 'blocked' + (':' + blocked_reason if blocked_reason else ''),
 			}
+			head_index.record_check(url, iso_utc_after(pending_ttl_days), last_checked)
 			snapshot_rows.append({
 				'url': url,
 				'cache_path': cache_path,
@@ -2687,19 +3167,29 @@ def enrich_news(
 
 			if verbose:
 				print('  blocked: true (no cache)')
+			add_url_metrics(metrics, metric, ['pending', 'snapshot'])
 			continue
 
 		# If fetch failed and no cache exists, keep pending and (optionally) review.
-		if (not head_html) and (status_code != 200):
+		if (not cache_entry) and (status_code != 200):
 			source_guess = domain_to_source(urllib.parse.urlparse(final_url or url).netloc) or urllib.parse.urlparse(final_url or url).netloc
 			last_checked = iso_utc_now()
-			pending_by_url[url] = {
+			reason = fetch_note or str(status_code or 0)
+			record = {
 				'url': url,
 				'source': source_guess,
-				'cache_path': cache_path,
 				'last_checked': last_checked,
-				'reason': fetch_note or str(status_code or 0),
+				'reason': reason,
 			}
+			failure = negative_cache_fields(pending_by_url.get(url, {}), reason, max_attempts)
+			record.update(failure)
+			recheck_days = recheck_delay_days(failure, pending_ttl_days)
+			# Do not come back before the publisher asked us to.
+			retry_after = retry_after_seconds(response_headers.get('retry-after', ''))
+			if retry_after and retry_after / 86400.0 > pending_ttl_days:
+				recheck_days = retry_after / 86400.0
+			pending_by_url[url] = record
+			head_index.record_check(url, iso_utc_after(recheck_days), last_checked)
 
 			review_rows.append({
 				'id': '',
@@ -2713,23 +3203,37 @@ def enrich_news(
 
 			if verbose:
 				print('  head: none (no cache)')
+				if record.get('failure_class', None):
+					print(f"  negative_cache: attempt {record.get('attempts')} next_check_after {head_index.check_for(url).get('next_check_after')}" + (' (gave up)' if record.get('gave_up', False) else ''))
+			add_url_metrics(metrics, metric, ['pending', 'review'])
 			continue
 
-		meta = extract_metadata(head_html)
-		source = normalize_text(meta.get('source', '') or '')
+		# Metadata always comes from the head cache view, so fresh and cached runs agree.
+		metric['fields_cached'] = bool(fields)
+		if not fields:
+			if head_doc is None:
+				stage_start = time.perf_counter()
+				head_doc = python_tools.news_head.parse_head_document(head_html, backend=html_parser)
+				metric['parse'] += time.perf_counter() - stage_start
+			stage_start = time.perf_counter()
+			fields = extract_head_fields(head_doc)
+			metric['extract'] += time.perf_counter() - stage_start
+			if cache_entry:
+				head_index.write_fields(cache_entry, EXTRACTOR_VERSION, fields)
+		elif verbose:
+			print('  metadata: cached')
+		source = fields.get('source', '') or ''
 		if not source:
 			source = domain_to_source(urllib.parse.urlparse(final_url or url).netloc) or urllib.parse.urlparse(final_url or url).netloc
 
-		title = normalize_text(meta.get('title', '') or '')
-		author = normalize_text(meta.get('author', '') or '') or None
-		published_time = normalize_text(meta.get('published_time', '') or '')
-		published_date = date_from_time_text(published_time)
+		title = fields.get('title', '') or ''
+		author = fields.get('author', '') or None
+		published_date = fields.get('published_date', '') or ''
 		if not published_date:
 			# URL date fallback only if no metadata date.
 			published_date = date_from_url(final_url or url)
 
-		teaser = normalize_text(meta.get('teaser', '') or '')
-		teaser = teaser_truncate(teaser) if teaser else None
+		teaser = fields.get('teaser', '') or None
 
 		if verbose:
 			print(f'  source: {safe_ascii(source)}')
@@ -2750,6 +3254,7 @@ def enrich_news(
 				'last_checked': last_checked,
 				'reason': reason,
 			}
+			head_index.record_check(url, iso_utc_after(pending_ttl_days), last_checked)
 			review_rows.append({
 				'id': '',
 				'url': url,
@@ -2759,16 +3264,13 @@ def enrich_news(
 				'title_guess': title or '',
 				'notes': reason,
 			})
+			add_url_metrics(metrics, metric, ['pending', 'review'])
 			continue
 
 		fingerprint = make_story_fingerprint(published_date, source, title)
-		story = stories_by_fingerprint.get(fingerprint)
+		story = store.story_for_fingerprint(fingerprint)
 
-		head_best_url = ''
-		try:
-			head_best_url = extract_best_url_from_html_head(head_html, base_url)
-		except Exception:
-			head_best_url = ''
+		head_best_url = python_tools.news_head.resolve_best_url(fields.get('best_url_candidates', []), base_url)
 
 		primary_candidate = ''
 		for cand in [head_best_url, final_url, url]:
@@ -2792,17 +3294,7 @@ def enrich_news(
 				'primary_url': primary_candidate or None,
 				'urls': [],
 			}
-			stories.append(story)
-			stories_by_fingerprint[fingerprint] = story
-
-			urls_list = []
-			for u in [url, final_url, head_best_url, story.get('primary_url', '')]:
-				u = normalize_url(u)
-				if not u:
-					continue
-				if u not in urls_list:
-					urls_list.append(u)
-			story['urls'] = urls_list
+			store.add_story(story)
 		else:
 			if str(story.get('fingerprint', '') or '').strip() == '':
 				story['fingerprint'] = fingerprint
@@ -2827,24 +3319,17 @@ def enrich_news(
 				if new_score > ex_score:
 					story['primary_url'] = primary_candidate
 
-			urls_list = story.get('urls', [])
-			if not isinstance(urls_list, list):
-				urls_list = []
+		store.add_urls(story, [normalize_url(u) for u in [url, final_url, head_best_url, story.get('primary_url', '')]])
 
-			for u in [url, final_url, head_best_url, story.get('primary_url', '')]:
-				u = normalize_url(u)
-				if not u:
-					continue
-				if u not in urls_list:
-					urls_list.append(u)
-			story['urls'] = urls_list
+		head_index.record_check(url, iso_utc_after(resolved_ttl_days))
 
 		# If this URL was pending, clear it now that it's part of a story.
 		if url in pending_by_url:
 			pending_by_url.pop(url, None)
 
 		# Optional review output for non-200 fetches even if cache provides metadata.
-		if status_code != 200:
+		review_story = status_code != 200 and not policy_skip
+		if review_story:
 			review_rows.append({
 				'id': str(story.get('id', '') or ''),
 				'url': url,
@@ -2854,16 +3339,11 @@ def enrich_news(
 				'title_guess': title,
 				'notes': fetch_note or str(status_code or 0),
 			})
+		add_url_metrics(metrics, metric, ['story', 'review'] if review_story else ['story'])
 
-	# Finalize: ensure stories are unique by fingerprint and assign stable ids for new fingerprints.
-	stories_unique = []
-	for fp, s in stories_by_fingerprint.items():
-		if not isinstance(s, dict):
-			continue
-		# Keep fingerprint on every story.
-		if (not str(s.get('fingerprint', '') or '').strip()) and fp:
-			s['fingerprint'] = fp
-		stories_unique.append(s)
+	# Finalize: stories are unique by fingerprint (the store merged duplicates);
+	# assign stable ids for new fingerprints.
+	stories_unique = list(store.by_fingerprint.values())
 
 	# Assign ids only for new stories (do not reshuffle existing ids).
 	new_by_date = {}
@@ -2887,13 +3367,11 @@ def enrich_news(
 			),
 		)
 		for s in new_stories:
-			s['id'] = allocate_story_id(published_date, used_ids)
-
-	stories = stories_unique
+			store.assign_id(s)
 
 	# Canonicalize output ordering.
 	stories_out = []
-	for s in sorted([x for x in stories if isinstance(x, dict)], key=lambda x: (str(x.get('published_date', '') or ''), str(x.get('title', '') or ''))):
+	for s in sorted(stories_unique, key=lambda x: (str(x.get('published_date', '') or ''), str(x.get('title', '') or ''))):
 		# Ensure urls list is stable and unique.
 		urls_list = s.get('urls', [])
 		if isinstance(urls_list, list):
@@ -2920,8 +3398,22 @@ def enrich_news(
 		'pending': pending_out,
 	}
 
-	yaml_text = yaml_dump(store_out)
-	wrote_yaml = write_text_file_if_changed(output_yaml, yaml_text)
+	if sharded:
+		written_shards = python_tools.news_store.write_shards(output_yaml, store_out, loaded_digests)
+		wrote_yaml = bool(written_shards)
+	else:
+		written_shards = []
+		wrote_yaml = write_text_file_if_changed(output_yaml, yaml_dump(store_out))
+	gc_report = {}
+	if cache_gc:
+		gc_report = head_index.gc(
+			python_tools.news_head_cache.referenced_urls(store_out),
+			max_bytes=int(cache_max_mb * 1024 * 1024),
+			max_entries=cache_max_entries,
+		)
+	wrote_index = head_index.save()
+	wrote_policy = domain_policy.save()
+	metrics_summary = metrics.close() if metrics is not None else {}
 
 	wrote_review = False
 	wrote_snapshot = False
@@ -2939,6 +3431,21 @@ def enrich_news(
 		print(f'Needs snapshot: {len(snapshot_rows)}')
 		print(f'Needs review: {len(review_rows)}')
 		print(f'Wrote YAML: {wrote_yaml}')
+		if written_shards:
+			print(f"Wrote YAML shards: {', '.join(written_shards)}")
+		print(f'Wrote head cache index: {wrote_index}')
+		print(f'Wrote domain policy state: {wrote_policy}')
+		if gc_report:
+			python_tools.news_head_cache.print_gc_report(gc_report)
+		if breaker is not None:
+			for key, state in sorted(breaker.opened.items()):
+				print(f"Host breaker open: {key} ({state['cause']}), {state['deferred']} URLs deferred")
+		if metrics_summary:
+			fetch_total = metrics_summary['stages']['total']
+			print(
+				f"Metrics: {metrics_jsonl} ({metrics_summary['fetched']} fetched, "
+				f"p50 {fetch_total['p50'] * 1000:.0f} ms, p95 {fetch_total['p95'] * 1000:.0f} ms per URL)"
+			)
 		print(f'Wrote needs_snapshot CSV: {wrote_snapshot}')
 		print(f'Wrote needs_review CSV: {wrote_review}')
 
@@ -2959,6 +3466,22 @@ def main():
 		timeout=args.timeout,
 		max_items=args.max_items,
 		verbose=bool(args.verbose),
+		jobs=args.jobs,
+		refresh=args.refresh,
+		resolved_ttl_days=args.resolved_ttl_days,
+		pending_ttl_days=args.pending_ttl_days,
+		max_attempts=args.max_attempts,
+		html_parser=args.html_parser,
+		cache_gc=bool(args.cache_gc),
+		cache_max_mb=args.cache_max_mb,
+		cache_max_entries=args.cache_max_entries,
+		transport=args.transport,
+		cassette_dir=args.cassette_dir,
+		metrics_jsonl=args.metrics_jsonl,
+		breaker_threshold=args.breaker_threshold,
+		domain_policy_path=args.domain_policy_path,
+		ignore_domain_policy=bool(args.ignore_domain_policy),
+		domain_policy_state_path=args.domain_policy_state_path,
 	)
 
 
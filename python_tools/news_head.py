@@ -0,0 +1,846 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import html
+import html.parser
+import json
+import re
+import urllib.parse
+
+# PIP3 modules (optional C parser backends; the stdlib parser is always available)
+try:
+	import lxml.etree
+	HAVE_LXML = True
+except ImportError:
+	HAVE_LXML = False
+try:
+	import selectolax.lexbor
+	HAVE_SELECTOLAX = True
+except ImportError:
+	HAVE_SELECTOLAX = False
+
+# HTML parser backends for parse_head_document ('auto' = fastest installed).
+PARSER_BACKENDS = ('auto', 'stdlib', 'lxml', 'selectolax')
+
+# Byline fallback only looks at the top of the document.
+BYLINE_SCAN_CHARS = 8000
+
+# Bounded parse: the tokenizer is fed in chunks and stops once the head has
+# closed; after that only JSON-LD script elements are picked out of the body.
+# HEAD_PARSE_MAX_CHARS is a safety cap on how much of a document is looked at.
+HEAD_PARSE_CHUNK_CHARS = 16384
+HEAD_PARSE_MAX_CHARS = 4 * 1024 * 1024
+HEAD_END_RE = re.compile(r'</head\s*>|<body\b', flags=re.IGNORECASE)
+JSONLD_SCRIPT_RE = re.compile(
+	r'<script\b[^>]*application/ld\+json[^>]*>.*?</script\s*>',
+	flags=re.IGNORECASE | re.DOTALL,
+)
+# Incremental scans of streamed text (HeadEndScanner, JsonLdScanner). A
+# token split across two pieces is caught by carrying the last
+# HEAD_SCAN_CARRY characters (longest token less one) into the next feed.
+HEAD_SCAN_RE = re.compile(r'(<script)|(</script)|</head', flags=re.IGNORECASE)
+HEAD_SCAN_BYTES_RE = re.compile(rb'(<script)|(</script)|</head', flags=re.IGNORECASE)
+HEAD_SCAN_CARRY = len('</script') - 1
+SCRIPT_START_RE = re.compile(r'<script\b', flags=re.IGNORECASE)
+JSONLD_TYPE_RE = re.compile(r'application/ld\+json', flags=re.IGNORECASE)
+
+
+#============================================
+def normalize_text(text: str) -> str:
+	"""
+	Normalize extracted text: unescape entities, collapse whitespace, strip.
+
+	Args:
+		text (str): Input text.
+
+	Returns:
+		str: Normalized text.
+	"""
+	text = str(text or '')
+	text = html.unescape(text)
+	text = text.replace('\r', ' ').replace('\n', ' ').replace('\t', ' ')
+	text = re.sub(r'\s+', ' ', text)
+	text = text.strip()
+	return text
+
+
+#============================================
+def strip_tags(text: str) -> str:
+	"""
+	Remove HTML tags (best-effort).
+
+	Args:
+		text (str): HTML snippet.
+
+	Returns:
+		str: Plain-ish text.
+	"""
+	text = str(text or '')
+	text = re.sub(r'<script.*?</script>', ' ', text, flags=re.IGNORECASE | re.DOTALL)
+	text = re.sub(r'<style.*?</style>', ' ', text, flags=re.IGNORECASE | re.DOTALL)
+	text = re.sub(r'<[^>]+>', ' ', text)
+	text = normalize_text(text)
+	return text
+
+
+#============================================
+def extract_byline_fallback(html_text: str) -> str:
+	"""
+	Very simple byline fallback: find "By <Name>" near top of doc.
+
+	Args:
+		html_text (str): HTML text.
+
+	Returns:
+		str: Author name or ''.
+	"""
+	snippet = str(html_text or '')[:BYLINE_SCAN_CHARS]
+	plain = strip_tags(snippet)
+
+	match = re.search(
+		r'\bBy\s+([A-Z][A-Za-z\.\'\-]+(?:\s+[A-Z][A-Za-z\.\'\-]+){0,4})\b',
+		plain,
+		flags=re.IGNORECASE,
+	)
+	if not match:
+		return ''
+
+	name = normalize_text(match.group(1))
+	if not name:
+		return ''
+	if len(name) > 60:
+		return ''
+	return name
+
+
+#============================================
+class HeadDocument:
+	"""
+	Head metadata collected from one parse of an HTML document.
+
+	Attributes:
+		title (str): Normalized <title> text.
+		meta_tags (list): Attribute dicts of every head <meta>, in document order.
+		link_tags (list): Attribute dicts of every head <link>, in document order.
+		jsonld_raw (list): Raw text of each non-empty JSON-LD script.
+		jsonld (list): Parsed JSON-LD values (invalid JSON is skipped).
+		meta_name (dict): meta name -> normalized content (last one wins).
+		meta_property (dict): meta property -> normalized content (last one wins).
+		canonical_url (str): Last <link rel="canonical"> href.
+	"""
+
+	def __init__(self, html_text: str = ''):
+		self.title = ''
+		self.meta_tags = []
+		self.link_tags = []
+		self.jsonld_raw = []
+		self.jsonld = []
+		self.meta_name = {}
+		self.meta_property = {}
+		self.canonical_url = ''
+		# Kept for the lazy byline fallback; only the top of the document is scanned.
+		self._byline_text = str(html_text or '')[:BYLINE_SCAN_CHARS]
+		self._byline = None
+
+	def get_byline(self) -> str:
+		"""
+		Get the "By <Name>" byline candidate (computed on first use).
+		"""
+		if self._byline is None:
+			self._byline = extract_byline_fallback(self._byline_text)
+		return self._byline
+
+
+#============================================
+class _HeadCollector:
+	"""
+	Backend-neutral collector for title/meta/link and JSON-LD scripts.
+
+	Parser backends drive it with start/end/data events and call close() once.
+	Title/meta/link are only taken from the head (until </head> or <body>);
+	JSON-LD is taken from anywhere, since many sites emit it in the body.
+	With track_head=False the caller has already cut the input at the end of
+	the head, and implied <body> events from HTML5-style parsers are ignored.
+	"""
+
+	def __init__(self, doc: HeadDocument, track_head: bool = True):
+		self.doc = doc
+		self.track_head = track_head
+		self.head_closed = False
+		self.in_jsonld = False
+		self._in_title = False
+		self._title_parts = []
+		self._title_buffer = []
+		self._jsonld_parts = []
+
+	def _flush_title(self):
+		# Text between two tags is one title part, however many data events it spanned.
+		text = normalize_text(''.join(self._title_buffer))
+		self._title_buffer = []
+		if text:
+			self._title_parts.append(text)
+
+	def start(self, tag, attrs):
+		"""
+		Handle a start tag; attrs is a mapping or a list of (name, value) pairs.
+		"""
+		if self._in_title:
+			self._flush_title()
+		tag = str(tag or '').lower()
+		pairs = attrs.items() if hasattr(attrs, 'items') else (attrs or [])
+		attrs_dict = {}
+		for k, v in pairs:
+			if not k:
+				continue
+			attrs_dict[str(k).lower()] = str(v or '')
+
+		if tag == 'body':
+			if self.track_head:
+				self.head_closed = True
+				self._in_title = False
+			return
+
+		if tag == 'script':
+			type_attr = normalize_text(attrs_dict.get('type', '') or '').lower()
+			if type_attr == 'application/ld+json':
+				self.in_jsonld = True
+				self._jsonld_parts = []
+			return
+
+		if self.head_closed:
+			return
+
+		if tag == 'title':
+			self._in_title = True
+			return
+
+		if tag == 'meta':
+			self.doc.meta_tags.append(attrs_dict)
+			content = normalize_text(attrs_dict.get('content', '') or '')
+			if not content:
+				return
+			name = normalize_text(attrs_dict.get('name', '') or '').lower()
+			prop = normalize_text(attrs_dict.get('property', '') or '').lower()
+			if name:
+				self.doc.meta_name[name] = content
+			if prop:
+				self.doc.meta_property[prop] = content
+			return
+
+		if tag == 'link':
+			self.doc.link_tags.append(attrs_dict)
+			rel = normalize_text(attrs_dict.get('rel', '') or '').lower()
+			href = normalize_text(attrs_dict.get('href', '') or '')
+			if rel == 'canonical' and href:
+				self.doc.canonical_url = href
+
+	def end(self, tag):
+		"""
+		Handle an end tag.
+		"""
+		if self._in_title:
+			self._flush_title()
+		tag = str(tag or '').lower()
+		if tag == 'head':
+			if self.track_head:
+				self.head_closed = True
+				self._in_title = False
+			return
+
+		if tag == 'title':
+			self._in_title = False
+			return
+
+		if tag == 'script' and self.in_jsonld:
+			raw = ''.join(self._jsonld_parts).strip()
+			self.in_jsonld = False
+			self._jsonld_parts = []
+			if not raw:
+				return
+			self.doc.jsonld_raw.append(raw)
+			try:
+				self.doc.jsonld.append(json.loads(raw))
+			except Exception:
+				pass
+
+	def data(self, data):
+		"""
+		Handle character data.
+		"""
+		if self._in_title:
+			self._title_buffer.append(str(data or ''))
+			return
+
+		if self.in_jsonld:
+			self._jsonld_parts.append(str(data or ''))
+
+	def close(self) -> HeadDocument:
+		"""
+		Finish collection and return the document.
+		"""
+		self._flush_title()
+		self.doc.title = normalize_text(' '.join(self._title_parts))
+		return self.doc
+
+
+#============================================
+class _StdlibHeadParser(html.parser.HTMLParser):
+	"""
+	html.parser front end for _HeadCollector.
+	"""
+
+	def __init__(self, collector: _HeadCollector):
+		super().__init__()
+		self.collector = collector
+
+	def handle_starttag(self, tag, attrs):
+		self.collector.start(tag, attrs)
+
+	def handle_endtag(self, tag):
+		self.collector.end(tag)
+
+	def handle_data(self, data):
+		self.collector.data(data)
+
+
+#============================================
+class _LxmlHeadTarget:
+	"""
+	lxml parser target that forwards events to a _HeadCollector.
+	"""
+
+	def __init__(self, collector: _HeadCollector):
+		self.collector = collector
+
+	def start(self, tag, attrib):
+		self.collector.start(tag, attrib)
+
+	def end(self, tag):
+		self.collector.end(tag)
+
+	def data(self, data):
+		self.collector.data(data)
+
+	def close(self):
+		# The collector is closed by parse_head_document after the body JSON-LD pass.
+		return None
+
+
+#============================================
+def available_backends() -> list:
+	"""
+	List the HTML parser backends usable in this environment, fastest first.
+
+	Returns:
+		list: Backend names; 'stdlib' is always last and always present.
+	"""
+	out = []
+	if HAVE_SELECTOLAX:
+		out.append('selectolax')
+	if HAVE_LXML:
+		out.append('lxml')
+	out.append('stdlib')
+	return out
+
+
+#============================================
+def resolve_backend(backend: str = 'auto') -> str:
+	"""
+	Resolve a backend name, picking the fastest available one for 'auto'.
+
+	Args:
+		backend (str): One of PARSER_BACKENDS.
+
+	Returns:
+		str: Concrete backend name.
+	"""
+	backend = str(backend or 'auto').strip().lower()
+	available = available_backends()
+	if backend == 'auto':
+		return available[0]
+	if backend not in PARSER_BACKENDS:
+		raise ValueError(f'Unknown HTML parser backend: {backend}')
+	if backend not in available:
+		raise ValueError(f'HTML parser backend not installed: {backend}')
+	return backend
+
+
+#============================================
+def find_head_end(data) -> int:
+	"""
+	Find the closing head tag in a raw HTML prefix (bytes or text).
+
+	Used to stop reading a stream (a fetch, a compressed snapshot) once the
+	head is complete. A "</head>" that sits inside an unterminated <script>
+	(for example inside JSON-LD text) does not count.
+
+	Args:
+		data (bytes | str): HTML prefix.
+
+	Returns:
+		int: Offset of the closing head tag, or -1 if the head is still open.
+	"""
+	return HeadEndScanner().feed(data)
+
+
+#============================================
+class HeadEndScanner:
+	"""
+	Find the closing head tag (see find_head_end) in HTML fed in pieces.
+
+	Only a short tail of each piece is kept between feeds, so a stream is
+	scanned in one pass however many pieces it arrives in.
+	"""
+
+	def __init__(self):
+		self.head_end = -1
+		self._in_script = False
+		self._tail = None
+		self._offset = 0
+
+	def feed(self, data) -> int:
+		"""
+		Scan the next piece of the document (bytes or text, not mixed).
+
+		Returns:
+			int: Offset of the closing head tag from the start of the stream,
+				or -1 while the head is still open.
+		"""
+		if self.head_end >= 0:
+			return self.head_end
+		text = data if self._tail is None else self._tail + data
+		pattern = HEAD_SCAN_RE if isinstance(text, str) else HEAD_SCAN_BYTES_RE
+		pos = 0
+		for match in pattern.finditer(text):
+			if match.group(1):
+				self._in_script = True
+			elif match.group(2):
+				self._in_script = False
+			elif not self._in_script:
+				self.head_end = self._offset + match.start()
+				return self.head_end
+			pos = match.end()
+		keep = max(pos, len(text) - HEAD_SCAN_CARRY)
+		self._offset += keep
+		self._tail = text[keep:]
+		return -1
+
+
+#============================================
+class JsonLdScanner:
+	"""
+	Pick JSON-LD script elements (JSONLD_SCRIPT_RE) out of text fed in pieces.
+
+	Text that cannot start a match is dropped as it is scanned, so only an
+	unfinished script is held between feeds.
+	"""
+
+	def __init__(self, offset: int = 0):
+		"""
+		Args:
+			offset (int): Document offset of the first character fed.
+		"""
+		# (start, end, script text) per match, with document offsets.
+		self.scripts = []
+		self._pending = ''
+		self._offset = offset
+		self._in_script = False
+
+	def feed(self, text: str) -> None:
+		"""
+		Scan the next piece of the document.
+		"""
+		scanned = len(self._pending)
+		self._pending += str(text or '')
+		# Inside an opened script nothing can match before a closing tag arrives.
+		window = self._pending[max(0, scanned - HEAD_SCAN_CARRY):]
+		if self._in_script and '</script' not in window.lower():
+			return
+		self._scan()
+
+	def close(self) -> list:
+		"""
+		Finish scanning.
+
+		Returns:
+			list: (start, end, script text) tuples in document order.
+		"""
+		self._scan()
+		return self.scripts
+
+	def _scan(self) -> None:
+		"""
+		Collect complete matches, then drop text no later match can start in.
+		"""
+		pending = self._pending
+		pos = 0
+		for match in JSONLD_SCRIPT_RE.finditer(pending):
+			self.scripts.append((self._offset + match.start(), self._offset + match.end(), match.group(0)))
+			pos = match.end()
+		keep = max(pos, len(pending) - HEAD_SCAN_CARRY)
+		self._in_script = False
+		for match in SCRIPT_START_RE.finditer(pending, pos):
+			tag_end = pending.find('>', match.start())
+			if tag_end < 0:
+				keep = match.start()
+				break
+			if JSONLD_TYPE_RE.search(pending, match.start(), tag_end):
+				keep = match.start()
+				self._in_script = True
+				break
+		self._offset += keep
+		self._pending = pending[keep:]
+
+
+#============================================
+def _head_cut(html_text: str, limit: int) -> int:
+	"""
+	Find where the head ends (textually), for backends that parse a whole string.
+	"""
+	match = HEAD_END_RE.search(html_text, 0, limit)
+	if match is None:
+		return limit
+	if match.group(0).startswith('</'):
+		return match.end()
+	return match.start()
+
+
+#============================================
+def _feed_body_jsonld(collector: _HeadCollector, html_text: str, start: int, limit: int):
+	"""
+	Feed only the JSON-LD script elements found in html_text[start:limit].
+	"""
+	parser = _StdlibHeadParser(collector)
+	for match in JSONLD_SCRIPT_RE.finditer(html_text, start, limit):
+		parser.feed(match.group(0))
+	parser.close()
+
+
+#============================================
+def _parse_stdlib(collector: _HeadCollector, html_text: str, limit: int):
+	"""
+	Feed html.parser in chunks and stop once the head has closed.
+	"""
+	parser = _StdlibHeadParser(collector)
+	pos = 0
+	while pos < limit:
+		end = min(pos + HEAD_PARSE_CHUNK_CHARS, limit)
+		parser.feed(html_text[pos:end])
+		pos = end
+		if collector.head_closed and (not collector.in_jsonld):
+			break
+
+	if pos >= limit:
+		parser.close()
+		return
+
+	# Rewind over any tag the tokenizer was still buffering; that parser is dropped.
+	pos -= len(getattr(parser, 'rawdata', '') or '')
+	_feed_body_jsonld(collector, html_text, pos, limit)
+
+
+#============================================
+def _parse_lxml(collector: _HeadCollector, html_text: str, limit: int):
+	"""
+	Parse the head with lxml (libxml2) through a parser target.
+	"""
+	cut = _head_cut(html_text, limit)
+	head_text = html_text[:cut]
+	if head_text.strip():
+		parser = lxml.etree.HTMLParser(target=_LxmlHeadTarget(collector), recover=True, no_network=True)
+		parser.feed(head_text)
+		try:
+			parser.close()
+		except lxml.etree.LxmlError:
+			pass
+	_feed_body_jsonld(collector, html_text, cut, limit)
+
+
+#============================================
+def _parse_selectolax(collector: _HeadCollector, html_text: str, limit: int):
+	"""
+	Parse the head with selectolax (lexbor) and replay its elements in document order.
+	"""
+	cut = _head_cut(html_text, limit)
+	tree = selectolax.lexbor.LexborHTMLParser(html_text[:cut])
+	root = tree.root
+	if root is not None:
+		for node in root.traverse():
+			tag = node.tag
+			if tag in ('title', 'script'):
+				collector.start(tag, node.attributes)
+				collector.data(node.text(deep=True))
+				collector.end(tag)
+			elif tag in ('meta', 'link'):
+				collector.start(tag, node.attributes)
+	_feed_body_jsonld(collector, html_text, cut, limit)
+
+
+#============================================
+def parse_head_document(html_text: str, max_chars: int = HEAD_PARSE_MAX_CHARS, backend: str = 'auto') -> HeadDocument:
+	"""
+	Parse an HTML document once into a HeadDocument.
+
+	Only the head is tokenized: the stdlib backend feeds html.parser in chunks
+	and stops once the head has closed, and the C backends (lxml, selectolax)
+	parse the text up to </head> or <body>. The rest of the document is only
+	searched for JSON-LD script elements, which are fed on their own, so parse
+	time tracks the head size rather than the page size.
+
+	Args:
+		html_text (str): HTML text (full page or head cache).
+		max_chars (int): Safety cap on characters examined (None or 0 for no cap).
+		backend (str): HTML parser backend (see PARSER_BACKENDS); 'auto' picks
+			the fastest installed one and falls back to stdlib.
+
+	Returns:
+		HeadDocument: Parsed head metadata.
+	"""
+	backend = resolve_backend(backend)
+	html_text = str(html_text or '')
+	doc = HeadDocument(html_text)
+
+	limit = len(html_text)
+	if max_chars and max_chars > 0:
+		limit = min(limit, int(max_chars))
+
+	if backend == 'lxml':
+		collector = _HeadCollector(doc, track_head=False)
+		_parse_lxml(collector, html_text, limit)
+	elif backend == 'selectolax':
+		collector = _HeadCollector(doc, track_head=False)
+		_parse_selectolax(collector, html_text, limit)
+	else:
+		collector = _HeadCollector(doc)
+		_parse_stdlib(collector, html_text, limit)
+
+	return collector.close()
+
+
+#============================================
+def jsonld_candidates(jsonld_value) -> list:
+	"""
+	Get the dict objects from a parsed JSON-LD value (dict or list of dicts).
+	"""
+	if isinstance(jsonld_value, dict):
+		return [jsonld_value]
+	if isinstance(jsonld_value, list):
+		return [x for x in jsonld_value if isinstance(x, dict)]
+	return []
+
+
+#============================================
+def jsonld_page_url(doc: HeadDocument) -> str:
+	"""
+	Get the first JSON-LD mainEntityOfPage.@id or url.
+
+	Args:
+		doc (HeadDocument): Parsed document.
+
+	Returns:
+		str: URL text or ''.
+	"""
+	for jsonld_value in doc.jsonld:
+		jsonld_url = ''
+		for obj in jsonld_candidates(jsonld_value):
+			me = obj.get('mainEntityOfPage')
+			if isinstance(me, dict) and isinstance(me.get('@id'), str):
+				jsonld_url = normalize_text(me.get('@id') or '')
+				break
+			if isinstance(obj.get('url'), str):
+				jsonld_url = normalize_text(obj.get('url') or '')
+				break
+		if jsonld_url:
+			return jsonld_url
+	return ''
+
+
+#============================================
+def best_url_candidates(doc: HeadDocument) -> list:
+	"""
+	Collect the raw "best URL" candidates of a parsed head, in priority order.
+
+	Priority:
+	1) <link rel="canonical">
+	2) meta property="og:url"
+	3) meta name="twitter:url"
+	4) JSON-LD mainEntityOfPage.@id or url
+
+	The values are unresolved, so they can be cached and later resolved
+	against whichever base URL the page was fetched from.
+
+	Args:
+		doc (HeadDocument): Parsed document.
+
+	Returns:
+		list: Four candidate strings (blank when missing).
+	"""
+	return [
+		normalize_text(doc.canonical_url),
+		normalize_text(doc.meta_property.get('og:url', '')),
+		normalize_text(doc.meta_name.get('twitter:url', '')),
+		normalize_text(jsonld_page_url(doc)),
+	]
+
+
+#============================================
+def resolve_best_url(candidates: list, base_url: str = '') -> str:
+	"""
+	Pick the first candidate that resolves to an absolute http(s) URL.
+
+	Args:
+		candidates (list): Output of best_url_candidates.
+		base_url (str): Base URL for resolving relative links ('' keeps them as-is).
+
+	Returns:
+		str: Absolute http(s) URL or ''.
+	"""
+	base_url = normalize_text(base_url)
+	for u in candidates:
+		u = normalize_text(u)
+		if not u:
+			continue
+		u = urllib.parse.urljoin(base_url, u)
+		if u.startswith('//'):
+			u = 'https:' + u
+		if u.startswith('http'):
+			return u
+
+	return ''
+
+
+#============================================
+def extract_best_url(doc: HeadDocument, base_url: str = '') -> str:
+	"""
+	Extract a "best URL" from a parsed document head.
+
+	Args:
+		doc (HeadDocument): Parsed document.
+		base_url (str): Base URL for resolving relative links ('' keeps them as-is).
+
+	Returns:
+		str: Absolute http(s) URL or ''.
+	"""
+	return resolve_best_url(best_url_candidates(doc), base_url)
+
+
+#============================================
+def _json_sanitize_no_images(value):
+	"""
+	Remove image-like fields from JSON-LD objects (recursive).
+
+	Args:
+		value: JSON-compatible value.
+
+	Returns:
+		Sanitized value.
+	"""
+	if isinstance(value, list):
+		return [_json_sanitize_no_images(v) for v in value]
+
+	if isinstance(value, dict):
+		drop = set(['image', 'thumbnail', 'thumbnailurl', 'thumbnailUrl', 'logo'])
+		out = {}
+		for k, v in value.items():
+			ks = str(k or '')
+			if ks.lower() in drop:
+				continue
+			out[k] = _json_sanitize_no_images(v)
+		return out
+
+	return value
+
+
+#============================================
+def _is_image_meta(attrs: dict) -> bool:
+	"""
+	Detect meta tags that reference images (to exclude from cache).
+	"""
+	name = normalize_text(attrs.get('name', '') or '').lower()
+	prop = normalize_text(attrs.get('property', '') or '').lower()
+	key = prop or name
+
+	if key.startswith('og:image'):
+		return True
+	if key.startswith('twitter:image'):
+		return True
+	if key in ('image', 'thumbnail', 'thumbnailurl'):
+		return True
+
+	return False
+
+
+#============================================
+def _is_image_link(attrs: dict) -> bool:
+	"""
+	Detect link tags that reference icons/images (to exclude from cache).
+	"""
+	rel = normalize_text(attrs.get('rel', '') or '').lower()
+	as_attr = normalize_text(attrs.get('as', '') or '').lower()
+
+	if as_attr == 'image':
+		return True
+
+	if 'icon' in rel:
+		return True
+	if 'apple-touch-icon' in rel:
+		return True
+	if 'mask-icon' in rel:
+		return True
+
+	return False
+
+
+#============================================
+def build_head_cache_html(doc: HeadDocument) -> str:
+	"""
+	Build a minimal HTML document containing only the head metadata we care about.
+
+	Includes:
+	- <title>
+	- all <meta ...> (excluding image-related)
+	- all <link ...> (excluding icons/images)
+	- all <script type="application/ld+json"> (sanitized to remove image fields)
+
+	Args:
+		doc (HeadDocument): Parsed document.
+
+	Returns:
+		str: Head cache HTML.
+	"""
+	lines = []
+	lines.append('<!doctype html>')
+	lines.append('<html>')
+	lines.append('<head>')
+
+	if doc.title:
+		lines.append('<title>' + html.escape(doc.title) + '</title>')
+
+	def emit_tag(tag: str, attrs: dict):
+		parts = [tag]
+		for k in sorted(attrs.keys()):
+			v = str(attrs.get(k, '') or '')
+			if v == '':
+				continue
+			parts.append(f'{k}=\"{html.escape(v, quote=True)}\"')
+		return '<' + ' '.join(parts) + '>'
+
+	for attrs in doc.meta_tags:
+		if not _is_image_meta(attrs):
+			lines.append(emit_tag('meta', attrs))
+
+	for attrs in doc.link_tags:
+		if not _is_image_link(attrs):
+			lines.append(emit_tag('link', attrs))
+
+	# Invalid JSON-LD never reaches doc.jsonld, so it is omitted from the cache.
+	for obj in doc.jsonld:
+		obj = _json_sanitize_no_images(obj)
+		raw_out = json.dumps(obj, ensure_ascii=False, indent=2)
+		lines.append('<script type=\"application/ld+json\">')
+		lines.append(raw_out)
+		lines.append('</script>')
+
+	lines.append('</head>')
+	lines.append('</html>')
+	return '\n'.join(lines) + '\n'
@@ -0,0 +1,949 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import argparse
+import csv
+import datetime
+import gzip
+import hashlib
+import json
+import os
+
+# local repo modules
+import python_tools.news_head
+import python_tools.news_store
+
+# PIP3 modules (optional zstd storage; html and gzip need only the stdlib)
+try:
+	import zstandard
+	HAVE_ZSTD = True
+except ImportError:
+	HAVE_ZSTD = False
+
+HEAD_CACHE_DIR_DEFAULT = os.path.join('cache', 'news_head')
+
+# One JSON manifest per cache directory. Entries are content-addressed (keyed
+# by a hash of the head HTML); aliases map every URL seen for a page to its
+# entry, so lookups are dict reads instead of filesystem probes.
+INDEX_FILENAME = 'index.json'
+INDEX_SCHEMA_VERSION = 1
+HEAD_SUFFIX = '.head.html'
+LEGACY_VALIDATORS_SUFFIX = '.http.json'
+# Legacy head files were named by the first 12 hex chars of sha1(URL).
+LEGACY_NAME_CHARS = 12
+# Extracted-field sidecar written next to each entry (see read_fields).
+META_SUFFIX = '.meta.json'
+CONTENT_KEY_CHARS = 16
+
+# On-disk head file format, chosen per cache directory (stored in index.json).
+# Readers go by file suffix, so a directory with mixed formats still works.
+CACHE_FORMATS = ('html', 'gzip', 'zstd')
+FORMAT_SUFFIXES = {
+	'html': '.head.html',
+	'gzip': '.head.html.gz',
+	'zstd': '.head.html.zst',
+}
+ZSTD_LEVEL = 19
+
+# Garbage collection (see HeadCacheIndex.gc). Entries fetched within the
+# grace period are never treated as unreferenced, so a snapshot head is not
+# collected before news_enrich has had a chance to use it.
+NEWS_YAML_DEFAULT = os.path.join('data', 'in_the_news.yml')
+NEWS_CSV_DEFAULT = os.path.join('data', 'in_the_news.csv')
+GC_MIN_AGE_DAYS = 7.0
+
+
+#============================================
+def iso_utc_now() -> str:
+	"""
+	Get a UTC timestamp like 2025-12-14T15:59:55Z.
+	"""
+	now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+	return now.isoformat().replace('+00:00', 'Z')
+
+
+#============================================
+def content_hash(head_html: str) -> str:
+	"""
+	Get the full SHA256 hex digest of a head cache document.
+	"""
+	return hashlib.sha256(str(head_html or '').encode('utf-8', errors='ignore')).hexdigest()
+
+
+#============================================
+def url_aliases(urls: list) -> list:
+	"""
+	Expand URLs into the alias keys used by the index.
+
+	Each http:// URL is followed by its https:// twin, matching how the old
+	per-URL cache files were probed.
+
+	Args:
+		urls (list): URL strings in priority order (blanks are skipped).
+
+	Returns:
+		list: Unique aliases in priority order.
+	"""
+	out = []
+	for u in urls:
+		u = python_tools.news_head.normalize_text(u)
+		if not u:
+			continue
+		variants = [u]
+		if u.startswith('http://'):
+			variants.append('https://' + u[len('http://'):])
+		for v in variants:
+			if v not in out:
+				out.append(v)
+	return out
+
+
+#============================================
+def parse_iso_utc(text: str):
+	"""
+	Parse a timestamp written by iso_utc_now() (None if missing/invalid).
+	"""
+	t = str(text or '').strip()
+	if t.endswith('Z'):
+		t = t[:-1] + '+00:00'
+	try:
+		value = datetime.datetime.fromisoformat(t)
+	except ValueError:
+		return None
+	if value.tzinfo is None:
+		value = value.replace(tzinfo=datetime.timezone.utc)
+	return value
+
+
+#============================================
+def referenced_urls(store: dict) -> set:
+	"""
+	Collect every URL the news store still refers to.
+
+	Args:
+		store (dict): News YAML store ({stories: [...], pending: [...]}).
+
+	Returns:
+		set: Story urls/primary_url and pending urls.
+	"""
+	out = set()
+	for story in store.get('stories', []) or []:
+		if not isinstance(story, dict):
+			continue
+		urls = story.get('urls', [])
+		if isinstance(urls, list):
+			out.update(str(u or '') for u in urls)
+		out.add(str(story.get('primary_url', '') or ''))
+	for pending in store.get('pending', []) or []:
+		if isinstance(pending, dict):
+			out.add(str(pending.get('url', '') or ''))
+	out.discard('')
+	return out
+
+
+#============================================
+def known_urls_from_files(news_yaml: str = NEWS_YAML_DEFAULT, input_csv: str = NEWS_CSV_DEFAULT) -> list:
+	"""
+	Collect the URLs the news YAML and input CSV know about.
+
+	Used to recover aliases when migrating a legacy cache directory.
+
+	Args:
+		news_yaml (str): News YAML path (single file or shard directory).
+		input_csv (str): Enrichment input CSV (url column).
+
+	Returns:
+		list: URLs (story, pending, then CSV), possibly with repeats.
+	"""
+	urls = sorted(referenced_urls(python_tools.news_store.read_news_yaml(news_yaml) or {}))
+	if os.path.exists(input_csv):
+		with open(input_csv, 'r', encoding='utf-8', newline='') as f:
+			for row in csv.DictReader(f):
+				urls.append(str(row.get('url', '') or ''))
+	return urls
+
+
+#============================================
+def legacy_head_name(url: str) -> str:
+	"""
+	Get the file name the pre-index cache used for a URL.
+	"""
+	digest = hashlib.sha1(url.encode('utf-8', errors='ignore'), usedforsecurity=False).hexdigest()
+	return digest[:LEGACY_NAME_CHARS] + HEAD_SUFFIX
+
+
+#============================================
+def validators_from_headers(response_headers: dict) -> dict:
+	"""
+	Pick the HTTP validators out of lower-cased response headers.
+
+	Returns:
+		dict: {'etag': str, 'last_modified': str} (values may be empty).
+	"""
+	response_headers = response_headers or {}
+	return {
+		'etag': str(response_headers.get('etag', '') or ''),
+		'last_modified': str(response_headers.get('last-modified', '') or ''),
+	}
+
+
+#============================================
+def check_format(cache_format: str) -> str:
+	"""
+	Validate a head cache format name.
+
+	Raises:
+		ValueError: Unknown format, or zstd without the zstandard package.
+	"""
+	if cache_format not in CACHE_FORMATS:
+		raise ValueError(f'Unknown head cache format: {cache_format}')
+	if cache_format == 'zstd' and not HAVE_ZSTD:
+		raise ValueError('Head cache format zstd needs the zstandard package (pip install zstandard)')
+	return cache_format
+
+
+#============================================
+def encode_head(head_html: str, cache_format: str) -> bytes:
+	"""
+	Encode a head document for storage in the given format.
+	"""
+	data = head_html.encode('utf-8')
+	if cache_format == 'gzip':
+		# mtime=0 keeps the bytes deterministic for identical content.
+		return gzip.compress(data, mtime=0)
+	if cache_format == 'zstd':
+		return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+	return data
+
+
+#============================================
+def decode_head(data: bytes, file_name: str) -> str:
+	"""
+	Decode a stored head file; the format comes from its suffix.
+	"""
+	if file_name.endswith(FORMAT_SUFFIXES['gzip']):
+		data = gzip.decompress(data)
+	elif file_name.endswith(FORMAT_SUFFIXES['zstd']):
+		check_format('zstd')
+		data = zstandard.ZstdDecompressor().decompress(data)
+	return data.decode('utf-8', errors='ignore')
+
+
+#============================================
+def write_bytes_atomic(path: str, content: bytes) -> None:
+	"""
+	Write a file via a temp file and rename, so readers never see half a file.
+	"""
+	parent_dir = os.path.dirname(path)
+	if parent_dir:
+		os.makedirs(parent_dir, exist_ok=True)
+	tmp_path = f'{path}.tmp{os.getpid()}'
+	with open(tmp_path, 'wb') as f:
+		f.write(content)
+	os.replace(tmp_path, path)
+
+
+#============================================
+def write_text_atomic(path: str, content: str) -> None:
+	"""
+	Write a UTF-8 text file atomically (see write_bytes_atomic).
+	"""
+	write_bytes_atomic(path, content.encode('utf-8'))
+
+
+#============================================
+class HeadCacheIndex:
+	"""
+	Index of a head cache directory.
+
+	index.json holds two maps:
+	- entries: content key -> {file, sha256, size, stored_size, url, source,
+	  fetched_at, etag, last_modified}
+	- aliases: URL -> content key
+
+	plus the storage format for new head files ('html', 'gzip' or 'zstd';
+	see set_format), and the freshness bookkeeping news_enrich keeps per
+	input URL:
+	- checks: URL -> {last_checked, next_check_after}
+
+	A directory written before the index existed (<sha1-of-url>.head.html files
+	plus optional .http.json validator sidecars) is migrated on first load;
+	known_urls (default: known_urls_from_files()) are hashed the same way to
+	find the URLs each legacy file was saved for.
+	"""
+
+	def __init__(self, cache_dir: str, known_urls: list = None):
+		self.cache_dir = str(cache_dir or '') or HEAD_CACHE_DIR_DEFAULT
+		self.known_urls = known_urls
+		self.index_path = os.path.join(self.cache_dir, INDEX_FILENAME)
+		self.entries = {}
+		self.aliases = {}
+		self.checks = {}
+		self.format = 'html'
+		self.dirty = False
+		# Lookup times (key -> timestamp) for LRU eviction. Kept in memory and
+		# folded into last_used only when the index is written anyway, so a run
+		# that just reads the cache does not rewrite index.json.
+		self.used = {}
+		# Legacy files superseded by the index; removed on the first save.
+		self.legacy_files = []
+		self._load()
+
+	#============================================
+	def _load(self) -> None:
+		"""
+		Read index.json, or build it from a legacy cache directory.
+		"""
+		if os.path.exists(self.index_path):
+			with open(self.index_path, 'r', encoding='utf-8') as f:
+				data = json.load(f)
+			if not isinstance(data, dict) or data.get('schema') != INDEX_SCHEMA_VERSION:
+				raise ValueError(f'Unsupported head cache index: {self.index_path}')
+			self.entries = dict(data.get('entries', {}) or {})
+			self.aliases = dict(data.get('aliases', {}) or {})
+			self.checks = dict(data.get('checks', {}) or {})
+			self.format = check_format(str(data.get('format', 'html') or 'html'))
+			return
+		if os.path.isdir(self.cache_dir):
+			self._migrate_legacy()
+
+	#============================================
+	def _migrate_legacy(self) -> None:
+		"""
+		Index legacy head files by content and fold in their validator sidecars.
+
+		Legacy file names are hashes of URLs: every known URL (and https twin)
+		whose hash names a file becomes an alias of it, as does each head's own
+		canonical/og:url. Head files keep their names; duplicates and sidecars
+		are deleted by save().
+		"""
+		head_names = sorted(n for n in os.listdir(self.cache_dir) if n.endswith(HEAD_SUFFIX))
+		known_urls = self.known_urls
+		if known_urls is None and head_names:
+			known_urls = known_urls_from_files()
+		aliases_by_file = {}
+		for alias in url_aliases(known_urls or []):
+			aliases_by_file.setdefault(legacy_head_name(alias), []).append(alias)
+
+		key_by_file = {}
+		for name in head_names:
+			path = os.path.join(self.cache_dir, name)
+			with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+				head_html = f.read()
+			key = self._key_for(head_html)
+			if key in self.entries:
+				# Same content under another URL hash: keep one copy.
+				self.legacy_files.append(path)
+			else:
+				self.entries[key] = self._new_entry(name, head_html, 'legacy')
+				self.entries[key]['fetched_at'] = datetime.datetime.fromtimestamp(
+					os.path.getmtime(path), datetime.timezone.utc,
+				).replace(microsecond=0).isoformat().replace('+00:00', 'Z')
+			key_by_file[name] = key
+			for alias in aliases_by_file.get(name, []):
+				self.entries[key]['url'] = self.entries[key]['url'] or alias
+				self.aliases[alias] = key
+			doc = python_tools.news_head.parse_head_document(head_html)
+			best_url = python_tools.news_head.extract_best_url(doc)
+			if best_url:
+				self.entries[key]['url'] = self.entries[key]['url'] or best_url
+				for alias in url_aliases([best_url]):
+					self.aliases.setdefault(alias, key)
+			self.dirty = True
+
+		for name in sorted(os.listdir(self.cache_dir)):
+			if not name.endswith(LEGACY_VALIDATORS_SUFFIX):
+				continue
+			path = os.path.join(self.cache_dir, name)
+			try:
+				with open(path, 'r', encoding='utf-8') as f:
+					record = json.load(f)
+			except ValueError:
+				record = {}
+			key = key_by_file.get(str(record.get('head_file', '') or '')) if isinstance(record, dict) else None
+			if key:
+				for alias in url_aliases([record.get('url', ''), record.get('final_url', '')]):
+					self.aliases[alias] = key
+				self.entries[key]['etag'] = str(record.get('etag', '') or '')
+				self.entries[key]['last_modified'] = str(record.get('last_modified', '') or '')
+			self.legacy_files.append(path)
+			self.dirty = True
+
+	#============================================
+	def _key_for(self, head_html: str) -> str:
+		"""
+		Get the content key for a head document (lengthened on a prefix clash).
+		"""
+		digest = content_hash(head_html)
+		key = digest[:CONTENT_KEY_CHARS]
+		existing = self.entries.get(key)
+		if existing is not None and existing.get('sha256') != digest:
+			key = digest
+		return key
+
+	#============================================
+	def _new_entry(self, file_name: str, head_html: str, source: str) -> dict:
+		"""
+		Build a fresh entry record.
+		"""
+		size = len(head_html.encode('utf-8', errors='ignore'))
+		return {
+			'file': file_name,
+			'sha256': content_hash(head_html),
+			'size': size,
+			'stored_size': size,
+			'url': '',
+			'source': source,
+			'fetched_at': iso_utc_now(),
+			'last_used': iso_utc_now(),
+			'etag': '',
+			'last_modified': '',
+		}
+
+	#============================================
+	def _drop_if_unreferenced(self, key: str) -> None:
+		"""
+		Remove an entry (and its file) once no alias points at it.
+		"""
+		if key not in self.entries or key in self.aliases.values():
+			return
+		entry = self.entries.pop(key)
+		for path in [self.path_for(entry), self.meta_path_for(key)]:
+			if os.path.exists(path):
+				os.remove(path)
+		self.dirty = True
+
+	#============================================
+	def path_for(self, entry: dict) -> str:
+		"""
+		Get the head file path of an entry.
+		"""
+		return os.path.join(self.cache_dir, str(entry.get('file', '') or ''))
+
+	#============================================
+	def meta_path_for(self, key: str) -> str:
+		"""
+		Get the extracted-field sidecar path of an entry key.
+		"""
+		return os.path.join(self.cache_dir, key + META_SUFFIX)
+
+	#============================================
+	def read_fields(self, entry: dict, version: int) -> dict:
+		"""
+		Read the extracted fields cached for an entry.
+
+		The sidecar only counts if it was written for this exact content
+		(sha256) by the same extractor version.
+
+		Args:
+			entry (dict): Entry record with 'key'.
+			version (int): Current extractor version.
+
+		Returns:
+			dict: Cached fields, or {} when missing or stale.
+		"""
+		if not entry:
+			return {}
+		path = self.meta_path_for(entry['key'])
+		if not os.path.exists(path):
+			return {}
+		try:
+			with open(path, 'r', encoding='utf-8') as f:
+				record = json.load(f)
+		except ValueError:
+			return {}
+		if not isinstance(record, dict):
+			return {}
+		if record.get('sha256') != entry.get('sha256') or record.get('extractor_version') != version:
+			return {}
+		fields = record.get('fields', {})
+		return fields if isinstance(fields, dict) else {}
+
+	#============================================
+	def write_fields(self, entry: dict, version: int, fields: dict) -> None:
+		"""
+		Store extracted fields next to an entry (see read_fields).
+		"""
+		record = {
+			'sha256': entry.get('sha256', ''),
+			'extractor_version': version,
+			'fields': fields,
+		}
+		write_text_atomic(self.meta_path_for(entry['key']), json.dumps(record, indent=1, sort_keys=True) + '\n')
+
+	#============================================
+	def lookup(self, urls: list) -> dict:
+		"""
+		Find the cache entry for the first URL (or https twin) that is indexed.
+
+		Args:
+			urls (list): Candidate URLs in priority order.
+
+		Returns:
+			dict: Entry record (with 'key' added) or {}.
+		"""
+		for alias in url_aliases(urls):
+			key = self.aliases.get(alias)
+			entry = self.entries.get(key) if key else None
+			if entry is not None:
+				self.used[key] = iso_utc_now()
+				return dict(entry, key=key)
+		return {}
+
+	#============================================
+	def check_for(self, url: str) -> dict:
+		"""
+		Get the freshness record of an input URL ({} if it was never checked).
+		"""
+		return self.checks.get(url, {})
+
+	#============================================
+	def record_check(self, url: str, next_check_after: str, last_checked: str = '') -> None:
+		"""
+		Record that an input URL was checked, and when it is due again.
+
+		Args:
+			url (str): Normalized input URL.
+			next_check_after (str): UTC timestamp of the next check.
+			last_checked (str): UTC timestamp of this check (default: now).
+		"""
+		self.checks[url] = {
+			'last_checked': last_checked or iso_utc_now(),
+			'next_check_after': next_check_after,
+		}
+		self.dirty = True
+
+	#============================================
+	def read_head(self, entry: dict) -> str:
+		"""
+		Read the head HTML of an entry ('' if the file has gone missing).
+		"""
+		if not entry:
+			return ''
+		path = self.path_for(entry)
+		if not os.path.exists(path):
+			return ''
+		with open(path, 'rb') as f:
+			return decode_head(f.read(), path)
+
+	#============================================
+	def validators_for(self, url: str) -> dict:
+		"""
+		Get stored HTTP validators for a URL, if its cached head is present.
+
+		Returns:
+			dict: Entry record with 'key' added, or {} when there is nothing
+				to revalidate against.
+		"""
+		entry = self.lookup([url])
+		if not entry or not (entry.get('etag') or entry.get('last_modified')):
+			return {}
+		if not os.path.exists(self.path_for(entry)):
+			return {}
+		return entry
+
+	#============================================
+	def put(self, head_html: str, urls: list, validators: dict = None, source: str = 'fetch') -> dict:
+		"""
+		Store a head document and point every alias URL at it.
+
+		Identical content is stored once; an entry whose last alias moves to
+		new content is deleted.
+
+		Args:
+			head_html (str): Head cache document.
+			urls (list): URLs that resolve to this content.
+			validators (dict): {'etag', 'last_modified'}; None keeps the stored ones.
+			source (str): 'fetch' or 'snapshot'.
+
+		Returns:
+			dict: Entry record with 'key' added.
+		"""
+		key = self._key_for(head_html)
+		entry = self.entries.get(key)
+		if entry is None:
+			entry = self._new_entry(key + FORMAT_SUFFIXES[self.format], head_html, source)
+			self.entries[key] = entry
+		if not os.path.exists(self.path_for(entry)):
+			# A missing file is rewritten in the current format, under that
+			# format's name (decode_head goes by suffix).
+			entry['file'] = key + FORMAT_SUFFIXES[self.format]
+			path = self.path_for(entry)
+			data = encode_head(head_html, self.format)
+			write_bytes_atomic(path, data)
+			entry['stored_size'] = len(data)
+			for suffix in FORMAT_SUFFIXES.values():
+				stale_path = os.path.join(self.cache_dir, key + suffix)
+				if stale_path != path and os.path.exists(stale_path):
+					os.remove(stale_path)
+		entry['source'] = source
+		return self.touch(dict(entry, key=key), urls, validators)
+
+	#============================================
+	def touch(self, entry: dict, urls: list, validators: dict = None) -> dict:
+		"""
+		Mark an entry as fetched now and point alias URLs at it.
+
+		Used directly for a 304 response, where the content is unchanged and
+		the head file does not need to be read.
+
+		Args:
+			entry (dict): Entry record with 'key' (from lookup/put).
+			urls (list): URLs that resolve to this content.
+			validators (dict): {'etag', 'last_modified'}; None keeps the stored ones.
+
+		Returns:
+			dict: Entry record with 'key' added.
+		"""
+		key = entry['key']
+		entry = self.entries[key]
+		aliases = url_aliases(urls)
+		if aliases and not entry.get('url'):
+			entry['url'] = aliases[0]
+		entry['fetched_at'] = iso_utc_now()
+		entry['last_used'] = entry['fetched_at']
+		if validators is not None:
+			entry['etag'] = str(validators.get('etag', '') or '')
+			entry['last_modified'] = str(validators.get('last_modified', '') or '')
+		self.dirty = True
+
+		for alias in aliases:
+			old_key = self.aliases.get(alias)
+			self.aliases[alias] = key
+			if old_key and old_key != key:
+				self._drop_if_unreferenced(old_key)
+		return dict(entry, key=key)
+
+	#============================================
+	def set_format(self, cache_format: str) -> int:
+		"""
+		Switch the directory's storage format and convert every head file.
+
+		Args:
+			cache_format (str): One of CACHE_FORMATS.
+
+		Returns:
+			int: Number of head files rewritten.
+		"""
+		self.format = check_format(cache_format)
+		self.dirty = True
+		suffix = FORMAT_SUFFIXES[cache_format]
+		converted = 0
+		for key, entry in self.entries.items():
+			old_path = self.path_for(entry)
+			if entry.get('file', '').endswith(suffix) or not os.path.exists(old_path):
+				continue
+			head_html = self.read_head(entry)
+			data = encode_head(head_html, cache_format)
+			new_file = key + suffix
+			write_bytes_atomic(os.path.join(self.cache_dir, new_file), data)
+			os.remove(old_path)
+			entry['file'] = new_file
+			entry['stored_size'] = len(data)
+			converted += 1
+		# Make sure the index never points at a removed file.
+		self.save()
+		return converted
+
+	#============================================
+	def _remove_entry(self, key: str) -> int:
+		"""
+		Delete an entry, its aliases and its files.
+
+		Returns:
+			int: Bytes freed on disk.
+		"""
+		entry = self.entries.pop(key)
+		self.used.pop(key, None)
+		for alias in [a for a, k in self.aliases.items() if k == key]:
+			del self.aliases[alias]
+		freed = 0
+		for path in [self.path_for(entry), self.meta_path_for(key)]:
+			if os.path.exists(path):
+				freed += os.path.getsize(path)
+				os.remove(path)
+		self.dirty = True
+		return freed
+
+	#============================================
+	def gc(
+		self,
+		keep_urls: set,
+		max_bytes: int = 0,
+		max_entries: int = 0,
+		min_age_days: float = GC_MIN_AGE_DAYS,
+		dry_run: bool = False,
+	) -> dict:
+		"""
+		Drop unreferenced entries, then evict least-recently-used ones to fit a cap.
+
+		1. Aliases outside keep_urls (and their https twins) are removed, unless
+		   their entry was fetched within min_age_days.
+		2. Entries left without aliases are deleted.
+		3. While the cache exceeds max_bytes (on disk) or max_entries, the
+		   entry with the oldest last_used time is deleted.
+		4. Head/sidecar files no entry refers to are deleted.
+		5. Freshness records of URLs outside keep_urls are dropped, unless
+		   they were checked within min_age_days.
+
+		Args:
+			keep_urls (set): URLs still in use (see referenced_urls).
+			max_bytes (int): Size cap in stored bytes (0 = none).
+			max_entries (int): Entry cap (0 = none).
+			min_age_days (float): Grace period for recently fetched entries.
+			dry_run (bool): Report only; change nothing.
+
+		Returns:
+			dict: Counts and bytes_reclaimed.
+		"""
+		report = {
+			'aliases_removed': 0,
+			'unreferenced': 0,
+			'evicted': 0,
+			'stray_files': 0,
+			'bytes_reclaimed': 0,
+		}
+		keep = set(url_aliases(sorted(keep_urls)))
+		cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=float(min_age_days))
+
+		def is_recent(timestamp: str) -> bool:
+			value = parse_iso_utc(timestamp)
+			return value is not None and value > cutoff
+
+		def stored_size(entry: dict) -> int:
+			return int(entry.get('stored_size', entry.get('size', 0)) or 0)
+
+		aliases = dict(self.aliases)
+		for alias, key in self.aliases.items():
+			entry = self.entries.get(key)
+			if alias not in keep and not (entry is not None and is_recent(entry.get('fetched_at', ''))):
+				del aliases[alias]
+				report['aliases_removed'] += 1
+		live = set(aliases.values())
+		doomed = [k for k in self.entries if k not in live]
+		report['unreferenced'] = len(doomed)
+
+		# LRU over what survives: oldest last_used first.
+		survivors = sorted([k for k in self.entries if k in live], key=self.last_used)
+		total_bytes = sum(stored_size(self.entries[k]) for k in survivors)
+		while survivors and (
+			(max_bytes and total_bytes > max_bytes) or (max_entries and len(survivors) > max_entries)
+		):
+			key = survivors.pop(0)
+			total_bytes -= stored_size(self.entries[key])
+			doomed.append(key)
+			report['evicted'] += 1
+
+		if dry_run:
+			for key in doomed:
+				for path in [self.path_for(self.entries[key]), self.meta_path_for(key)]:
+					if os.path.exists(path):
+						report['bytes_reclaimed'] += os.path.getsize(path)
+			return report
+
+		if report['aliases_removed']:
+			self.aliases = aliases
+			self.dirty = True
+		stale_checks = [
+			u for u, check in self.checks.items()
+			if u not in keep_urls and not is_recent(check.get('last_checked', ''))
+		]
+		for u in stale_checks:
+			del self.checks[u]
+			self.dirty = True
+		for key in doomed:
+			report['bytes_reclaimed'] += self._remove_entry(key)
+
+		# Files left behind by crashes or older layouts.
+		known = {INDEX_FILENAME}
+		for key, entry in self.entries.items():
+			known.add(str(entry.get('file', '') or ''))
+			known.add(key + META_SUFFIX)
+		if os.path.isdir(self.cache_dir):
+			for name in os.listdir(self.cache_dir):
+				if name in known:
+					continue
+				if not name.endswith(tuple(FORMAT_SUFFIXES.values()) + (META_SUFFIX,)):
+					continue
+				path = os.path.join(self.cache_dir, name)
+				report['bytes_reclaimed'] += os.path.getsize(path)
+				os.remove(path)
+				report['stray_files'] += 1
+		return report
+
+	#============================================
+	def last_used(self, key: str) -> str:
+		"""
+		Get when an entry was last looked up or written (ISO UTC text).
+		"""
+		entry = self.entries.get(key, {})
+		return str(self.used.get(key, '') or entry.get('last_used', '') or entry.get('fetched_at', '') or '')
+
+	#============================================
+	def stats(self) -> dict:
+		"""
+		Summarize the index without touching the head files.
+		"""
+		referenced = set(self.aliases.values())
+		sources = {}
+		for entry in self.entries.values():
+			source = str(entry.get('source', '') or 'unknown')
+			sources[source] = sources.get(source, 0) + 1
+		return {
+			'entries': len(self.entries),
+			'aliases': len(self.aliases),
+			'checks': len(self.checks),
+			'format': self.format,
+			'bytes': sum(int(e.get('size', 0) or 0) for e in self.entries.values()),
+			'stored_bytes': sum(int(e.get('stored_size', e.get('size', 0)) or 0) for e in self.entries.values()),
+			'with_validators': sum(1 for e in self.entries.values() if e.get('etag') or e.get('last_modified')),
+			'unaliased': sum(1 for k in self.entries if k not in referenced),
+			'sources': sources,
+		}
+
+	#============================================
+	def save(self) -> bool:
+		"""
+		Write index.json if anything changed (lookups alone do not count).
+
+		Returns:
+			bool: True if the index was written.
+		"""
+		if not self.dirty:
+			return False
+		for key, used_at in self.used.items():
+			if key in self.entries:
+				self.entries[key]['last_used'] = max(used_at, str(self.entries[key].get('last_used', '') or ''))
+		self.used = {}
+		data = {
+			'schema': INDEX_SCHEMA_VERSION,
+			'format': self.format,
+			'entries': self.entries,
+			'aliases': self.aliases,
+			'checks': self.checks,
+		}
+		write_text_atomic(self.index_path, json.dumps(data, indent=1, sort_keys=True) + '\n')
+		for path in self.legacy_files:
+			if os.path.exists(path):
+				os.remove(path)
+		self.legacy_files = []
+		self.dirty = False
+		return True
+
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(
+		description='Show statistics for (or list, convert, or garbage-collect) the news head cache index',
+	)
+	parser.add_argument(
+		'-c', '--cache-dir', dest='cache_dir', required=False, type=str,
+		default=HEAD_CACHE_DIR_DEFAULT,
+		help='Head cache directory (default: cache/news_head)',
+	)
+	parser.add_argument(
+		'--format', dest='cache_format', required=False, type=str,
+		choices=CACHE_FORMATS, default=None,
+		help='Convert the directory to this head file format; later writes use it too',
+	)
+	parser.add_argument(
+		'-l', '--list', dest='list_entries', required=False,
+		action='store_true',
+		help='List entries (newest first) with their alias URLs',
+	)
+	parser.add_argument(
+		'--gc', dest='gc', required=False,
+		action='store_true',
+		help='Delete entries no story or pending URL in the news YAML references, then apply the caps',
+	)
+	parser.add_argument(
+		'-y', '--yaml', dest='news_yaml', required=False, type=str,
+		default=NEWS_YAML_DEFAULT,
+		help='News YAML that decides which entries are referenced, and whose URLs a legacy cache is migrated with (default: data/in_the_news.yml)',
+	)
+	parser.add_argument(
+		'--max-mb', dest='max_mb', required=False, type=float,
+		default=0.0,
+		help='With --gc: evict least-recently-used entries above this many MB on disk (default: no cap)',
+	)
+	parser.add_argument(
+		'--max-entries', dest='max_entries', required=False, type=int,
+		default=0,
+		help='With --gc: evict least-recently-used entries above this count (default: no cap)',
+	)
+	parser.add_argument(
+		'--min-age-days', dest='min_age_days', required=False, type=float,
+		default=GC_MIN_AGE_DAYS,
+		help='With --gc: keep unreferenced entries fetched within this many days (default: 7)',
+	)
+	parser.add_argument(
+		'-n', '--dry-run', dest='dry_run', required=False,
+		action='store_true',
+		help='With --gc: report what would be deleted without deleting it',
+	)
+	return parser.parse_args()
+
+
+#============================================
+def print_gc_report(report: dict, dry_run: bool = False) -> None:
+	"""
+	Print a one-line garbage collection summary.
+	"""
+	verb = 'Would reclaim' if dry_run else 'Reclaimed'
+	print(
+		f"{verb} {report['bytes_reclaimed'] / 1024:.1f} KiB: "
+		f"{report['unreferenced']} unreferenced, {report['evicted']} evicted, "
+		f"{report['stray_files']} stray files, {report['aliases_removed']} aliases dropped"
+	)
+
+
+#============================================
+def main():
+	args = parse_args()
+	known_urls = None
+	if not os.path.exists(os.path.join(args.cache_dir, INDEX_FILENAME)):
+		known_urls = known_urls_from_files(args.news_yaml)
+	index = HeadCacheIndex(args.cache_dir, known_urls)
+	# Persist a migration from the legacy layout.
+	index.save()
+	if args.cache_format:
+		converted = index.set_format(args.cache_format)
+		print(f'Converted {converted} head files to {args.cache_format}')
+	if args.gc:
+		store = python_tools.news_store.read_news_yaml(args.news_yaml) or {}
+		report = index.gc(
+			referenced_urls(store),
+			max_bytes=int(args.max_mb * 1024 * 1024),
+			max_entries=args.max_entries,
+			min_age_days=args.min_age_days,
+			dry_run=args.dry_run,
+		)
+		index.save()
+		print_gc_report(report, args.dry_run)
+
+	if args.list_entries:
+		urls_by_key = {}
+		for alias, key in sorted(index.aliases.items()):
+			urls_by_key.setdefault(key, []).append(alias)
+		ordered = sorted(index.entries.items(), key=lambda kv: str(kv[1].get('fetched_at', '')), reverse=True)
+		for key, entry in ordered:
+			print(f"{key}  {entry.get('fetched_at', '')}  {int(entry.get('size', 0) or 0):>7}  {entry.get('source', '')}")
+			for alias in urls_by_key.get(key, []):
+				print(f'  {alias}')
+
+	stats = index.stats()
+	print(f"Format: {stats['format']}")
+	print(f"Entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KiB, {stats['stored_bytes'] / 1024:.1f} KiB on disk)")
+	print(f"Aliases: {stats['aliases']}")
+	print(f"Checked URLs: {stats['checks']}")
+	print(f"With validators: {stats['with_validators']}")
+	print(f"Unaliased: {stats['unaliased']}")
+	for source, count in sorted(stats['sources'].items()):
+		print(f'  {source}: {count}')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import json
+import time
+import threading
+import collections
+import urllib.parse
+
+# PIP3 modules
+import requests
+import requests.adapters
+import urllib3
+import urllib3.connection
+
+# Per-URL stage timings (seconds) in each JSONL record, and the stages the run
+# summary reports percentiles for.
+STAGES = ('queue_wait', 'sleep', 'connect', 'ttfb', 'download', 'parse', 'extract', 'total')
+SLOWEST_HOSTS = 10
+
+# Seconds spent opening connections (TCP plus TLS) in the current thread.
+_CONNECT_TIME = threading.local()
+
+
+#============================================
+def reset_connect_time() -> None:
+	"""
+	Zero this thread's connect timer (call before a request).
+	"""
+	_CONNECT_TIME.seconds = 0.0
+
+
+#============================================
+def connect_time() -> float:
+	"""
+	Seconds this thread has spent connecting since reset_connect_time().
+	"""
+	return float(getattr(_CONNECT_TIME, 'seconds', 0.0) or 0.0)
+
+
+#============================================
+def _timed_connect(connect) -> None:
+	"""
+	Run a connection's connect() and add its duration to the thread's timer.
+	"""
+	start = time.perf_counter()
+	try:
+		connect()
+	finally:
+		_CONNECT_TIME.seconds = connect_time() + (time.perf_counter() - start)
+
+
+#============================================
+class TimedHTTPConnection(urllib3.connection.HTTPConnection):
+	"""
+	HTTP connection that records how long connect() takes.
+	"""
+
+	def connect(self) -> None:
+		_timed_connect(super().connect)
+
+
+#============================================
+class TimedHTTPSConnection(urllib3.connection.HTTPSConnection):
+	"""
+	HTTPS connection that records how long connect() (including TLS) takes.
+	"""
+
+	def connect(self) -> None:
+		_timed_connect(super().connect)
+
+
+# Pools that open the timed connections. Built with type() because urllib3's
+# type hints declare ConnectionCls as a protocol its own classes do not match.
+TIMED_POOL_CLASSES = {
+	'http': type('TimedHTTPConnectionPool', (urllib3.HTTPConnectionPool,), {'ConnectionCls': TimedHTTPConnection}),
+	'https': type('TimedHTTPSConnectionPool', (urllib3.HTTPSConnectionPool,), {'ConnectionCls': TimedHTTPSConnection}),
+}
+
+
+#============================================
+class TimedHTTPAdapter(requests.adapters.HTTPAdapter):
+	"""
+	Standard requests adapter whose new connections feed connect_time().
+
+	Reused keep-alive connections cost nothing, so connect time shows how
+	often a host's connections are actually being reused.
+	"""
+
+	def init_poolmanager(self, *args, **kwargs):
+		super().init_poolmanager(*args, **kwargs)
+		self.poolmanager.pool_classes_by_scheme = dict(TIMED_POOL_CLASSES)
+
+
+#============================================
+def percentile(values: list, fraction: float) -> float:
+	"""
+	Nearest-rank percentile of a list (0.0 for an empty list).
+	"""
+	if not values:
+		return 0.0
+	ordered = sorted(values)
+	return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+#============================================
+class FetchMetrics:
+	"""
+	Sink that writes one JSONL record per URL plus a closing run summary.
+
+	Records have type 'url' (see news_enrich.enrich_news for the fields); the
+	last line has type 'summary' with totals, per-stage p50/p95/max and the
+	hosts with the most total fetch time.
+	"""
+
+	def __init__(self, path: str):
+		self.path = path
+		self.started = time.perf_counter()
+		self.urls = 0
+		self.totals = collections.Counter()
+		self.dispositions = collections.Counter()
+		self.statuses = collections.Counter()
+		# Only the numbers percentiles need are kept, not whole records.
+		self.stage_values = {stage: [] for stage in STAGES}
+		self.host_totals = collections.defaultdict(list)
+		self._file = open(path, 'w', encoding='utf-8')
+
+	#============================================
+	def add(self, record: dict) -> None:
+		"""
+		Write one per-URL record (seconds rounded to microseconds).
+		"""
+		record = dict(record, type='url')
+		record['host'] = str(urllib.parse.urlparse(str(record.get('url', '') or '')).netloc)
+		for stage in STAGES:
+			record[stage] = round(float(record.get(stage, 0.0) or 0.0), 6)
+		self._file.write(json.dumps(record, sort_keys=True) + '\n')
+
+		self.urls += 1
+		self.dispositions.update(record.get('disposition', []))
+		if not record.get('fetched'):
+			return
+		self.totals['fetched'] += 1
+		self.totals['cache_hits'] += int(bool(record.get('cache_hit')))
+		self.totals['fields_cached'] += int(bool(record.get('fields_cached')))
+		for name in ('wire_bytes', 'decoded_bytes', 'redirects'):
+			self.totals[name] += int(record.get(name, 0) or 0)
+		self.statuses[str(record.get('fetch_note', '') or record.get('status_code', 0))] += 1
+		for stage in STAGES:
+			self.stage_values[stage].append(record[stage])
+		self.host_totals[record['host']].append(record['total'])
+
+	#============================================
+	def summary(self) -> dict:
+		"""
+		Totals and percentiles over the records written so far.
+		"""
+		stages = {}
+		for stage, values in self.stage_values.items():
+			stages[stage] = {
+				'sum': round(sum(values), 3),
+				'p50': round(percentile(values, 0.50), 6),
+				'p95': round(percentile(values, 0.95), 6),
+				'max': round(max(values) if values else 0.0, 6),
+			}
+		hosts = sorted(self.host_totals.items(), key=lambda item: sum(item[1]), reverse=True)[:SLOWEST_HOSTS]
+
+		summary = {
+			'type': 'summary',
+			'elapsed': round(time.perf_counter() - self.started, 3),
+			'urls': self.urls,
+			'dispositions': dict(sorted(self.dispositions.items())),
+			'statuses': dict(sorted(self.statuses.items())),
+			'stages': stages,
+			'slowest_hosts': [
+				{
+					'host': host,
+					'urls': len(values),
+					'total': round(sum(values), 3),
+					'p95': round(percentile(values, 0.95), 6),
+				}
+				for host, values in hosts
+			],
+		}
+		for name in ('fetched', 'cache_hits', 'fields_cached', 'wire_bytes', 'decoded_bytes', 'redirects'):
+			summary[name] = self.totals[name]
+		return summary
+
+	#============================================
+	def close(self) -> dict:
+		"""
+		Write the summary line and close the file.
+
+		Returns:
+			dict: The summary.
+		"""
+		summary = self.summary()
+		self._file.write(json.dumps(summary, sort_keys=True) + '\n')
+		self._file.close()
+		return summary
@@ -8,8 +8,8 @@ import re
 import datetime
 import argparse
 
-# PIP3 modules
-import yaml
+# local repo modules
+import python_tools.news_store
 
 
 #============================================
@@ -294,7 +294,7 @@ def pick_display_date(item: dict) -> str:
 #============================================
 def read_yaml_file(yaml_path: str) -> dict:
 	"""
-	Read YAML file.
+	Read the news YAML (a single file, or the per-year shard directory).
 
 	Args:
 		yaml_path (str): YAML path.
@@ -302,11 +302,43 @@ def read_yaml_file(yaml_path: str) -> dict:
 	Returns:
 		dict: Parsed YAML.
 	"""
-	with open(yaml_path, 'r', encoding='utf-8') as f:
-		data = yaml.safe_load(f)
+	data = python_tools.news_store.read_news_yaml(yaml_path)
+	if data is None:
+		raise FileNotFoundError(f'News YAML not found: {yaml_path}')
 	return data
 
 
+#============================================
+def pending_is_hard_fail(pending: dict) -> bool:
+	"""
+	Check whether a pending record is a known-dead URL.
+
+	Reads the negative-cache fields written by news_enrich (failure_class,
+	gave_up) and falls back to the reason text for older records.
+
+	Args:
+		pending (dict): Pending record from in_the_news.yml.
+
+	Returns:
+		bool: True if the URL should be treated as a hard failure.
+	"""
+	if not isinstance(pending, dict):
+		return False
+	if pending.get('gave_up', False):
+		return True
+
+	failure_class = str(pending.get('failure_class', '') or '').strip().lower()
+	if failure_class:
+		return failure_class in python_tools.news_store.HARD_FAILURE_CLASSES
+
+	reason = str(pending.get('reason', '') or '').strip().lower()
+	if not reason:
+		return False
+	if reason.startswith('blocked'):
+		return False
+	return reason in python_tools.news_store.HARD_FAILURE_CLASSES
+
+
 #============================================
 def render_in_the_news_page(data: dict) -> str:
 	"""
@@ -321,9 +353,10 @@ def render_in_the_news_page(data: dict) -> str:
 	stories = []
 	pending = []
 	if isinstance(data, dict) and isinstance(data.get('stories', None), list):
-		stories = data.get('stories', [])
-		if isinstance(data.get('pending', None), list):
-			pending = data.get('pending', [])
+		# Same indexed store news_enrich writes through (duplicates merged by fingerprint).
+		store = python_tools.news_store.NewsStore.from_data(data)
+		stories = store.stories
+		pending = list(store.pending_by_url.values())
 	elif isinstance(data, dict):
 		# Backward-compatible: older schema wrapped items in a dict.
 		raw_items = data.get('items', [])
@@ -389,27 +422,11 @@ def render_in_the_news_page(data: dict) -> str:
 		path = u.path or ''
 		return (netloc, path)
 
-	def pending_is_hard_fail(reason: str) -> bool:
-		reason = str(reason or '').strip().lower()
-		if not reason:
-			return False
-		if reason.startswith('blocked'):
-			return False
-
-		if reason.isdigit():
-			try:
-				code = int(reason)
-			except Exception:
-				code = 0
-			return code in (404, 410)
-
-		return reason in ('404', '410', 'timeout', 'dns', 'connection_error', 'ssl_error')
-
 	hard_fail_keys = set()
 	for p in pending:
 		if not isinstance(p, dict):
 			continue
-		if not pending_is_hard_fail(p.get('reason', '')):
+		if not pending_is_hard_fail(p):
 			continue
 		u = str(p.get('url', '') or '').strip()
 		if not u:
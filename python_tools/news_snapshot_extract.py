@@ -2,20 +2,26 @@
 
 # Standard Library
 import argparse
+import concurrent.futures
 import csv
 import hashlib
-import json
 import os
-import re
-from html.parser import HTMLParser
 from pathlib import Path
-import html as html_lib
 
+# local repo modules
+import python_tools.news_head
+import python_tools.news_head_cache
+import python_tools.news_snapshot_formats
 
-HEAD_CACHE_DIR_DEFAULT = os.path.join('cache', 'news_head')
+
+HEAD_CACHE_DIR_DEFAULT = python_tools.news_head_cache.HEAD_CACHE_DIR_DEFAULT
 SNAPSHOT_DIR_DEFAULT = os.path.join('snapshots', 'news_full')
 INDEX_CSV_DEFAULT = os.path.join('snapshots', 'news_full', 'index.csv')
 
+# Index CSV columns; size/mtime_ns/sha256 let unchanged snapshots be skipped.
+MANIFEST_FIELDS = ['file', 'extracted_url', 'cache_path', 'ok', 'note', 'size', 'mtime_ns', 'sha256']
+HASH_CHUNK_BYTES = 1024 * 1024
+
 
 #============================================
 def parse_args():
@@ -23,13 +29,13 @@ def parse_args():
 	Parse command-line arguments.
 	"""
 	parser = argparse.ArgumentParser(
-		description='Extract head metadata from full HTML snapshots into cache/news_head/*.head.html',
+		description='Extract head metadata from full HTML snapshots into the cache/news_head index',
 	)
 
 	parser.add_argument(
 		'-i', '--input-dir', dest='input_dir', required=False, type=str,
 		default=SNAPSHOT_DIR_DEFAULT,
-		help='Input directory of full HTML snapshots (default: snapshots/news_full)',
+		help='Input directory of saved pages: .html, .html.gz, .mhtml, .warc, .warc.gz (default: snapshots/news_full)',
 	)
 	parser.add_argument(
 		'-c', '--cache-dir', dest='cache_dir', required=False, type=str,
@@ -46,6 +52,26 @@ def parse_args():
 		default=None,
 		help='Optional max files (for testing)',
 	)
+	parser.add_argument(
+		'--max-parse-chars', dest='max_parse_chars', required=False, type=int,
+		default=python_tools.news_head.HEAD_PARSE_MAX_CHARS,
+		help='Safety cap on characters examined per snapshot, 0 for no cap (default: 4 MiB)',
+	)
+	parser.add_argument(
+		'--html-parser', dest='html_parser', required=False, type=str,
+		choices=python_tools.news_head.PARSER_BACKENDS, default='auto',
+		help='HTML parser backend; auto uses selectolax or lxml when installed, else stdlib (default: auto)',
+	)
+	parser.add_argument(
+		'-j', '--jobs', dest='jobs', required=False, type=int,
+		default=1,
+		help='Worker processes for parsing snapshots (default: 1)',
+	)
+	parser.add_argument(
+		'--force', dest='force', required=False,
+		action='store_true',
+		help='Re-extract every snapshot, ignoring the index manifest',
+	)
 	parser.add_argument(
 		'--dry-run', dest='dry_run', required=False,
 		action='store_true',
@@ -61,335 +87,124 @@ def parse_args():
 
 
 #============================================
-def sha12(text: str) -> str:
-	"""
-	Get a short SHA1 prefix for stable cache filenames.
+def extract_snapshot_head(
+	path: Path,
+	max_chars: int = python_tools.news_head.HEAD_PARSE_MAX_CHARS,
+	html_parser: str = 'auto',
+) -> tuple:
 	"""
-	text = str(text or '')
-	return hashlib.sha1(text.encode('utf-8', errors='ignore')).hexdigest()[:12]
+	Read one snapshot and build its head cache document.
 
+	This is the CPU-bound part of the work and runs in the --jobs worker
+	processes; it does not touch the cache. Parsing stops at the end of the
+	head (see news_head.parse_head_document), so large saved pages cost about
+	the same as small ones.
 
-#============================================
-def normalize_url(url: str) -> str:
-	"""
-	Normalize a URL string (strip, unescape entities).
+	Returns:
+		tuple: (url, head_html, note); note is set when there is nothing to cache.
 	"""
-	url = str(url or '').strip()
-	url = html_lib.unescape(url)
-	return url.strip()
-
-
-#============================================
-def write_text_file_if_changed(path: str, content: str) -> bool:
-	"""
-	Write text file only if content changed.
-	"""
-	parent = os.path.dirname(path)
-	if parent:
-		os.makedirs(parent, exist_ok=True)
-
-	if os.path.exists(path):
-		with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-			existing = f.read()
-		if existing == content:
-			return False
-
-	with open(path, 'w', encoding='utf-8') as f:
-		f.write(content)
-	return True
-
-
-#============================================
-def _json_sanitize_no_images(value):
-	"""
-	Remove image-like fields from JSON-LD objects (recursive).
-	"""
-	if isinstance(value, list):
-		return [_json_sanitize_no_images(v) for v in value]
-
-	if isinstance(value, dict):
-		drop = set(['image', 'thumbnail', 'thumbnailurl', 'thumbnailUrl', 'logo'])
-		out = {}
-		for k, v in value.items():
-			ks = str(k or '')
-			if ks.lower() in drop:
-				continue
-			out[k] = _json_sanitize_no_images(v)
-		return out
-
-	return value
-
+	# Only the first max_chars of the document are decoded, even from archives.
+	try:
+		html_text = python_tools.news_snapshot_formats.read_snapshot_html(str(path), max_chars)
+	except Exception:
+		return '', '', 'read_error'
 
-#============================================
-def _is_image_meta(attrs: dict) -> bool:
-	name = str(attrs.get('name', '') or '').strip().lower()
-	prop = str(attrs.get('property', '') or '').strip().lower()
-	key = prop or name
-	if key.startswith('og:image'):
-		return True
-	if key.startswith('twitter:image'):
-		return True
-	if key in ('image', 'thumbnail', 'thumbnailurl'):
-		return True
-	return False
+	doc = python_tools.news_head.parse_head_document(html_text, max_chars=max_chars, backend=html_parser)
+	url = python_tools.news_head.extract_best_url(doc)
+	if not url:
+		return '', '', 'no_url_in_head'
 
+	head_doc = python_tools.news_head.build_head_cache_html(doc)
+	if not head_doc or '<head' not in head_doc.lower():
+		return url, '', 'no_head_doc'
 
-#============================================
-def _is_image_link(attrs: dict) -> bool:
-	rel = str(attrs.get('rel', '') or '').strip().lower()
-	as_attr = str(attrs.get('as', '') or '').strip().lower()
-	if as_attr == 'image':
-		return True
-	if 'icon' in rel:
-		return True
-	if 'apple-touch-icon' in rel:
-		return True
-	if 'mask-icon' in rel:
-		return True
-	return False
+	return url, head_doc, ''
 
 
 #============================================
-class HeadMetaParser(HTMLParser):
+def iter_extracted(files: list, jobs: int, max_chars: int, html_parser: str):
 	"""
-	Parse <head> for canonical/og/twitter URLs and collect head elements.
-	"""
-
-	def __init__(self):
-		super().__init__()
-		self.in_head = False
-		self.in_title = False
-		self.in_ldjson = False
-
-		self.title_parts = []
-		self.meta_tags = []
-		self.link_tags = []
-		self.ldjson_blobs = []
-		self._ldjson_parts = []
-
-		self.canonical = None
-		self.og_url = None
-		self.twitter_url = None
-
-	def handle_starttag(self, tag, attrs):
-		tag = str(tag or '').lower()
-		attrs_dict = {}
-		for k, v in (attrs or []):
-			if not k:
-				continue
-			attrs_dict[str(k).lower()] = str(v or '')
-
-		if tag == 'head':
-			self.in_head = True
-			return
-
-		if not self.in_head:
-			return
-
-		if tag == 'title':
-			self.in_title = True
-			return
-
-		if tag == 'link':
-			if not _is_image_link(attrs_dict):
-				self.link_tags.append(attrs_dict)
-			rel = str(attrs_dict.get('rel', '') or '').strip().lower()
-			href = attrs_dict.get('href')
-			if rel == 'canonical' and href:
-				if self.canonical is None:
-					self.canonical = href
-			return
-
-		if tag == 'meta':
-			if not _is_image_meta(attrs_dict):
-				self.meta_tags.append(attrs_dict)
-			prop = str(attrs_dict.get('property', '') or '').strip()
-			name = str(attrs_dict.get('name', '') or '').strip()
-			content = attrs_dict.get('content')
-			if prop == 'og:url' and content:
-				if self.og_url is None:
-					self.og_url = content
-			if name.lower() == 'twitter:url' and content:
-				if self.twitter_url is None:
-					self.twitter_url = content
-			return
-
-		if tag == 'script':
-			type_attr = str(attrs_dict.get('type', '') or '').strip().lower()
-			if type_attr == 'application/ld+json':
-				self.in_ldjson = True
-				self._ldjson_parts = []
-			return
-
-	def handle_endtag(self, tag):
-		tag = str(tag or '').lower()
-		if tag == 'head':
-			self.in_head = False
-			return
-		if not self.in_head:
-			return
-		if tag == 'title':
-			self.in_title = False
-			return
-		if tag == 'script' and self.in_ldjson:
-			raw = ''.join(self._ldjson_parts).strip()
-			self.in_ldjson = False
-			self._ldjson_parts = []
-			if raw:
-				self.ldjson_blobs.append(raw)
-
-	def handle_data(self, data):
-		if not self.in_head:
-			return
-		if self.in_title:
-			text = str(data or '')
-			text = re.sub(r'\s+', ' ', text).strip()
-			if text:
-				self.title_parts.append(text)
-			return
-		if self.in_ldjson:
-			self._ldjson_parts.append(str(data or ''))
-
-	def title_text(self) -> str:
-		return re.sub(r'\s+', ' ', ' '.join(self.title_parts)).strip()
+	Yield extract_snapshot_head results in input order.
 
+	Args:
+		files (list): Snapshot paths.
+		jobs (int): Worker processes (1 = in-process).
+		max_chars (int): See --max-parse-chars.
+		html_parser (str): See --html-parser.
 
-#============================================
-def extract_url_from_ldjson(blobs: list) -> str:
-	"""
-	Try to extract a URL from JSON-LD mainEntityOfPage.@id or url.
+	Yields:
+		tuple: (url, head_html, note) per file, in the order of files.
 	"""
-	for blob in blobs:
-		blob = str(blob or '').strip()
-		if not blob:
-			continue
-		try:
-			obj = json.loads(blob)
-		except Exception:
-			continue
-
-		candidates = []
-		if isinstance(obj, dict):
-			candidates.append(obj)
-		elif isinstance(obj, list):
-			for x in obj:
-				if isinstance(x, dict):
-					candidates.append(x)
-
-		for d in candidates:
-			me = d.get('mainEntityOfPage')
-			if isinstance(me, dict) and isinstance(me.get('@id'), str):
-				return str(me.get('@id') or '').strip()
-			if isinstance(d.get('url'), str):
-				return str(d.get('url') or '').strip()
-
-	return ''
+	max_chars_list = [max_chars] * len(files)
+	parser_list = [html_parser] * len(files)
+	if jobs <= 1 or len(files) <= 1:
+		yield from map(extract_snapshot_head, files, max_chars_list, parser_list)
+		return
+	with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+		# map() returns results in submission order, which keeps the index CSV stable.
+		yield from pool.map(extract_snapshot_head, files, max_chars_list, parser_list, chunksize=4)
 
 
 #============================================
-def extract_best_url(html_text: str) -> str:
+def file_sha256(path: Path) -> str:
 	"""
-	Extract best URL using priority:
-	1) link rel=canonical
-	2) meta property=og:url
-	3) meta name=twitter:url
-	4) JSON-LD mainEntityOfPage.@id or url
+	Hash a file in chunks (SHA256 hex digest).
 	"""
-	parser = HeadMetaParser()
-	parser.feed(str(html_text or ''))
-
-	candidates = [
-		parser.canonical,
-		parser.og_url,
-		parser.twitter_url,
-		extract_url_from_ldjson(parser.ldjson_blobs),
-	]
-
-	for u in candidates:
-		u = normalize_url(u)
-		if not u:
-			continue
-		if u.startswith('//'):
-			u = 'https:' + u
-		if u.startswith('http'):
-			return u
-
-	return ''
+	h = hashlib.sha256()
+	with path.open('rb') as f:
+		for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+			h.update(chunk)
+	return h.hexdigest()
 
 
 #============================================
-def build_head_cache_html(full_html: str) -> str:
+def read_manifest(index_csv: Path) -> dict:
 	"""
-	Build a minimal HTML document with just head metadata.
+	Read the previous index CSV, keyed by snapshot file path.
+
+	Rows written before the manifest columns existed are ignored, so those
+	snapshots are simply extracted again.
 	"""
-	parser = HeadMetaParser()
-	parser.feed(str(full_html or ''))
-
-	lines = []
-	lines.append('<!doctype html>')
-	lines.append('<html>')
-	lines.append('<head>')
-
-	title = parser.title_text()
-	if title:
-		lines.append('<title>' + html_lib.escape(title) + '</title>')
-
-	def emit_tag(tag: str, attrs: dict):
-		parts = [tag]
-		for k in sorted(attrs.keys()):
-			v = str(attrs.get(k, '') or '')
-			if v == '':
-				continue
-			parts.append(f'{k}=\"{html_lib.escape(v, quote=True)}\"')
-		return '<' + ' '.join(parts) + '>'
-
-	for attrs in parser.meta_tags:
-		lines.append(emit_tag('meta', attrs))
-
-	for attrs in parser.link_tags:
-		lines.append(emit_tag('link', attrs))
-
-	for raw in parser.ldjson_blobs:
-		try:
-			obj = json.loads(raw)
-		except Exception:
-			continue
-		obj = _json_sanitize_no_images(obj)
-		raw_out = json.dumps(obj, ensure_ascii=False, indent=2)
-		lines.append('<script type=\"application/ld+json\">')
-		lines.append(raw_out)
-		lines.append('</script>')
-
-	lines.append('</head>')
-	lines.append('</html>')
-	return '\n'.join(lines) + '\n'
+	if not index_csv.exists():
+		return {}
+	out = {}
+	with index_csv.open('r', encoding='utf-8', newline='') as f:
+		for row in csv.DictReader(f):
+			if row.get('file') and row.get('sha256'):
+				out[row['file']] = row
+	return out
 
 
 #============================================
-def process_file(path: Path, cache_dir: Path, dry_run: bool = False):
-	"""
-	Process one snapshot file and write head cache.
+def is_unchanged(path: Path, previous: dict, head_index) -> bool:
 	"""
-	try:
-		html_text = path.read_text(encoding='utf-8', errors='ignore')
-	except Exception:
-		return False, '', '', 'read_error'
+	Decide whether a snapshot can keep its previous manifest row.
 
-	url = extract_best_url(html_text)
-	if not url:
-		return False, '', '', 'no_url_in_head'
+	Same size and mtime means unchanged without opening the file; same size
+	with a new mtime (e.g. a copy) falls back to comparing the content hash.
+	A successful row also needs its head to still be in the cache index.
 
-	head_doc = build_head_cache_html(html_text)
-	if not head_doc or '<head' not in head_doc.lower():
-		return False, url, '', 'no_head_doc'
+	Args:
+		path (Path): Snapshot path.
+		previous (dict): Previous manifest row ({} if none).
+		head_index (HeadCacheIndex): Head cache index.
 
-	key = sha12(url)
-	out_path = cache_dir / (key + '.head.html')
-
-	if not dry_run:
-		write_text_file_if_changed(str(out_path), head_doc)
-
-	return True, url, str(out_path), ''
+	Returns:
+		bool: True if the snapshot can be skipped.
+	"""
+	if not previous:
+		return False
+	if previous.get('ok') == 'true' and not head_index.lookup([previous.get('extracted_url', '')]):
+		return False
+	stat = path.stat()
+	if str(stat.st_size) != previous.get('size'):
+		return False
+	if str(stat.st_mtime_ns) == previous.get('mtime_ns'):
+		return True
+	if file_sha256(path) != previous.get('sha256'):
+		return False
+	previous['mtime_ns'] = str(stat.st_mtime_ns)
+	return True
 
 
 #============================================
@@ -397,22 +212,40 @@ def main():
 	args = parse_args()
 
 	input_dir = Path(args.input_dir)
-	cache_dir = Path(args.cache_dir)
+	head_index = python_tools.news_head_cache.HeadCacheIndex(args.cache_dir)
 	index_csv = Path(args.index_csv)
 
-	files = sorted(input_dir.glob('*.html')) if input_dir.exists() else []
+	files = []
+	if input_dir.exists():
+		files = sorted(p for p in input_dir.iterdir() if python_tools.news_snapshot_formats.snapshot_format(p.name))
 	if args.max_files is not None:
 		files = files[:args.max_files]
 
-	rows = []
-	rows.append(['file', 'extracted_url', 'cache_path', 'ok', 'note'])
-
+	# The index CSV doubles as a manifest: unchanged snapshots are not re-read.
+	manifest = {} if args.force else read_manifest(index_csv)
+	rows_by_file = {}
+	changed = []
 	for p in files:
-		ok, extracted_url, cache_path, note = process_file(
-			path=p,
-			cache_dir=cache_dir,
-			dry_run=bool(args.dry_run),
-		)
+		previous = manifest.get(str(p), {})
+		if is_unchanged(p, previous, head_index):
+			entry = head_index.lookup([previous.get('extracted_url', '')])
+			if entry:
+				previous['cache_path'] = head_index.path_for(entry)
+			rows_by_file[str(p)] = previous
+			if args.verbose:
+				print(str(p))
+				print('  unchanged: skipped')
+		else:
+			changed.append(p)
+
+	extracted = iter_extracted(changed, args.jobs, args.max_parse_chars, args.html_parser)
+	for p, (extracted_url, head_html, note) in zip(changed, extracted):
+		ok = not note
+		cache_path = ''
+		if ok and not args.dry_run:
+			# Workers only parse; this process alone writes head files and the index.
+			entry = head_index.put(head_html, [extracted_url], source='snapshot')
+			cache_path = head_index.path_for(entry)
 
 		if args.verbose:
 			print(str(p))
@@ -424,17 +257,32 @@ def main():
 			if note:
 				print(f'  note: {note}')
 
-		rows.append([str(p), extracted_url, cache_path, 'true' if ok else 'false', note])
+		stat = p.stat()
+		rows_by_file[str(p)] = {
+			'file': str(p),
+			'extracted_url': extracted_url,
+			'cache_path': cache_path,
+			'ok': 'true' if ok else 'false',
+			'note': note,
+			'size': str(stat.st_size),
+			'mtime_ns': str(stat.st_mtime_ns),
+			'sha256': file_sha256(p),
+		}
+
+	if not args.dry_run:
+		head_index.save()
 
 	index_csv.parent.mkdir(parents=True, exist_ok=True)
 	with index_csv.open('w', encoding='utf-8', newline='') as f:
-		w = csv.writer(f)
-		w.writerows(rows)
+		w = csv.DictWriter(f, fieldnames=MANIFEST_FIELDS, extrasaction='ignore')
+		w.writeheader()
+		for p in files:
+			w.writerow(rows_by_file[str(p)])
 
 	if args.verbose:
+		print(f'Extracted: {len(changed)} (unchanged: {len(files) - len(changed)})')
 		print(f'Wrote index: {index_csv}')
 
 
 if __name__ == '__main__':
 	main()
-
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import io
+import gzip
+import zlib
+import codecs
+import binascii
+
+# local repo modules
+import python_tools.news_head
+
+# Saved-page formats news_snapshot_extract accepts. Compressed and archived
+# snapshots are decoded as streams up to the parse cap; past the document
+# head only JSON-LD script elements are kept, so the body is never held in
+# memory.
+SNAPSHOT_SUFFIXES = ('.html', '.htm', '.html.gz', '.mhtml', '.mht', '.warc', '.warc.gz')
+READ_CHUNK_BYTES = 64 * 1024
+# Text kept even when the head closes sooner: the byline fallback scans the
+# top of the document (python_tools.news_head.BYLINE_SCAN_CHARS).
+HEAD_MIN_CHARS = python_tools.news_head.BYLINE_SCAN_CHARS
+
+
+#============================================
+def snapshot_format(path: str) -> str:
+	"""
+	Get the snapshot format from a file name.
+
+	Returns:
+		str: 'html', 'html.gz', 'mhtml', 'warc', 'warc.gz', or '' if unsupported.
+	"""
+	name = str(path or '').lower()
+	if name.endswith('.html.gz'):
+		return 'html.gz'
+	if name.endswith('.warc.gz'):
+		return 'warc.gz'
+	if name.endswith('.warc'):
+		return 'warc'
+	if name.endswith(('.mhtml', '.mht')):
+		return 'mhtml'
+	if name.endswith(('.html', '.htm')):
+		return 'html'
+	return ''
+
+
+#============================================
+def header_param(value: str, name: str) -> str:
+	"""
+	Get a parameter (e.g. boundary, charset) from a MIME header value.
+	"""
+	for part in str(value or '').split(';')[1:]:
+		key, _, param = part.partition('=')
+		if key.strip().lower() == name:
+			return param.strip().strip('"')
+	return ''
+
+
+#============================================
+def read_headers(f) -> dict:
+	"""
+	Read RFC 822 style headers up to the blank line (folded lines joined).
+
+	Args:
+		f: Binary file-like object with readline().
+
+	Returns:
+		dict: Lower-cased header name -> value (later duplicates win).
+	"""
+	headers = {}
+	last = ''
+	while True:
+		line = f.readline(READ_CHUNK_BYTES)
+		if not line or not line.strip():
+			return headers
+		text = line.decode('latin-1').rstrip('\r\n')
+		if text[:1] in (' ', '\t') and last:
+			headers[last] += ' ' + text.strip()
+			continue
+		name, _, value = text.partition(':')
+		last = name.strip().lower()
+		headers[last] = value.strip()
+
+
+#============================================
+class LimitedReader:
+	"""
+	Read at most a fixed number of bytes from an underlying stream.
+	"""
+
+	def __init__(self, f, limit: int):
+		self.f = f
+		self.remaining = max(0, int(limit))
+
+	def read(self, size: int = -1) -> bytes:
+		if size < 0 or size > self.remaining:
+			size = self.remaining
+		data = self.f.read(size) if size else b''
+		self.remaining -= len(data)
+		return data
+
+	def readline(self, size: int = -1) -> bytes:
+		if size < 0 or size > self.remaining:
+			size = self.remaining
+		data = self.f.readline(size) if size else b''
+		self.remaining -= len(data)
+		return data
+
+	def skip_rest(self) -> None:
+		while self.remaining and self.read(READ_CHUNK_BYTES):
+			pass
+
+
+#============================================
+def iter_file_chunks(f):
+	"""
+	Yield a binary stream in READ_CHUNK_BYTES pieces.
+	"""
+	while True:
+		data = f.read(READ_CHUNK_BYTES)
+		if not data:
+			return
+		yield data
+
+
+#============================================
+def decode_transfer(lines, transfer_encoding: str):
+	"""
+	Undo a MIME Content-Transfer-Encoding line by line.
+	"""
+	transfer_encoding = str(transfer_encoding or '').strip().lower()
+	pending = b''
+	for line in lines:
+		if transfer_encoding == 'quoted-printable':
+			# Escapes never span lines; a trailing '=' is a soft line break.
+			yield binascii.a2b_qp(line)
+		elif transfer_encoding == 'base64':
+			pending += b''.join(line.split())
+			usable = len(pending) - (len(pending) % 4)
+			if usable:
+				try:
+					yield binascii.a2b_base64(pending[:usable])
+				except binascii.Error:
+					return
+				pending = pending[usable:]
+		else:
+			yield line
+
+
+#============================================
+def mhtml_html_part(f) -> tuple:
+	"""
+	Find the first text/html part of an MHTML file.
+
+	Parts before it are read past line by line; the HTML part itself is
+	returned as a lazy stream.
+
+	Args:
+		f: Binary file object positioned at the start of the file.
+
+	Returns:
+		tuple: (charset, iterator of transfer-decoded bytes); ('', empty) if none.
+	"""
+	headers = read_headers(f)
+	content_type = headers.get('content-type', '')
+	boundary = header_param(content_type, 'boundary')
+	if not boundary:
+		if content_type.split(';')[0].strip().lower() != 'text/html':
+			return '', iter(())
+		lines = iter(lambda: f.readline(READ_CHUNK_BYTES), b'')
+		return header_param(content_type, 'charset'), decode_transfer(lines, headers.get('content-transfer-encoding', ''))
+
+	delimiter = b'--' + boundary.encode('latin-1')
+	state = {'done': False}
+
+	def part_lines():
+		while True:
+			line = f.readline(READ_CHUNK_BYTES)
+			if not line:
+				state['done'] = True
+				return
+			if line.startswith(delimiter):
+				state['done'] = line.rstrip().endswith(delimiter + b'--')
+				return
+			yield line
+
+	# Skip the preamble, then any parts ahead of the HTML.
+	for _ in part_lines():
+		pass
+	while not state['done']:
+		part_headers = read_headers(f)
+		part_type = part_headers.get('content-type', '')
+		if part_type.split(';')[0].strip().lower() == 'text/html':
+			body = decode_transfer(part_lines(), part_headers.get('content-transfer-encoding', ''))
+			return header_param(part_type, 'charset'), body
+		for _ in part_lines():
+			pass
+	return '', iter(())
+
+
+#============================================
+def iter_http_body(reader, headers: dict):
+	"""
+	Yield a raw HTTP response body with chunking and gzip/deflate removed.
+	"""
+	if 'chunked' in headers.get('transfer-encoding', '').lower():
+		def chunks():
+			while True:
+				size_line = reader.readline(READ_CHUNK_BYTES)
+				try:
+					size = int(size_line.split(b';')[0].strip() or b'0', 16)
+				except ValueError:
+					return
+				if size <= 0:
+					return
+				body = LimitedReader(reader, size)
+				yield from iter_file_chunks(body)
+				reader.readline(READ_CHUNK_BYTES)
+		raw = chunks()
+	else:
+		raw = iter_file_chunks(reader)
+
+	content_encoding = headers.get('content-encoding', '').strip().lower()
+	if content_encoding in ('', 'identity'):
+		yield from raw
+		return
+	if content_encoding not in ('gzip', 'x-gzip', 'deflate'):
+		return
+	wbits = 16 + zlib.MAX_WBITS if content_encoding != 'deflate' else zlib.MAX_WBITS
+	inflater = zlib.decompressobj(wbits)
+	for data in raw:
+		try:
+			out = inflater.decompress(data, READ_CHUNK_BYTES)
+			while out:
+				yield out
+				out = inflater.decompress(inflater.unconsumed_tail, READ_CHUNK_BYTES)
+		except zlib.error:
+			return
+
+
+#============================================
+def warc_html_response(f) -> tuple:
+	"""
+	Find the first text/html HTTP response record in a WARC file.
+
+	Other records are skipped by their Content-Length without being parsed.
+
+	Args:
+		f: Binary file object (gzip.open for .warc.gz; members are read in sequence).
+
+	Returns:
+		tuple: (charset, iterator of body bytes); ('', empty) if none.
+	"""
+	while True:
+		version = f.readline(READ_CHUNK_BYTES)
+		if not version:
+			return '', iter(())
+		if not version.strip():
+			continue
+		headers = read_headers(f)
+		try:
+			length = int(headers.get('content-length', '0') or 0)
+		except ValueError:
+			return '', iter(())
+		block = LimitedReader(f, length)
+		is_response = headers.get('warc-type', '').lower() == 'response'
+		if is_response and 'application/http' in headers.get('content-type', '').lower():
+			block.readline(READ_CHUNK_BYTES)
+			http_headers = read_headers(block)
+			http_type = http_headers.get('content-type', '')
+			if http_type.split(';')[0].strip().lower() == 'text/html':
+				return header_param(http_type, 'charset'), iter_http_body(block, http_headers)
+		block.skip_rest()
+
+
+#============================================
+def iter_snapshot_text(path: str):
+	"""
+	Yield the HTML document inside a snapshot file as decoded text pieces.
+
+	Bytes are decoded incrementally (errors ignored, newlines translated as
+	open() does), so stopping early never reads the rest of the file.
+
+	Args:
+		path (str): Snapshot path (see SNAPSHOT_SUFFIXES).
+
+	Yields:
+		str: Text pieces.
+	"""
+	fmt = snapshot_format(path)
+	opener = gzip.open if fmt.endswith('.gz') else open
+	with opener(path, 'rb') as f:
+		charset = ''
+		if fmt.startswith('html'):
+			byte_chunks = iter_file_chunks(f)
+		elif fmt == 'mhtml':
+			charset, byte_chunks = mhtml_html_part(f)
+		elif fmt.startswith('warc'):
+			charset, byte_chunks = warc_html_response(f)
+		else:
+			raise ValueError(f'Unsupported snapshot format: {path}')
+
+		charset = str(charset or '').strip() or 'utf-8'
+		try:
+			codecs.lookup(charset)
+		except LookupError:
+			charset = 'utf-8'
+		decoder = io.IncrementalNewlineDecoder(
+			codecs.getincrementaldecoder(charset)(errors='ignore'),
+			translate=True,
+		)
+		for data in byte_chunks:
+			text = decoder.decode(data)
+			if text:
+				yield text
+		text = decoder.decode(b'', final=True)
+		if text:
+			yield text
+
+
+#============================================
+def head_keep_chars(html_prefix: str, head_end: int) -> int:
+	"""
+	Get how much of a document read_snapshot_html keeps verbatim.
+
+	That is everything up to the parse chunk boundary
+	(python_tools.news_head.HEAD_PARSE_CHUNK_CHARS) at or after the end of the
+	closing head tag, and at least HEAD_MIN_CHARS, so parse_head_document
+	tokenizes the same chunks as in the whole document.
+
+	Args:
+		html_prefix (str): Text read so far.
+		head_end (int): Offset of the closing head tag.
+
+	Returns:
+		int: Characters to keep, or 0 if the tag has not been read to its end yet.
+	"""
+	tag_end = html_prefix.find('>', head_end)
+	if tag_end < 0:
+		return 0
+	chunk = python_tools.news_head.HEAD_PARSE_CHUNK_CHARS
+	needed = max(tag_end + 1, HEAD_MIN_CHARS)
+	return -(-needed // chunk) * chunk
+
+
+#============================================
+def read_snapshot_html(path: str, max_chars: int = 0, head_only: bool = True) -> str:
+	"""
+	Read the HTML document inside a snapshot, decoding at most max_chars.
+
+	With head_only, only the head is kept as text: once the closing head tag
+	has been seen (python_tools.news_head.HeadEndScanner, the same scan the
+	streaming fetch uses), the document is kept up to head_keep_chars(), and
+	the rest is streamed through a news_head.JsonLdScanner whose body JSON-LD
+	script elements are appended. Parsing the result gives the same metadata
+	as parsing the whole document, without holding the body in memory.
+
+	Args:
+		path (str): Snapshot path.
+		max_chars (int): Character cap (0 = whole document).
+		head_only (bool): Drop body markup other than JSON-LD (False keeps it all).
+
+	Returns:
+		str: HTML text.
+	"""
+	pieces = []
+	total = 0
+	keep = 0
+	head_scanner = python_tools.news_head.HeadEndScanner()
+	jsonld_scanner = None
+	stream = iter_snapshot_text(path)
+	try:
+		for text in stream:
+			if max_chars:
+				text = text[:max_chars - total]
+			if jsonld_scanner is not None:
+				jsonld_scanner.feed(text)
+			if not keep or total < keep:
+				pieces.append(text)
+			total += len(text)
+			if head_only and jsonld_scanner is None and head_scanner.feed(text) >= 0:
+				# Body JSON-LD is searched from the head end, as parse_head_document does.
+				jsonld_scanner = python_tools.news_head.JsonLdScanner(head_scanner.head_end)
+				jsonld_scanner.feed(''.join(pieces)[head_scanner.head_end:])
+			if jsonld_scanner is not None and not keep:
+				keep = head_keep_chars(''.join(pieces), head_scanner.head_end)
+			if max_chars and total >= max_chars:
+				break
+	finally:
+		stream.close()
+
+	out = ''.join(pieces)
+	if jsonld_scanner is None or not keep or total <= keep:
+		return out
+	parts = [out[:keep]]
+	for start, end, script in jsonld_scanner.close():
+		if end <= keep:
+			continue
+		if start < keep:
+			# A script that straddles the cut is kept whole.
+			parts = [out[:start]]
+		parts.append(script)
+	return ''.join(parts)
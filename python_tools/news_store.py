@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import argparse
+import hashlib
+import json
+import os
+import re
+
+# local repo modules
+import python_tools.normalized_cache
+import python_tools.yaml_io
+
+NEWS_YAML_DEFAULT = os.path.join('data', 'in_the_news.yml')
+
+# Sharded layout: data/in_the_news.yml can be replaced by a directory of the
+# same name holding one file per published year (2008.yml, ...), undated.yml
+# and pending.yml. The directory wins when both exist.
+SHARD_SUFFIX = '.yml'
+PENDING_SHARD = 'pending'
+UNDATED_SHARD = 'undated'
+# Bump when the merged data read_news_yaml returns changes shape, so
+# cache/normalized/ entries written by older code are not reused.
+NORMALIZED_VERSION = 1
+
+# Story ids are YYYYMMDD plus a suffix: a..z, then aa..zz.
+SUFFIX_LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+UNDATED_ID_PREFIX = '00000000'
+
+# Fields a duplicate story may fill in on the story it is merged into.
+MERGE_FIELDS = ('source', 'published_date', 'title', 'author', 'teaser', 'primary_url')
+
+# Fetch failure classes that mark a URL as dead: news_enrich backs off on them
+# (pending failure_class), and news_render hides stories on those URLs.
+HARD_FAILURE_CLASSES = ('404', '410', 'timeout', 'dns', 'connection_error', 'ssl_error')
+
+
+#============================================
+def story_id_suffix(index: int) -> str:
+	"""
+	Get the id suffix at a position in the a..z, aa..zz sequence.
+
+	Args:
+		index (int): Zero-based position.
+
+	Returns:
+		str: Suffix letters.
+
+	Raises:
+		RuntimeError: If the sequence is exhausted.
+	"""
+	count = len(SUFFIX_LETTERS)
+	if index < count:
+		return SUFFIX_LETTERS[index]
+	index -= count
+	if index < count * count:
+		return SUFFIX_LETTERS[index // count] + SUFFIX_LETTERS[index % count]
+	# Extremely unlikely to run out in practice.
+	raise RuntimeError('Unable to allocate story id (too many for one date)')
+
+
+#============================================
+def story_id_date_key(published_date: str) -> str:
+	"""
+	Get the YYYYMMDD id prefix for a published date.
+	"""
+	date_key = str(published_date or '').replace('-', '')
+	if not re.match(r'^\d{8}$', date_key):
+		return UNDATED_ID_PREFIX
+	return date_key
+
+
+#============================================
+class NewsStore:
+	"""
+	In-memory view of in_the_news.yml with hash indexes.
+
+	Stories are indexed by fingerprint, id and URL, and pending records by
+	URL, so merges, lookups and id allocation are dict reads instead of list
+	scans. The store does not normalize anything: callers pass URLs and
+	fingerprints in the form they want them matched (news_enrich normalizes
+	first).
+	"""
+
+	def __init__(self):
+		# Every story, in load order (stories without a fingerprint included).
+		self.stories = []
+		self.by_fingerprint = {}
+		self.by_id = {}
+		self.by_url = {}
+		self.pending_by_url = {}
+		# Next suffix position to try per YYYYMMDD; ids are only ever added,
+		# so the first free suffix never moves backwards.
+		self.id_counters = {}
+		self._story_urls = {}
+
+	#============================================
+	@classmethod
+	def from_data(cls, data: dict):
+		"""
+		Build a store from a parsed schema 1 YAML dict.
+
+		Args:
+			data (dict): Dict with 'stories' and 'pending' lists.
+
+		Returns:
+			NewsStore: Store holding the same story and pending dicts.
+		"""
+		store = cls()
+		data = data if isinstance(data, dict) else {}
+		stories = data.get('stories', [])
+		pending = data.get('pending', [])
+		for story in stories if isinstance(stories, list) else []:
+			if isinstance(story, dict):
+				store.add_story(story)
+		for record in pending if isinstance(pending, list) else []:
+			if not isinstance(record, dict):
+				continue
+			url = str(record.get('url', '') or '').strip()
+			if url:
+				store.pending_by_url[url] = record
+		return store
+
+	#============================================
+	def add_story(self, story: dict) -> dict:
+		"""
+		Add a story, merging it into an existing story with the same fingerprint.
+
+		A merge adds the duplicate's URLs and fills only missing fields (and a
+		missing id), so existing values never churn.
+
+		Args:
+			story (dict): Story dict (kept by reference, not copied).
+
+		Returns:
+			dict: The stored story (the existing one after a merge).
+		"""
+		fingerprint = str(story.get('fingerprint', '') or '').strip()
+		existing = self.by_fingerprint.get(fingerprint) if fingerprint else None
+		urls = story.get('urls', [])
+		urls = urls if isinstance(urls, list) else []
+
+		if existing is None:
+			story['urls'] = []
+			self._story_urls[id(story)] = set()
+			self.stories.append(story)
+			if fingerprint:
+				self.by_fingerprint[fingerprint] = story
+			self.add_urls(story, urls)
+			self._index_id(story, story)
+			return story
+
+		self.add_urls(existing, urls)
+		for key in MERGE_FIELDS:
+			if (not existing.get(key, None)) and story.get(key, None):
+				existing[key] = story.get(key, None)
+		if (not existing.get('id', None)) and story.get('id', None):
+			existing['id'] = story.get('id', None)
+		# The duplicate's id stays taken, so it is never handed out again.
+		self._index_id(story, existing)
+		return existing
+
+	#============================================
+	def _index_id(self, story: dict, target: dict) -> None:
+		"""
+		Map a story's id (if any) to the stored story it belongs to.
+		"""
+		sid = str(story.get('id', '') or '').strip()
+		if sid:
+			self.by_id.setdefault(sid, target)
+
+	#============================================
+	def add_urls(self, story: dict, urls: list) -> None:
+		"""
+		Append URLs a stored story does not list yet, keeping their order.
+
+		Args:
+			story (dict): A story returned by add_story.
+			urls (list): URLs to add (empty values are skipped).
+		"""
+		seen = self._story_urls[id(story)]
+		urls_list = story['urls']
+		for url in urls:
+			if not url or url in seen:
+				continue
+			seen.add(url)
+			urls_list.append(url)
+			# The first story to list a URL owns it.
+			self.by_url.setdefault(url, story)
+
+	#============================================
+	def story_for_url(self, url: str):
+		"""
+		Get the story that lists a URL, or None.
+		"""
+		return self.by_url.get(url)
+
+	#============================================
+	def story_for_fingerprint(self, fingerprint: str):
+		"""
+		Get the story with a fingerprint, or None.
+		"""
+		return self.by_fingerprint.get(fingerprint)
+
+	#============================================
+	def story_for_id(self, sid: str):
+		"""
+		Get the story with an id, or None.
+		"""
+		return self.by_id.get(sid)
+
+	#============================================
+	def allocate_id(self, published_date: str) -> str:
+		"""
+		Reserve the next free YYYYMMDD suffix id for a date.
+
+		Args:
+			published_date (str): YYYY-MM-DD (anything else uses 00000000).
+
+		Returns:
+			str: New id, e.g. 20251213b.
+		"""
+		date_key = story_id_date_key(published_date)
+		index = self.id_counters.get(date_key, 0)
+		candidate = date_key + story_id_suffix(index)
+		while candidate in self.by_id:
+			index += 1
+			candidate = date_key + story_id_suffix(index)
+		self.id_counters[date_key] = index + 1
+		return candidate
+
+	#============================================
+	def assign_id(self, story: dict) -> str:
+		"""
+		Give a stored story a new id from its published_date.
+
+		Returns:
+			str: The id.
+		"""
+		sid = self.allocate_id(str(story.get('published_date', '') or ''))
+		story['id'] = sid
+		self.by_id[sid] = story
+		return sid
+
+
+#============================================
+def write_text_if_changed(path: str, content: str) -> bool:
+	"""
+	Write a text file only if its content changed.
+
+	Returns:
+		bool: True if the file was written.
+	"""
+	if os.path.exists(path):
+		with open(path, 'r', encoding='utf-8') as f:
+			if f.read() == content:
+				return False
+	parent_dir = os.path.dirname(path)
+	if parent_dir:
+		os.makedirs(parent_dir, exist_ok=True)
+	with open(path, 'w', encoding='utf-8') as f:
+		f.write(content)
+	return True
+
+
+#============================================
+def shard_dir_for(yaml_path: str) -> str:
+	"""
+	Get the shard directory for a news YAML path (the path without .yml).
+	"""
+	return os.path.splitext(yaml_path)[0]
+
+
+#============================================
+def is_sharded(yaml_path: str) -> bool:
+	"""
+	Check whether a news YAML path is stored in the sharded layout.
+	"""
+	return os.path.isdir(shard_dir_for(yaml_path))
+
+
+#============================================
+def story_shard(story: dict) -> str:
+	"""
+	Get the shard name (published year, or undated) for a story.
+	"""
+	match = re.match(r'^(\d{4})-', str(story.get('published_date', '') or '').strip())
+	return match.group(1) if match else UNDATED_SHARD
+
+
+#============================================
+def read_news_yaml(yaml_path: str):
+	"""
+	Read the news YAML from either layout.
+
+	Shards are merged in file name order (years ascending, then pending.yml
+	and undated.yml) into one schema 1 dict. The parsed result is cached in
+	cache/normalized/ keyed by the source bytes (python_tools/normalized_cache.py),
+	so unchanged sources skip YAML parsing; every call returns fresh objects.
+
+	Args:
+		yaml_path (str): Path of the single file (e.g. data/in_the_news.yml).
+
+	Returns:
+		Parsed YAML, or None if neither the file nor the shard directory exists.
+	"""
+	sources = []
+	if is_sharded(yaml_path):
+		shard_dir = shard_dir_for(yaml_path)
+		for name in sorted(os.listdir(shard_dir)):
+			if name.endswith(SHARD_SUFFIX):
+				with open(os.path.join(shard_dir, name), 'rb') as f:
+					sources.append((name, f.read()))
+	elif os.path.exists(yaml_path):
+		with open(yaml_path, 'rb') as f:
+			sources.append(('', f.read()))
+	else:
+		return None
+
+	chunks = []
+	for name, data in sources:
+		chunks.extend([name.encode('utf-8'), data])
+	digest = python_tools.normalized_cache.source_digest(chunks)
+	cache_dir = python_tools.normalized_cache.default_cache_dir(yaml_path)
+	cache_name = 'news-' + os.path.basename(shard_dir_for(yaml_path))
+	cached = python_tools.normalized_cache.load(cache_dir, cache_name, NORMALIZED_VERSION, digest)
+	if cached is not None:
+		return cached
+
+	if not is_sharded(yaml_path):
+		merged = python_tools.yaml_io.load(sources[0][1].decode('utf-8'))
+	else:
+		merged = {'schema': 1, 'stories': [], 'pending': []}
+		for name, data in sources:
+			shard = python_tools.yaml_io.load(data.decode('utf-8'))
+			if not isinstance(shard, dict):
+				continue
+			for key in ('stories', 'pending'):
+				if isinstance(shard.get(key, None), list):
+					merged[key].extend(shard.get(key, []))
+	if merged is not None:
+		python_tools.normalized_cache.save(cache_dir, cache_name, NORMALIZED_VERSION, digest, merged)
+	return merged
+
+
+#============================================
+def split_shards(data: dict) -> dict:
+	"""
+	Split a schema 1 dict into shard payloads.
+
+	Args:
+		data (dict): Dict with 'stories' and 'pending' lists.
+
+	Returns:
+		dict: Shard name -> YAML payload (pending.yml is always present).
+	"""
+	shards = {}
+	for story in data.get('stories', []) or []:
+		if isinstance(story, dict):
+			shards.setdefault(story_shard(story), {'schema': 1, 'stories': []})['stories'].append(story)
+	shards[PENDING_SHARD] = {'schema': 1, 'pending': list(data.get('pending', []) or [])}
+	return shards
+
+
+#============================================
+def _shard_digest(payload: dict) -> str:
+	"""
+	Hash a shard payload by content (key order ignored).
+	"""
+	text = json.dumps(payload, sort_keys=True, default=str)
+	return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+#============================================
+def shard_digests(data: dict) -> dict:
+	"""
+	Hash each shard of a schema 1 dict, for write_shards to skip unchanged ones.
+
+	Call this right after reading, before the stories are modified.
+
+	Returns:
+		dict: Shard name -> content hash.
+	"""
+	return {name: _shard_digest(payload) for name, payload in split_shards(data).items()}
+
+
+#============================================
+def write_shards(yaml_path: str, data: dict, previous_digests: dict = None) -> list:
+	"""
+	Write a schema 1 dict in the sharded layout, touching only changed shards.
+
+	A shard whose content hash matches previous_digests is not serialized
+	at all; shards left without stories are deleted.
+
+	Args:
+		yaml_path (str): Path of the single file; shards go to shard_dir_for(yaml_path).
+		data (dict): Dict with 'stories' and 'pending' lists.
+		previous_digests (dict): shard_digests() of the data as it was read.
+
+	Returns:
+		list: Shard file names written or deleted.
+	"""
+	shard_dir = shard_dir_for(yaml_path)
+	os.makedirs(shard_dir, exist_ok=True)
+	previous_digests = previous_digests or {}
+	shards = split_shards(data)
+	changed = []
+	for name in sorted(shards):
+		path = os.path.join(shard_dir, name + SHARD_SUFFIX)
+		if os.path.exists(path) and previous_digests.get(name, '') == _shard_digest(shards[name]):
+			continue
+		if write_text_if_changed(path, python_tools.yaml_io.dump(shards[name])):
+			changed.append(name + SHARD_SUFFIX)
+	for filename in sorted(os.listdir(shard_dir)):
+		if filename.endswith(SHARD_SUFFIX) and filename[:-len(SHARD_SUFFIX)] not in shards:
+			os.remove(os.path.join(shard_dir, filename))
+			changed.append(filename)
+	return changed
+
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(description='Convert the In the News YAML between one file and per-year shards')
+	parser.add_argument(
+		'-y', '--yaml', dest='news_yaml', required=False, type=str,
+		default=NEWS_YAML_DEFAULT,
+		help=f'News YAML path; shards live in the directory of the same name (default: {NEWS_YAML_DEFAULT})',
+	)
+	group = parser.add_mutually_exclusive_group(required=True)
+	group.add_argument(
+		'--shard', dest='layout', action='store_const', const='sharded',
+		help='Split the single file into per-year shards plus pending.yml',
+	)
+	group.add_argument(
+		'--unshard', dest='layout', action='store_const', const='single',
+		help='Merge the shards back into the single file',
+	)
+	args = parser.parse_args()
+	return args
+
+
+#============================================
+def main():
+	"""
+	Main entry point.
+	"""
+	args = parse_args()
+	data = read_news_yaml(args.news_yaml)
+	if not (isinstance(data, dict) and isinstance(data.get('stories', None), list)):
+		raise SystemExit(f'Not a schema 1 news YAML: {args.news_yaml}')
+	shard_dir = shard_dir_for(args.news_yaml)
+	if args.layout == 'sharded':
+		written = write_shards(args.news_yaml, data)
+		if os.path.exists(args.news_yaml):
+			os.remove(args.news_yaml)
+		print(f'Wrote {len(written)} shards to {shard_dir}')
+		return
+	if not is_sharded(args.news_yaml):
+		print(f'Already a single file: {args.news_yaml}')
+		return
+	out = {'schema': 1, 'stories': data.get('stories', []), 'pending': data.get('pending', []) or []}
+	write_text_if_changed(args.news_yaml, python_tools.yaml_io.dump(out))
+	for filename in os.listdir(shard_dir):
+		if filename.endswith(SHARD_SUFFIX):
+			os.remove(os.path.join(shard_dir, filename))
+	os.rmdir(shard_dir)
+	print(f'Wrote {args.news_yaml}')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import os
+import json
+import hashlib
+import datetime
+
+# Parsed and normalized data files (shows venues/events, news stories) cached
+# under <repo root>/cache/normalized/, keyed by the SHA256 of the source
+# bytes and a per-kind schema version. A build whose sources did not change
+# reads this JSON instead of parsing YAML and re-normalizing. Sources outside
+# the repo are not cached. JSON (not pickle) keeps the cache safe to load;
+# dates are tagged so they round-trip.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR_NAME = os.path.join('cache', 'normalized')
+CACHE_SUFFIX = '.json'
+DIGEST_CHARS = 32
+DATE_TAG = '__date__'
+DATETIME_TAG = '__datetime__'
+
+
+#============================================
+def default_cache_dir(source_path: str) -> str:
+	"""
+	Get the cache directory for a data file (REPO_ROOT/cache/normalized).
+
+	Args:
+		source_path (str): Data file or shard directory, e.g. data/shows.yml.
+
+	Returns:
+		str: Absolute cache directory, or '' (no caching) for a source
+			outside the repo, such as a --yaml under /tmp.
+	"""
+	source = os.path.realpath(source_path)
+	if os.path.commonpath([source, os.path.realpath(REPO_ROOT)]) != os.path.realpath(REPO_ROOT):
+		return ''
+	return os.path.join(REPO_ROOT, CACHE_DIR_NAME)
+
+
+#============================================
+def _encode_value(value):
+	"""
+	JSON fallback for values YAML produces but JSON lacks (dates, timestamps).
+	"""
+	if isinstance(value, datetime.datetime):
+		return {DATETIME_TAG: value.isoformat()}
+	if isinstance(value, datetime.date):
+		return {DATE_TAG: value.isoformat()}
+	raise TypeError(f'Cannot cache value of type {type(value).__name__}')
+
+
+#============================================
+def _decode_object(obj: dict):
+	"""
+	Turn tagged date objects back into dates.
+	"""
+	if len(obj) == 1:
+		if DATE_TAG in obj:
+			return datetime.date.fromisoformat(obj[DATE_TAG])
+		if DATETIME_TAG in obj:
+			return datetime.datetime.fromisoformat(obj[DATETIME_TAG])
+	return obj
+
+
+#============================================
+def encode(data) -> str:
+	"""
+	Serialize normalized data to JSON text.
+	"""
+	return json.dumps(data, default=_encode_value, ensure_ascii=False, separators=(',', ':'))
+
+
+#============================================
+def decode(text: str):
+	"""
+	Parse JSON text written by encode().
+	"""
+	return json.loads(text, object_hook=_decode_object)
+
+
+#============================================
+def source_digest(chunks: list) -> str:
+	"""
+	Hash source file contents (one or more byte strings, e.g. YAML shards).
+	"""
+	digest = hashlib.sha256()
+	for chunk in chunks:
+		digest.update(len(chunk).to_bytes(8, 'big'))
+		digest.update(chunk)
+	return digest.hexdigest()
+
+
+#============================================
+def cache_path(cache_dir: str, name: str, version: int, digest: str) -> str:
+	"""
+	Get the cache file path for one source content hash.
+
+	Args:
+		cache_dir (str): Cache directory.
+		name (str): Cache name, e.g. 'shows' or 'news-in_the_news'.
+		version (int): Schema version of the cached data.
+		digest (str): source_digest() of the source bytes.
+
+	Returns:
+		str: Path like cache/normalized/shows-v1-<digest>.json.
+	"""
+	return os.path.join(cache_dir, f'{name}-v{int(version)}-{digest[:DIGEST_CHARS]}{CACHE_SUFFIX}')
+
+
+#============================================
+def load(cache_dir: str, name: str, version: int, digest: str):
+	"""
+	Load cached normalized data, or None on a miss (or an unreadable file).
+
+	An empty cache_dir (see default_cache_dir) always misses.
+	"""
+	if not cache_dir:
+		return None
+	path = cache_path(cache_dir, name, version, digest)
+	try:
+		with open(path, 'r', encoding='utf-8') as f:
+			return decode(f.read())
+	except (OSError, ValueError):
+		return None
+
+
+#============================================
+def save(cache_dir: str, name: str, version: int, digest: str, data) -> bool:
+	"""
+	Cache normalized data for a source hash, replacing older entries for name.
+
+	Data that would not come back identical (non-string dict keys, types JSON
+	cannot hold) is not cached. A read-only checkout, or an empty cache_dir,
+	just skips the cache.
+
+	Returns:
+		bool: True if the cache file was written.
+	"""
+	if not cache_dir:
+		return False
+	try:
+		text = encode(data)
+	except (TypeError, ValueError):
+		return False
+	if decode(text) != data:
+		return False
+
+	path = cache_path(cache_dir, name, version, digest)
+	prefix = f'{name}-v'
+	try:
+		os.makedirs(cache_dir, exist_ok=True)
+		tmp_path = f'{path}.tmp{os.getpid()}'
+		with open(tmp_path, 'w', encoding='utf-8') as f:
+			f.write(text)
+		os.replace(tmp_path, path)
+		# Only the entry for the current source content is worth keeping.
+		for filename in os.listdir(cache_dir):
+			old_path = os.path.join(cache_dir, filename)
+			if filename.startswith(prefix) and filename.endswith(CACHE_SUFFIX) and old_path != path:
+				os.remove(old_path)
+	except OSError:
+		return False
+	return True
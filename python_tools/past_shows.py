@@ -363,7 +363,7 @@ def build_rows_for_year(past_events: list, venues: dict, year: int) -> list:
 
 
 #============================================
-def generate_past_shows_pages(input_yaml: str, docs_dir: str, current_year: int, dry_run: bool, today=None):
+def generate_past_shows_pages(input_yaml: str, docs_dir: str, current_year: int, dry_run: bool, today=None, dataset=None):
 	"""
 	Generate Past Shows pages into mkdocs/docs/past-shows/.
 
@@ -373,17 +373,13 @@ def generate_past_shows_pages(input_yaml: str, docs_dir: str, current_year: int,
 		current_year (int): Current year to show on the overview page.
 		dry_run (bool): If True, do not write files.
 		today: Optional override for today's date (datetime.date).
+		dataset: Optional ShowsDataset already loaded for this build (input_yaml
+			and today are then ignored).
 	"""
-	if today is None:
-		today = datetime.date.today()
-
-	raw = read_yaml_file(input_yaml)
-	venues, events = normalize_schema2(raw)
-
-	past_events = []
-	for event in events:
-		if classify_event(event['start_date'], event['end_date'], today) == 'past':
-			past_events.append(event)
+	if dataset is None:
+		dataset = python_tools.shows_data.load_shows_dataset(input_yaml, today)
+	venues = dataset.venues
+	past_events = dataset.past
 
 	years = sorted({e['start_date'].year for e in past_events}, reverse=True)
 	decades: dict = {}
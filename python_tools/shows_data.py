@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 
 # Standard Library
+import os
 import html
+import hashlib
 import datetime
 
-# PIP3 modules
-import yaml
+# local repo modules
+import python_tools.normalized_cache
+import python_tools.yaml_io
+
+# Bump when normalize_schema2 output changes, so cache/normalized/ entries
+# written by older code are not reused.
+NORMALIZED_VERSION = 1
 
 
 #============================================
@@ -19,9 +26,7 @@ def read_yaml_file(yaml_path: str) -> dict:
 	Returns:
 		dict: Parsed YAML content.
 	"""
-	with open(yaml_path, 'r', encoding='utf-8') as f:
-		data = yaml.safe_load(f)
-	return data
+	return python_tools.yaml_io.load_file(yaml_path)
 
 
 #============================================
@@ -184,6 +189,80 @@ def classify_event(start_date: datetime.date, end_date: datetime.date, today: da
 	return 'upcoming'
 
 
+#============================================
+class ShowsDataset:
+	"""
+	Normalized schema 2 show data, partitioned by date once per build.
+
+	Holds venues and confirmed events (as normalize_schema2 returns them)
+	plus the past, current and upcoming events for one 'today', each in
+	file order. Generators sort these lists themselves and never modify them.
+	"""
+
+	def __init__(self, venues: dict, events: list, today: datetime.date, source_path: str = ''):
+		self.venues = venues
+		self.events = events
+		self.today = today
+		self.source_path = source_path
+		self.past = []
+		self.current = []
+		self.upcoming = []
+		partitions = {'past': self.past, 'current': self.current, 'upcoming': self.upcoming}
+		for event in events:
+			partitions[classify_event(event['start_date'], event['end_date'], today)].append(event)
+
+
+# Parsed shows files keyed by absolute path: the stat signature and content
+# hash they were read with, the normalized data, and datasets per 'today'.
+_DATASET_CACHE = {}
+
+
+#============================================
+def load_shows_dataset(yaml_path: str, today=None) -> ShowsDataset:
+	"""
+	Load a shows YAML file into a ShowsDataset, parsing it at most once.
+
+	Results are memoized by path. An unchanged mtime and size reuse the
+	cached data without reading the file; otherwise the file is read and
+	only re-parsed if its SHA256 changed. A new process first looks for the
+	normalized venues/events in cache/normalized/ (python_tools/normalized_cache.py).
+
+	Args:
+		yaml_path (str): YAML file path (schema 2).
+		today: Optional override for today's date (datetime.date).
+
+	Returns:
+		ShowsDataset: Dataset partitioned for today.
+	"""
+	if today is None:
+		today = datetime.date.today()
+	path = os.path.abspath(yaml_path)
+	stat = os.stat(path)
+	signature = (stat.st_mtime_ns, stat.st_size)
+
+	cached = _DATASET_CACHE.get(path)
+	if cached is None or cached['signature'] != signature:
+		with open(path, 'rb') as f:
+			data = f.read()
+		digest = hashlib.sha256(data).hexdigest()
+		if cached is None or cached['sha256'] != digest:
+			cache_dir = python_tools.normalized_cache.default_cache_dir(path)
+			normalized = python_tools.normalized_cache.load(cache_dir, 'shows', NORMALIZED_VERSION, digest)
+			if not isinstance(normalized, dict):
+				venues, events = normalize_schema2(python_tools.yaml_io.load(data.decode('utf-8')))
+				normalized = {'venues': venues, 'events': events}
+				python_tools.normalized_cache.save(cache_dir, 'shows', NORMALIZED_VERSION, digest, normalized)
+			cached = {'sha256': digest, 'venues': normalized['venues'], 'events': normalized['events'], 'datasets': {}}
+			_DATASET_CACHE[path] = cached
+		cached['signature'] = signature
+
+	dataset = cached['datasets'].get(today)
+	if dataset is None:
+		dataset = ShowsDataset(cached['venues'], cached['events'], today, source_path=path)
+		cached['datasets'][today] = dataset
+	return dataset
+
+
 #============================================
 def decade_start_for_year(year: int) -> int:
 	"""
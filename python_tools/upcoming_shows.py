@@ -2,7 +2,6 @@
 
 # Standard Library
 import os
-import datetime
 
 # local repo modules
 import python_tools.shows_data
@@ -93,7 +92,7 @@ def write_text_file(path: str, content: str, dry_run: bool):
 
 
 #============================================
-def generate_upcoming_shows_page(input_yaml: str, docs_dir: str, dry_run: bool, today=None):
+def generate_upcoming_shows_page(input_yaml: str, docs_dir: str, dry_run: bool, today=None, dataset=None):
 	"""
 	Generate mkdocs/docs/upcoming-shows/index.md from data/shows.yml.
 
@@ -102,24 +101,15 @@ def generate_upcoming_shows_page(input_yaml: str, docs_dir: str, dry_run: bool,
 		docs_dir (str): MkDocs docs directory.
 		dry_run (bool): If True, do not write files.
 		today: Optional override for today's date (datetime.date).
+		dataset: Optional ShowsDataset already loaded for this build (input_yaml
+			and today are then ignored).
 	"""
-	if today is None:
-		today = datetime.date.today()
-
-	raw = python_tools.shows_data.read_yaml_file(input_yaml)
-	venues, events = python_tools.shows_data.normalize_schema2(raw)
-
-	current_events = []
-	upcoming_events = []
-	for event in events:
-		status = python_tools.shows_data.classify_event(event['start_date'], event['end_date'], today)
-		if status == 'current':
-			current_events.append(event)
-		elif status == 'upcoming':
-			upcoming_events.append(event)
-
-	current_events = sorted(current_events, key=lambda e: e['start_date'])
-	upcoming_events = sorted(upcoming_events, key=lambda e: e['start_date'])
+	if dataset is None:
+		dataset = python_tools.shows_data.load_shows_dataset(input_yaml, today)
+	venues = dataset.venues
+
+	current_events = sorted(dataset.current, key=lambda e: e['start_date'])
+	upcoming_events = sorted(dataset.upcoming, key=lambda e: e['start_date'])
 
 	out = upcoming_front_matter()
 	out += '<!-- Generated from data/shows.yml. Edit that file instead. -->\n\n'
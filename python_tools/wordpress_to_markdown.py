@@ -15,6 +15,9 @@ import urllib.parse
 # PIP3 modules
 import requests
 
+# local repo modules
+import python_tools.http_cassette
+
 
 #============================================
 def parse_args() -> argparse.Namespace:
@@ -147,6 +150,20 @@ def parse_args() -> argparse.Namespace:
 		help='CSV report filename written in current directory'
 	)
 
+	parser.add_argument(
+		'--transport',
+		dest='transport',
+		choices=list(python_tools.http_cassette.TRANSPORT_MODES),
+		default='live',
+		help='HTTP transport: live, record (live plus save responses), or replay (saved responses only, no network)'
+	)
+	parser.add_argument(
+		'--cassette-dir',
+		dest='cassette_dir',
+		default=python_tools.http_cassette.CASSETTE_DIR_DEFAULT,
+		help='Recorded responses for --transport record/replay'
+	)
+
 	args = parser.parse_args()
 	return args
 
@@ -956,6 +973,7 @@ def main() -> None:
 
 	session = requests.Session()
 	session.headers.update(build_headers())
+	python_tools.http_cassette.install_transport(session, args.transport, args.cassette_dir)
 
 	items = []
 
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+# Standard Library
+import argparse
+import re
+import time
+
+# PIP3 modules
+import yaml
+
+# PyYAML's libyaml bindings (CSafeLoader / CSafeDumper) parse and emit about
+# ten times faster. They share the pure-Python resolver and representer, so
+# loaded data is the same either way; without libyaml the pure-Python classes
+# are used. The one known emitter difference: libyaml escapes characters
+# outside the Basic Multilingual Plane (emoji) as \UXXXXXXXX even with
+# allow_unicode, so dump() redoes such documents with the pure-Python dumper.
+HAVE_LIBYAML = bool(getattr(yaml, '__with_libyaml__', False))
+NON_BMP_ESCAPE_RE = re.compile(r'\\U[0-9A-F]{8}')
+
+# Stable formatting shared by every YAML file the tools write.
+DUMP_OPTIONS = {
+	'sort_keys': False,
+	'default_flow_style': False,
+	'width': 100,
+	'allow_unicode': True,
+}
+
+
+#============================================
+def load(stream, fast: bool = True):
+	"""
+	Parse YAML text or an open file with the safe loader.
+
+	Args:
+		stream: YAML text, or a file opened for reading.
+		fast (bool): Use libyaml when available (False forces pure Python).
+
+	Returns:
+		Parsed YAML (None for an empty document).
+	"""
+	if fast and HAVE_LIBYAML:
+		return yaml.load(stream, Loader=yaml.CSafeLoader)
+	return yaml.load(stream, Loader=yaml.SafeLoader)
+
+
+#============================================
+def load_file(yaml_path: str, fast: bool = True):
+	"""
+	Read and parse a UTF-8 YAML file.
+
+	Args:
+		yaml_path (str): YAML file path.
+		fast (bool): Use libyaml when available (False forces pure Python).
+
+	Returns:
+		Parsed YAML (None for an empty file).
+	"""
+	with open(yaml_path, 'r', encoding='utf-8') as f:
+		return load(f, fast=fast)
+
+
+#============================================
+def dump(data, fast: bool = True) -> str:
+	"""
+	Dump YAML with the repo's stable formatting (insertion key order, block style).
+
+	Args:
+		data: Data to dump.
+		fast (bool): Use libyaml when available (False forces pure Python).
+
+	Returns:
+		str: YAML text.
+	"""
+	if fast and HAVE_LIBYAML:
+		text = yaml.dump(data, Dumper=yaml.CSafeDumper, **DUMP_OPTIONS)
+		if not NON_BMP_ESCAPE_RE.search(text):
+			return text
+	return yaml.dump(data, Dumper=yaml.SafeDumper, **DUMP_OPTIONS)
+
+
+#============================================
+def check_file(yaml_path: str) -> dict:
+	"""
+	Compare the libyaml and pure-Python paths on one file.
+
+	Returns:
+		dict: Whether loads and dumps match, plus seconds for each path.
+	"""
+	start = time.perf_counter()
+	pure_data = load_file(yaml_path, fast=False)
+	pure_text = dump(pure_data, fast=False)
+	pure_seconds = time.perf_counter() - start
+
+	start = time.perf_counter()
+	fast_data = load_file(yaml_path)
+	fast_text = dump(fast_data)
+	fast_seconds = time.perf_counter() - start
+
+	return {
+		'same_data': pure_data == fast_data,
+		'same_text': pure_text == fast_text,
+		'pure_seconds': pure_seconds,
+		'fast_seconds': fast_seconds,
+	}
+
+
+#============================================
+def parse_args():
+	"""
+	Parse command-line arguments.
+	"""
+	parser = argparse.ArgumentParser(
+		description='Check that the libyaml and pure-Python YAML paths agree (and time them)',
+	)
+	parser.add_argument(
+		'yaml_paths', nargs='+',
+		help='YAML files to load and re-dump with both paths',
+	)
+	args = parser.parse_args()
+	return args
+
+
+#============================================
+def main():
+	"""
+	Main entry point.
+	"""
+	args = parse_args()
+	print(f'libyaml: {HAVE_LIBYAML}')
+	mismatches = 0
+	for yaml_path in args.yaml_paths:
+		result = check_file(yaml_path)
+		same = result['same_data'] and result['same_text']
+		mismatches += 0 if same else 1
+		print(
+			f"{yaml_path}: {'identical' if same else 'MISMATCH'}"
+			f" (pure {result['pure_seconds'] * 1000:.1f} ms, fast {result['fast_seconds'] * 1000:.1f} ms)"
+		)
+	if mismatches:
+		raise SystemExit(1)
+
+
+if __name__ == '__main__':
+	main()
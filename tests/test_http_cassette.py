@@ -0,0 +1,124 @@
+# Standard Library
+import os
+import sys
+import threading
+import http.server
+
+# PIP3 modules
+import pytest
+import requests
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+PAGE_BODY = b"<html><head><title>Recorded page</title></head><body>hello</body></html>"
+
+
+#============================================
+def load_http_cassette():
+	"""
+	Import python_tools.http_cassette from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.http_cassette
+
+	return python_tools.http_cassette
+
+
+#============================================
+class PageHandler(http.server.BaseHTTPRequestHandler):
+	"""
+	Serve one redirect and one page.
+	"""
+
+	def do_GET(self):
+		if self.path == "/old":
+			self.send_response(301)
+			self.send_header("Location", "/new")
+			self.send_header("Content-Length", "0")
+			self.end_headers()
+			return
+		if self.path == "/new":
+			self.send_response(200)
+			self.send_header("Content-Type", "text/html; charset=utf-8")
+			self.send_header("Set-Cookie", "visited=1")
+			self.send_header("Content-Length", str(len(PAGE_BODY)))
+			self.end_headers()
+			self.wfile.write(PAGE_BODY)
+			return
+		self.send_error(404)
+
+	def log_message(self, *args):
+		pass
+
+
+#============================================
+@pytest.fixture
+def page_server():
+	"""
+	Run PageHandler on a local port; yields the base URL.
+	"""
+	server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	yield f"http://127.0.0.1:{server.server_address[1]}"
+	server.shutdown()
+	server.server_close()
+
+
+#============================================
+def test_record_then_replay(tmp_path, page_server) -> None:
+	"""
+	A recorded redirect chain replays the same way with the server gone.
+	"""
+	http_cassette = load_http_cassette()
+	cassette_dir = str(tmp_path / "cassettes")
+
+	session = requests.Session()
+	http_cassette.install_transport(session, "record", cassette_dir)
+	live = session.get(page_server + "/old", timeout=5)
+	assert live.status_code == 200
+	assert live.content == PAGE_BODY
+	# One record per hop.
+	assert len(os.listdir(cassette_dir)) == 2
+
+	session = requests.Session()
+	http_cassette.install_transport(session, "replay", cassette_dir)
+	replayed = session.get(page_server + "/old", timeout=5)
+	assert replayed.status_code == 200
+	assert replayed.url == page_server + "/new"
+	assert replayed.content == PAGE_BODY
+	assert [r.status_code for r in replayed.history] == [301]
+	assert session.cookies.get("visited") == "1"
+
+
+#============================================
+def test_replay_miss_raises(tmp_path) -> None:
+	"""
+	Replay never falls through to the network.
+	"""
+	http_cassette = load_http_cassette()
+	session = requests.Session()
+	http_cassette.install_transport(session, "replay", str(tmp_path))
+	with pytest.raises(http_cassette.CassetteMiss):
+		session.get("http://127.0.0.1:9/never-recorded", timeout=5)
+
+
+#============================================
+def test_replay_conditional_falls_back_to_unconditional(tmp_path, page_server) -> None:
+	"""
+	A conditional request is answered by the plain 200 record if no 304 was recorded.
+	"""
+	http_cassette = load_http_cassette()
+	cassette_dir = str(tmp_path / "cassettes")
+	session = requests.Session()
+	http_cassette.install_transport(session, "record", cassette_dir)
+	session.get(page_server + "/new", timeout=5)
+
+	session = requests.Session()
+	http_cassette.install_transport(session, "replay", cassette_dir)
+	resp = session.get(page_server + "/new", timeout=5, headers={"If-None-Match": "\"v1\""})
+	assert resp.status_code == 200
+	assert resp.content == PAGE_BODY
@@ -0,0 +1,152 @@
+# Standard Library
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+#============================================
+def load_news_enrich():
+	"""
+	Import python_tools.news_enrich from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_enrich
+
+	return python_tools.news_enrich
+
+
+#============================================
+def fake_result(url: str, status_code: int, retry_after: str = "") -> tuple:
+	"""
+	Build a fetch_url()-shaped result tuple.
+	"""
+	headers = {"retry-after": retry_after} if retry_after else {}
+	return (status_code, url, "", 0, [], "", "", headers)
+
+
+#============================================
+def test_breaker_opens_on_long_retry_after() -> None:
+	"""
+	A Retry-After longer than max_pause opens the breaker at once.
+	"""
+	news_enrich = load_news_enrich()
+	breaker = news_enrich.HostBreaker(threshold=3, max_pause=60)
+	throttle = news_enrich.HostThrottle(0, 0)
+	url = "https://www.example.com/a"
+	breaker.record(url, fake_result(url, 429, "3600"), throttle)
+
+	deferred = breaker.deferred_result("https://example.com/b")
+	assert deferred is not None
+	assert deferred[6] == news_enrich.DEFERRED_PREFIX + "rate_limited"
+	assert deferred[7] == {"retry-after": "3600"}
+	assert breaker.deferred_result("https://other.example.org/") is None
+
+
+#============================================
+def test_breaker_opens_after_threshold_strikes() -> None:
+	"""
+	Strikes must come in a row; a good result resets the count.
+	"""
+	news_enrich = load_news_enrich()
+	breaker = news_enrich.HostBreaker(threshold=2, max_pause=60)
+	throttle = news_enrich.HostThrottle(0, 0)
+	url = "https://example.com/a"
+	breaker.record(url, fake_result(url, 503), throttle)
+	breaker.record(url, fake_result(url, 200), throttle)
+	breaker.record(url, fake_result(url, 503), throttle)
+	assert breaker.deferred_result(url) is None
+	breaker.record(url, fake_result(url, 503), throttle)
+	assert breaker.deferred_result(url)[6] == news_enrich.DEFERRED_PREFIX + "server_unavailable"
+
+
+#============================================
+def test_iter_fetch_results_defers_open_host(monkeypatch) -> None:
+	"""
+	Once a host is throttled away, its remaining URLs are not fetched.
+	"""
+	news_enrich = load_news_enrich()
+	fetched = []
+
+	def fake_fetch_url(url: str, **kwargs) -> tuple:
+		fetched.append(url)
+		if "slow.example.com" in url:
+			return fake_result(url, 429, "3600")
+		return fake_result(url, 200)
+
+	monkeypatch.setattr(news_enrich, "fetch_url", fake_fetch_url)
+	urls = [
+		"https://slow.example.com/1",
+		"https://ok.example.org/1",
+		"https://slow.example.com/2",
+		"https://slow.example.com/3",
+	]
+	results = list(news_enrich.iter_fetch_results(
+		urls, timeout=1, sleep_max=0, jobs=1, host_min_interval=0,
+		breaker=news_enrich.HostBreaker(),
+	))
+	assert [u for u, _ in results] == urls
+	assert fetched == urls[:2]
+	notes = [result[6] for _, result in results]
+	assert notes[2:] == [news_enrich.DEFERRED_PREFIX + "rate_limited"] * 2
+
+
+#============================================
+def test_deferred_url_keeps_negative_cache(tmp_path, monkeypatch) -> None:
+	"""
+	A previously failed URL deferred by an open breaker keeps its attempt count.
+	"""
+	news_enrich = load_news_enrich()
+	# local repo modules
+	import python_tools.yaml_io
+
+	monkeypatch.setattr(news_enrich, "fetch_url", lambda url, **kwargs: fake_result(url, 429, "3600"))
+	input_csv = tmp_path / "in.csv"
+	input_csv.write_text("url\nhttps://slow.example.com/1\nhttps://slow.example.com/2\n", encoding="utf-8")
+	output_yaml = tmp_path / "news.yml"
+	previous = {
+		"url": "https://slow.example.com/2",
+		"source": "slow.example.com",
+		"last_checked": "2000-01-01T00:00:00Z",
+		"reason": "404",
+		"failure_class": "404",
+		"attempts": 2,
+	}
+	output_yaml.write_text(python_tools.yaml_io.dump({"schema": 1, "stories": [], "pending": [previous]}), encoding="utf-8")
+
+	news_enrich.enrich_news(
+		input_csv=str(input_csv),
+		output_yaml=str(output_yaml),
+		review_csv=str(tmp_path / "review.csv"),
+		snapshot_csv=str(tmp_path / "snapshot.csv"),
+		head_cache_dir=str(tmp_path / "news_head"),
+		domain_policy_path=str(tmp_path / "domain_policy.yml"),
+		domain_policy_state_path=str(tmp_path / "domain_policy.json"),
+		sleep_max=0,
+		timeout=1,
+		jobs=1,
+		host_min_interval=0,
+	)
+	data = python_tools.yaml_io.load_file(str(output_yaml))
+	pending = {p["url"]: p for p in data["pending"]}
+	deferred = pending["https://slow.example.com/2"]
+	assert deferred["reason"] == news_enrich.DEFERRED_PREFIX + "rate_limited"
+	assert (deferred["failure_class"], deferred["attempts"]) == ("404", 2)
+	# The throttled URL itself is a soft failure.
+	assert "failure_class" not in pending["https://slow.example.com/1"]
+
+
+#============================================
+def test_deferred_result_carries_failure_fields() -> None:
+	"""
+	Deferred results neither reset nor advance the hard-failure count.
+	"""
+	news_enrich = load_news_enrich()
+	deferred = news_enrich.DEFERRED_PREFIX + "rate_limited"
+	previous = {"failure_class": "timeout", "attempts": 5, "gave_up": True, "reason": "timeout"}
+	fields = news_enrich.negative_cache_fields(previous, deferred, max_attempts=5)
+	assert fields == {"failure_class": "timeout", "attempts": 5, "gave_up": True}
+	assert news_enrich.negative_cache_fields({"reason": "403"}, deferred, max_attempts=5) == {}
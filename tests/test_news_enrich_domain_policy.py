@@ -0,0 +1,95 @@
+# Standard Library
+import os
+import sys
+import json
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CONFIG_YAML = (
+	"schema: 1\n"
+	"domains:\n"
+	"  blocked-news.com:\n"
+	"    policy: always_blocked\n"
+	"    source: config\n"
+)
+
+
+#============================================
+def load_news_enrich():
+	"""
+	Import python_tools.news_enrich from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_enrich
+
+	return python_tools.news_enrich
+
+
+#============================================
+def test_host_key_public_suffixes() -> None:
+	"""
+	Hosts under multi-part suffixes and IP hosts keep their own keys.
+	"""
+	news_enrich = load_news_enrich()
+	assert news_enrich.host_key("https://www.dailyherald.com/x") == "dailyherald.com"
+	assert news_enrich.host_key("https://www.bbc.co.uk/news") == "bbc.co.uk"
+	assert news_enrich.host_key("https://www.thetimes.co.uk/a") == "thetimes.co.uk"
+	assert news_enrich.host_key("http://192.168.1.20:8080/") == "192.168.1.20:8080"
+
+
+#============================================
+def test_config_blocks_without_being_written(tmp_path) -> None:
+	"""
+	Config entries apply by host key, and saving touches only the state file.
+	"""
+	news_enrich = load_news_enrich()
+	config_path = tmp_path / "policy.yml"
+	config_path.write_text(CONFIG_YAML, encoding="utf-8")
+	state_path = tmp_path / "policy.json"
+	policy = news_enrich.DomainPolicy(str(config_path), str(state_path))
+	assert policy.is_blocked("https://www.blocked-news.com/story")
+	assert not policy.is_blocked("https://other.example.org/")
+
+	policy.observe("https://other.example.org/", True)
+	assert policy.save()
+	assert config_path.read_text(encoding="utf-8") == CONFIG_YAML
+	state = json.loads(state_path.read_text(encoding="utf-8"))
+	assert state["domains"]["example.org"]["blocked_streak"] == 1
+
+
+#============================================
+def test_learned_block_follows_streak_and_clears(tmp_path) -> None:
+	"""
+	A host is learned as blocked after a streak of block pages, and forgotten on a real page.
+	"""
+	news_enrich = load_news_enrich()
+	state_path = str(tmp_path / "policy.json")
+	policy = news_enrich.DomainPolicy(str(tmp_path / "missing.yml"), state_path)
+	url = "https://news.example.com/a"
+	learned = [policy.observe(url, True) for _ in range(news_enrich.DOMAIN_POLICY_LEARN_STREAK)]
+	assert learned[-1] and not any(learned[:-1])
+	assert policy.is_blocked(url)
+	policy.save()
+
+	# Learned state survives a reload, and lapses once it is old enough.
+	reloaded = news_enrich.DomainPolicy(str(tmp_path / "missing.yml"), state_path)
+	assert reloaded.is_blocked(url)
+	reloaded.learned["example.com"]["learned_at"] = "2000-01-01T00:00:00Z"
+	assert not reloaded.is_blocked(url)
+
+	policy.observe(url, False)
+	assert not policy.is_blocked(url)
+
+
+#============================================
+def test_shipped_config_blocks_nothing(tmp_path) -> None:
+	"""
+	Permanent blocks are opt-in: the checked-in config lists none.
+	"""
+	news_enrich = load_news_enrich()
+	config_path = os.path.join(REPO_ROOT, news_enrich.DOMAIN_POLICY_PATH_DEFAULT)
+	policy = news_enrich.DomainPolicy(config_path, str(tmp_path / "policy.json"))
+	assert [k for k, e in policy.config.items() if e.get("policy") == "always_blocked"] == []
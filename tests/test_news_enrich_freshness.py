@@ -0,0 +1,58 @@
+# Standard Library
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+#============================================
+def load_news_enrich():
+	"""
+	Import python_tools.news_enrich from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_enrich
+
+	return python_tools.news_enrich
+
+
+#============================================
+def test_negative_cache_backoff() -> None:
+	"""
+	Hard failures count attempts and back off exponentially up to the cap.
+	"""
+	news_enrich = load_news_enrich()
+	previous = {}
+	delays = []
+	for _ in range(4):
+		previous = news_enrich.negative_cache_fields(previous, "404", max_attempts=3)
+		delays.append(news_enrich.recheck_delay_days(previous, 7))
+	assert previous["attempts"] == 4
+	assert previous["gave_up"]
+	assert delays == [7, 14, 28, news_enrich.NEGATIVE_BACKOFF_MAX_DAYS]
+
+
+#============================================
+def test_soft_failures_use_plain_ttl() -> None:
+	"""
+	Soft failures neither count attempts nor back off.
+	"""
+	news_enrich = load_news_enrich()
+	previous = news_enrich.negative_cache_fields({}, "404", max_attempts=3)
+	assert news_enrich.negative_cache_fields(previous, "403", max_attempts=3) == {}
+	assert news_enrich.recheck_delay_days({}, 7) == 7
+
+
+#============================================
+def test_hard_failure_count_restarts_after_soft_failure() -> None:
+	"""
+	Attempts only carry over from a previous hard failure.
+	"""
+	news_enrich = load_news_enrich()
+	fields = news_enrich.negative_cache_fields({"failure_class": "403", "attempts": 5}, "timeout", max_attempts=3)
+	assert fields["failure_class"] == "timeout"
+	assert fields["attempts"] == 1
+	assert "gave_up" not in fields
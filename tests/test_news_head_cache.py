@@ -0,0 +1,172 @@
+# Standard Library
+import os
+import sys
+import json
+
+# PIP3 modules
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAD_A = "<html><head><title>Story A</title></head><body></body></html>"
+HEAD_B = "<html><head><title>Story B</title></head><body></body></html>"
+HEAD_C = "<html><head><title>Story C</title></head><body></body></html>"
+
+
+#============================================
+def load_head_cache():
+	"""
+	Import python_tools.news_head_cache from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_head_cache
+
+	return python_tools.news_head_cache
+
+
+#============================================
+def write_legacy_head(cache_dir: str, url: str, head_html: str) -> str:
+	"""
+	Write a head file the way the cache did before index.json existed.
+	"""
+	name = load_head_cache().legacy_head_name(url)
+	path = os.path.join(cache_dir, name)
+	with open(path, "w", encoding="utf-8") as f:
+		f.write(head_html)
+	return name
+
+
+#============================================
+def test_legacy_migration_finds_urls_by_hash(tmp_path) -> None:
+	"""
+	Legacy head files are aliased to the known URLs whose hash names them.
+	"""
+	head_cache = load_head_cache()
+	url = "http://example.com/story-a"
+	name = write_legacy_head(str(tmp_path), url, HEAD_A)
+	sidecar = {"head_file": name, "url": url, "etag": "\"abc\"", "last_modified": ""}
+	sidecar_path = tmp_path / (name[:-len(head_cache.HEAD_SUFFIX)] + head_cache.LEGACY_VALIDATORS_SUFFIX)
+	sidecar_path.write_text(json.dumps(sidecar), encoding="utf-8")
+
+	index = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[url, "https://example.com/other"])
+	entry = index.lookup([url])
+	assert entry
+	assert index.read_head(entry) == HEAD_A
+	assert entry["etag"] == "\"abc\""
+	# The https twin of a known http URL is an alias too.
+	assert index.lookup(["https://example.com/story-a"])["key"] == entry["key"]
+	assert not index.lookup(["https://example.com/other"])
+
+	# The migrated index is written once; the sidecar goes, the head file stays.
+	assert index.save()
+	assert not sidecar_path.exists()
+	assert (tmp_path / name).exists()
+	reloaded = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	assert reloaded.lookup([url])["key"] == entry["key"]
+
+
+#============================================
+def test_lookup_does_not_dirty_index(tmp_path) -> None:
+	"""
+	A run that only reads the cache leaves index.json alone.
+	"""
+	head_cache = load_head_cache()
+	index = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	index.put(HEAD_A, ["https://example.com/a"])
+	assert index.save()
+	mtime = os.path.getmtime(index.index_path)
+
+	index = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	assert index.lookup(["https://example.com/a"])
+	assert not index.dirty
+	assert not index.save()
+	assert os.path.getmtime(index.index_path) == mtime
+
+
+
+#============================================
+@pytest.mark.parametrize("cache_format", ["gzip", "zstd"])
+def test_put_rewrites_missing_file_in_current_format(tmp_path, cache_format: str) -> None:
+	"""
+	After a format switch, a head whose file went missing is rewritten under the new suffix.
+	"""
+	head_cache = load_head_cache()
+	if cache_format == "zstd" and not head_cache.HAVE_ZSTD:
+		pytest.skip("zstandard not installed")
+	url = "https://example.com/a"
+	index = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	entry = index.put(HEAD_A, [url])
+	os.remove(index.path_for(entry))
+	# The missing file is skipped by the conversion.
+	assert index.set_format(cache_format) == 0
+
+	entry = index.put(HEAD_A, [url])
+	assert entry["file"].endswith(head_cache.FORMAT_SUFFIXES[cache_format])
+	assert os.path.exists(index.path_for(entry))
+	index.save()
+
+	reloaded = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	assert reloaded.read_head(reloaded.lookup([url])) == HEAD_A
+
+
+#============================================
+def test_gc_drops_unreferenced_entries(tmp_path) -> None:
+	"""
+	Entries whose URLs are no longer referenced are removed with their files.
+	"""
+	head_cache = load_head_cache()
+	index = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	kept = index.put(HEAD_A, ["https://example.com/a"])
+	dropped = index.put(HEAD_B, ["https://example.com/b"])
+	index.record_check("https://example.com/b", "2000-01-01T00:00:00Z", last_checked="2000-01-01T00:00:00Z")
+
+	report = index.gc({"https://example.com/a"}, min_age_days=0)
+	assert report["unreferenced"] == 1
+	assert report["evicted"] == 0
+	assert index.lookup(["https://example.com/a"])["key"] == kept["key"]
+	assert not index.lookup(["https://example.com/b"])
+	assert not os.path.exists(index.path_for(dropped))
+	assert not index.check_for("https://example.com/b")
+
+
+#============================================
+def test_gc_evicts_least_recently_used(tmp_path) -> None:
+	"""
+	Over the entry cap, the entry looked up longest ago goes first.
+	"""
+	head_cache = load_head_cache()
+	index = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	urls = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+	keys = [index.put(head, [u])["key"] for head, u in zip((HEAD_A, HEAD_B, HEAD_C), urls)]
+	for key, stamp in zip(keys, ("2020-01-03T00:00:00Z", "2020-01-01T00:00:00Z", "2020-01-02T00:00:00Z")):
+		index.entries[key]["last_used"] = stamp
+	# An in-memory lookup counts even though it is not saved yet.
+	index.used[keys[1]] = "2020-01-04T00:00:00Z"
+
+	report = index.gc(set(urls), max_entries=2, min_age_days=0)
+	assert report["evicted"] == 1
+	assert sorted(index.entries) == sorted([keys[0], keys[1]])
+	assert not index.lookup([urls[2]])
+
+
+#============================================
+def test_gc_dry_run_changes_nothing(tmp_path) -> None:
+	"""
+	A dry run reports what it would reclaim and leaves the cache as it was.
+	"""
+	head_cache = load_head_cache()
+	index = head_cache.HeadCacheIndex(str(tmp_path), known_urls=[])
+	index.put(HEAD_A, ["https://example.com/a"])
+	dropped = index.put(HEAD_B, ["https://example.com/b"])
+	index.save()
+
+	report = index.gc({"https://example.com/a"}, max_bytes=1, min_age_days=0, dry_run=True)
+	assert report["unreferenced"] == 1
+	assert report["evicted"] == 1
+	assert report["bytes_reclaimed"] > 0
+	assert len(index.entries) == 2
+	assert os.path.exists(index.path_for(dropped))
+	assert not index.dirty
@@ -0,0 +1,86 @@
+# Standard Library
+import os
+import sys
+import gzip
+
+# PIP3 modules
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAD_CACHE_DIR = os.path.join(REPO_ROOT, "cache", "news_head")
+FAST_BACKENDS = ("lxml", "selectolax")
+
+# Small built-in corpus so the test means something on a fresh checkout.
+SAMPLE_DOCS = [
+	(
+		"<!doctype html>\n<html>\n<head>\n<title>LEGO Lovers &amp; Trains</title>\n"
+		"<meta content=\"Daily Herald\" property=\"og:site_name\">\n"
+		"<meta content=\"2025-12-13T08:00:00Z\" property=\"article:published_time\">\n"
+		"<link href=\"https://www.dailyherald.com/20251213/news/lego-lovers/\" rel=\"canonical\">\n"
+		"<script type=\"application/ld+json\">\n"
+		"{\"@type\": \"NewsArticle\", \"headline\": \"LEGO Lovers\", \"author\": [{\"name\": \"Jane Doe\"}]}\n"
+		"</script>\n</head>\n</html>\n"
+	),
+	(
+		"<html><head><meta charset=\"utf-8\"><title>Caf&eacute; Show</title>"
+		"<META NAME=\"Author\" CONTENT=\"Sam Smith\"><meta property=\"og:url\" content=\"//example.com/a\">"
+		"</head><body><svg><title>icon</title></svg><p>By Someone Else</p>"
+		"<script type=\"application/ld+json\">{\"@type\": \"Article\", \"datePublished\": \"2024-05-01\"}</script>"
+		"</body></html>"
+	),
+	"<link rel=\"canonical\" href=\"/x\"><title>Fragment</title>",
+	"",
+]
+
+
+#============================================
+def load_corpus() -> list:
+	"""
+	Collect the local head-cache corpus plus the built-in samples.
+	"""
+	docs = list(SAMPLE_DOCS)
+	if os.path.isdir(HEAD_CACHE_DIR):
+		for name in sorted(os.listdir(HEAD_CACHE_DIR)):
+			path = os.path.join(HEAD_CACHE_DIR, name)
+			if name.endswith(".head.html"):
+				with open(path, "r", encoding="utf-8", errors="ignore") as f:
+					docs.append(f.read())
+			elif name.endswith(".head.html.gz"):
+				with gzip.open(path, "rt", encoding="utf-8", errors="ignore") as f:
+					docs.append(f.read())
+	return docs
+
+
+#============================================
+@pytest.mark.parametrize("backend", FAST_BACKENDS)
+def test_backend_matches_stdlib(backend: str) -> None:
+	"""
+	A C parser backend must give the same metadata and best URL as stdlib.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_head
+	import python_tools.news_enrich
+
+	if backend not in python_tools.news_head.available_backends():
+		pytest.skip(f"{backend} is not installed")
+
+	mismatches = []
+	for index, text in enumerate(load_corpus()):
+		expected = python_tools.news_head.parse_head_document(text, backend="stdlib")
+		actual = python_tools.news_head.parse_head_document(text, backend=backend)
+		base_url = "https://example.com/page"
+
+		expected_meta = python_tools.news_enrich.extract_metadata(expected)
+		actual_meta = python_tools.news_enrich.extract_metadata(actual)
+		if expected_meta != actual_meta:
+			mismatches.append(f"doc {index}: metadata {expected_meta} != {actual_meta}")
+
+		expected_url = python_tools.news_head.extract_best_url(expected, base_url)
+		actual_url = python_tools.news_head.extract_best_url(actual, base_url)
+		if expected_url != actual_url:
+			mismatches.append(f"doc {index}: best url {expected_url!r} != {actual_url!r}")
+
+	assert not mismatches, "\n".join(mismatches[:10])
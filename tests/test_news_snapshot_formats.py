@@ -0,0 +1,160 @@
+# Standard Library
+import os
+import sys
+import gzip
+import json
+import base64
+
+# PIP3 modules
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+ARTICLE_JSONLD = {
+	"@context": "https://schema.org",
+	"@type": "NewsArticle",
+	"headline": "Layout open house",
+	"author": {"@type": "Person", "name": "Jane Roe"},
+	"datePublished": "2024-05-01",
+}
+FILLER = "<p>" + "Trains run on the layout. " * 40 + "</p>\n"
+PAGE_HTML = (
+	"<!DOCTYPE html>\n<html><head>\n"
+	"<title>Layout open house</title>\n"
+	"<link rel=\"canonical\" href=\"https://example.com/news/open-house\">\n"
+	"<script>var markup = '<div>' + '</head>';</script>\n"
+	"</head>\n<body>\n"
+	+ FILLER * 40
+	+ "<script type=\"application/ld+json\">" + json.dumps(ARTICLE_JSONLD) + "</script>\n"
+	+ FILLER * 200
+	+ "</body></html>\n"
+)
+SNAPSHOT_FORMATS = ("html", "html.gz", "mhtml", "warc", "warc.gz")
+
+
+#============================================
+def load_modules():
+	"""
+	Import the snapshot and head modules from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_enrich
+	import python_tools.news_head
+	import python_tools.news_snapshot_extract
+	import python_tools.news_snapshot_formats
+
+	return (
+		python_tools.news_enrich,
+		python_tools.news_head,
+		python_tools.news_snapshot_extract,
+		python_tools.news_snapshot_formats,
+	)
+
+
+#============================================
+def mhtml_bytes(html_text: str) -> bytes:
+	"""
+	Wrap a page in a two-part MHTML file (a stylesheet, then the base64 page).
+	"""
+	body = base64.encodebytes(html_text.encode("utf-8")).decode("ascii")
+	text = (
+		"MIME-Version: 1.0\r\n"
+		"Content-Type: multipart/related; boundary=\"----part\"\r\n\r\n"
+		"------part\r\nContent-Type: text/css\r\n\r\nbody { color: red; }\r\n"
+		"------part\r\nContent-Type: text/html; charset=utf-8\r\n"
+		"Content-Transfer-Encoding: base64\r\n\r\n"
+		+ body.replace("\n", "\r\n")
+		+ "------part--\r\n"
+	)
+	return text.encode("ascii")
+
+
+#============================================
+def warc_bytes(html_text: str) -> bytes:
+	"""
+	Wrap a page in a WARC file (a request record, then the response record).
+	"""
+	records = []
+	payload = html_text.encode("utf-8")
+	http_block = (
+		b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+		+ f"Content-Length: {len(payload)}\r\n\r\n".encode("ascii")
+		+ payload
+	)
+	request_block = b"GET /news/open-house HTTP/1.1\r\nHost: example.com\r\n\r\n"
+	for warc_type, content_type, block in (
+		("request", "application/http; msgtype=request", request_block),
+		("response", "application/http; msgtype=response", http_block),
+	):
+		header = (
+			f"WARC/1.0\r\nWARC-Type: {warc_type}\r\n"
+			f"WARC-Target-URI: https://example.com/news/open-house\r\n"
+			f"Content-Type: {content_type}\r\nContent-Length: {len(block)}\r\n\r\n"
+		)
+		records.append(header.encode("ascii") + block + b"\r\n\r\n")
+	return b"".join(records)
+
+
+#============================================
+def write_snapshot(tmp_path, fmt: str) -> str:
+	"""
+	Save PAGE_HTML as a snapshot file in the given format.
+	"""
+	if fmt.startswith("html"):
+		data = PAGE_HTML.encode("utf-8")
+	elif fmt == "mhtml":
+		data = mhtml_bytes(PAGE_HTML)
+	else:
+		data = warc_bytes(PAGE_HTML)
+	if fmt.endswith(".gz"):
+		data = gzip.compress(data)
+	path = tmp_path / ("page." + fmt)
+	path.write_bytes(data)
+	return str(path)
+
+
+#============================================
+@pytest.mark.parametrize("fmt", SNAPSHOT_FORMATS)
+def test_body_jsonld_survives_snapshot_read(tmp_path, fmt: str) -> None:
+	"""
+	JSON-LD in the body of a snapshot still reaches the head cache document.
+	"""
+	news_enrich, news_head, news_snapshot_extract, news_snapshot_formats = load_modules()
+	path = write_snapshot(tmp_path, fmt)
+
+	html_text = news_snapshot_formats.read_snapshot_html(path, news_head.HEAD_PARSE_MAX_CHARS)
+	assert len(html_text) < len(PAGE_HTML)
+	expected = news_head.build_head_cache_html(news_head.parse_head_document(PAGE_HTML))
+	assert news_head.build_head_cache_html(news_head.parse_head_document(html_text)) == expected
+
+	url, head_doc, note = news_snapshot_extract.extract_snapshot_head(path)
+	assert (url, note) == ("https://example.com/news/open-house", "")
+	meta = news_enrich.extract_metadata(news_head.parse_head_document(head_doc))
+	assert meta["author"] == "Jane Roe"
+	assert meta["published_time"].startswith("2024-05-01")
+
+
+#============================================
+def test_read_respects_parse_cap(tmp_path) -> None:
+	"""
+	Body JSON-LD past max_chars is left out, as parse_head_document would.
+	"""
+	_, news_head, _, news_snapshot_formats = load_modules()
+	path = write_snapshot(tmp_path, "html")
+	cap = PAGE_HTML.index("application/ld+json")
+	html_text = news_snapshot_formats.read_snapshot_html(path, cap)
+	assert "application/ld+json" not in html_text
+	assert news_head.parse_head_document(html_text).jsonld == []
+
+
+#============================================
+def test_read_whole_document(tmp_path) -> None:
+	"""
+	head_only=False returns the full document.
+	"""
+	_, _, _, news_snapshot_formats = load_modules()
+	path = write_snapshot(tmp_path, "html.gz")
+	assert news_snapshot_formats.read_snapshot_html(path, head_only=False) == PAGE_HTML
@@ -0,0 +1,74 @@
+# Standard Library
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+SAMPLE_DATA = {
+	"schema": 1,
+	"stories": [
+		{"id": "20080105a", "published_date": "2008-01-05", "title": "Open house", "urls": ["https://example.com/1"]},
+		{"id": "20080301a", "published_date": "2008-03-01", "title": "Spring show", "urls": ["https://example.com/2"]},
+		{"id": "20210710a", "published_date": "2021-07-10", "title": "Summer layout", "urls": ["https://example.com/3"]},
+		{"id": "00000000a", "published_date": "", "title": "Undated", "urls": ["https://example.com/4"]},
+	],
+	"pending": [{"url": "https://example.com/5", "reason": "404"}],
+}
+
+
+#============================================
+def load_news_store():
+	"""
+	Import python_tools.news_store from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.news_store
+
+	return python_tools.news_store
+
+
+#============================================
+def test_split_shards_by_year() -> None:
+	"""
+	Stories are grouped by published year; pending gets its own shard.
+	"""
+	news_store = load_news_store()
+	shards = news_store.split_shards(SAMPLE_DATA)
+	assert sorted(shards) == ["2008", "2021", "pending", "undated"]
+	assert [s["id"] for s in shards["2008"]["stories"]] == ["20080105a", "20080301a"]
+	assert shards["pending"]["pending"] == SAMPLE_DATA["pending"]
+
+
+#============================================
+def test_shard_round_trip(tmp_path) -> None:
+	"""
+	Writing shards and reading them back gives the same data.
+	"""
+	news_store = load_news_store()
+	yaml_path = str(tmp_path / "in_the_news.yml")
+	written = news_store.write_shards(yaml_path, SAMPLE_DATA)
+	assert sorted(written) == ["2008.yml", "2021.yml", "pending.yml", "undated.yml"]
+	assert news_store.is_sharded(yaml_path)
+	assert news_store.read_news_yaml(yaml_path) == SAMPLE_DATA
+
+
+#============================================
+def test_write_shards_touches_only_changed(tmp_path) -> None:
+	"""
+	Unchanged shards are skipped and emptied ones are deleted.
+	"""
+	news_store = load_news_store()
+	yaml_path = str(tmp_path / "in_the_news.yml")
+	news_store.write_shards(yaml_path, SAMPLE_DATA)
+
+	data = news_store.read_news_yaml(yaml_path)
+	digests = news_store.shard_digests(data)
+	data["stories"] = [s for s in data["stories"] if s["id"] != "20210710a"]
+	data["stories"][0]["title"] = "Open house (updated)"
+	changed = news_store.write_shards(yaml_path, data, previous_digests=digests)
+	assert sorted(changed) == ["2008.yml", "2021.yml"]
+	assert not os.path.exists(os.path.join(news_store.shard_dir_for(yaml_path), "2021.yml"))
+	assert news_store.read_news_yaml(yaml_path) == data
@@ -0,0 +1,84 @@
+# Standard Library
+import os
+import sys
+import datetime
+
+# PIP3 modules
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Text the libyaml emitter treats differently: astral-plane characters
+# (emoji) are escaped by CSafeDumper even with allow_unicode.
+SAMPLE_DATA = {
+	"schema": 1,
+	"stories": [
+		{
+			"id": "20250101a",
+			"title": "Trains \U0001F682 and LEGO \U0001F9F1 at the caf\u00e9",
+			"author": None,
+			"published_date": "2025-01-01",
+			"urls": ["https://example.com/\u00e9t\u00e9", "https://example.com/plain"],
+		},
+		{
+			"id": "20250102a",
+			"title": "Quotes: \"double\", 'single', colon: value, #hash",
+			"teaser": "Line one\nline two " + "long " * 40,
+			"date": datetime.date(2025, 1, 2),
+		},
+	],
+	"pending": [{"url": "C:\\Users\\example", "reason": "404", "attempts": 2, "gave_up": False}],
+}
+DATA_FILES = ("data/shows.yml", "data/in_the_news.yml")
+
+
+#============================================
+def load_yaml_io():
+	"""
+	Import python_tools.yaml_io from the repo root.
+	"""
+	if REPO_ROOT not in sys.path:
+		sys.path.insert(0, REPO_ROOT)
+
+	# local repo modules
+	import python_tools.yaml_io
+
+	return python_tools.yaml_io
+
+
+#============================================
+def test_dump_non_bmp_matches_pure_python() -> None:
+	"""
+	The fast path must dump astral-plane text exactly like the pure-Python path.
+	"""
+	yaml_io = load_yaml_io()
+	fast_text = yaml_io.dump(SAMPLE_DATA)
+	pure_text = yaml_io.dump(SAMPLE_DATA, fast=False)
+	assert fast_text == pure_text
+	assert "\U0001F682" in fast_text
+	assert "\\U0001F682" not in fast_text
+
+
+#============================================
+def test_non_bmp_round_trip() -> None:
+	"""
+	Dumped text loads back to the same data through either loader.
+	"""
+	yaml_io = load_yaml_io()
+	text = yaml_io.dump(SAMPLE_DATA)
+	assert yaml_io.load(text) == SAMPLE_DATA
+	assert yaml_io.load(text, fast=False) == SAMPLE_DATA
+
+
+#============================================
+@pytest.mark.parametrize("rel_path", DATA_FILES)
+def test_repo_data_files_match(rel_path: str) -> None:
+	"""
+	Real data files load and re-dump identically on both paths.
+	"""
+	path = os.path.join(REPO_ROOT, rel_path)
+	if not os.path.exists(path):
+		pytest.skip(f"{rel_path} not found")
+	result = load_yaml_io().check_file(path)
+	assert result["same_data"]
+	assert result["same_text"]